@@ -1,6 +1,12 @@
+import time
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from painter2D import Painter2D 
+from backends import PresentBackend
 from mathCam import MathCam
 from Scene import Scene
+from assets import Object3D
+from renderStats import FrameStats, RenderStats
 
 
 class Engine3D:
@@ -11,14 +17,195 @@ class Engine3D:
       painter (Painter2D): The 2D drawing interface.
       cam (MathCam): The camera used for projection.
       scene (Scene): The scene containing 3D assets.
+      mode (str): Default render mode, 'wireframe' or 'solid'.
+      frameStats (Optional[FrameStats]): Timing of the last (or current) run() call.
+      stats (RenderStats): Per-stage timers and triangle/pixel counts of recent frames;
+                           disabled until `stats.enabled` is set or `stats.profile` is called.
     """
-    def __init__(self, resolution: int , FPS :int = 60 ,Angel = 90 , x= -10 , y=0 , z =0 , Distance = 5 ) -> None:
+    RENDER_MODES = ("wireframe", "solid")
+
+    def __init__(self, resolution: int , FPS :int = 60 ,Angel = 90 , x= -10 , y=0 , z =0 , Distance = 5 ,
+                 mode: str = "wireframe", backend: Optional[PresentBackend] = None, workers: int = 1,
+                 dtype: Any = np.float64, pipelined: bool = False) -> None:
         """
         Initialize the 3D engine.
 
         Parameters:
           resolution (int): The resolution for the Painter2D canvas.
+          mode (str, optional): Default render mode, 'wireframe' or 'solid'. Default is 'wireframe'.
+          backend (PresentBackend, optional): Where finished frames go. Default is a matplotlib window.
+          workers (int, optional): Processes used for tile-parallel rasterization. Default is 1 (serial).
+          dtype (optional): Framebuffer pixel type, e.g. np.uint8. Default is float64.
+          pipelined (bool, optional): Present each frame on a worker thread while the next one is
+                                      rendered into a second buffer (see Painter2D). Default is False.
         """
-        self.painter: Painter2D = Painter2D(resolution , FPS=FPS)
+        if mode not in Engine3D.RENDER_MODES:
+            raise ValueError("mode must be 'wireframe' or 'solid'")
+        self.painter: Painter2D = Painter2D(resolution , FPS=FPS, backend=backend, workers=workers, dtype=dtype,
+                                            pipelined=pipelined)
         self.cam: MathCam = MathCam(x, y, z, Distance , max_value=resolution , Angle=Angel )
-        self.scene: Scene = Scene()
\ No newline at end of file
+        self.scene: Scene = Scene()
+        self.mode: str = mode
+        self.frameStats: Optional[FrameStats] = None
+        self.stats: RenderStats = RenderStats()
+
+    def renderFrame(self, mode: Optional[str] = None, color: int = 255, ambient: float = 0.2) -> None:
+        """
+        Project every triangle in the scene and rasterize it into the painter's canvas.
+
+        Objects entirely outside the camera's frustum are culled first (see Scene.visibleObjects),
+        and objects with levels of detail switch level by their size on screen (Scene.updateLOD).
+        Triangles are projected through the camera's view-projection matrix and clipped against
+        its near plane (MathCam.project_triangles), so triangles crossing it are cut rather than
+        dropped. The geometry is gathered per shared mesh (Scene.returnBatches), so all instances
+        of a mesh are projected together with its one index buffer. In 'wireframe' mode each
+        unique edge of the objects' meshes is clipped the same way and drawn once, even where
+        two triangles share it. In 'solid' mode
+        triangles facing away from the camera (by their winding seen from MathCam.CenterPoint)
+        are culled first, and the rest are filled through the painter's z-buffer with flat
+        shading from a light at the camera.
+
+        Each call opens a new frame in self.stats; presentFrame closes it.
+
+        Parameters:
+          mode (str, optional): 'wireframe' or 'solid'; defaults to self.mode.
+          color (int, optional): Intensity of a face lit head-on, or of wireframe lines. Default is 255.
+          ambient (float, optional): Fraction of `color` that faces receive regardless of lighting. Default is 0.2.
+
+        Raises:
+          ValueError: If an invalid mode is provided.
+        """
+        mode = self.mode if mode is None else mode
+        if mode not in Engine3D.RENDER_MODES:
+            raise ValueError("mode must be 'wireframe' or 'solid'")
+        stats: RenderStats = self.stats
+        stats.beginFrame()
+        objects: List[Object3D] = self.scene.visibleObjects(self.cam)
+        self.scene.updateLOD(self.cam, objects)
+        stats.count("lod_saved", self.scene.lodStats["triangles_saved"])
+        stats.lap("gather")
+        self.scene.updateWorldBuffer(objects)
+        stats.lap("transform")
+        batches: List[Tuple[np.ndarray, np.ndarray]] = self.scene.returnBatches(objects=objects,
+                                                                                edges=mode == "wireframe")
+        stats.lap("gather")
+        stats.count("objects", len(objects))
+        stats.count("triangles", sum(len(obj.currentMesh()[1]) for obj in objects))
+        pixels: int = self.painter.pixelsDrawn
+        if mode == "wireframe":
+            lines: np.ndarray = np.zeros((0, 2, 2))
+            if batches:
+                lines = np.concatenate([self.cam.project_segments(vertices, edges)[0] for vertices, edges in batches])
+            stats.lap("project")
+            self.painter.DrawLines(lines, color)
+            stats.count("edges", len(lines))
+        else:
+            xy: List[np.ndarray] = [np.zeros((0, 3, 2))]
+            depth: List[np.ndarray] = [np.zeros((0, 3))]
+            shade: List[np.ndarray] = [np.zeros(0)]
+            for vertices, indices in batches:
+                triangles: np.ndarray = vertices[:, indices].reshape(-1, 3, 3)
+                normals: np.ndarray = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+                toCamera: np.ndarray = self.cam.CenterPoint - triangles.mean(axis=1)
+                facing: np.ndarray = np.einsum("ij,ij->i", normals, toCamera)
+                front: np.ndarray = facing > 0
+                normals, toCamera, facing = normals[front], toCamera[front], facing[front]
+                projected, depths, drawn = self.cam.project_triangles(vertices, indices, front)
+                lambert: np.ndarray = facing / (np.linalg.norm(normals, axis=1) * np.linalg.norm(toCamera, axis=1))
+                xy.append(projected)
+                depth.append(depths)
+                shade.append((color * (ambient + (1 - ambient) * lambert))[drawn])
+            stats.lap("project")
+            self.painter.FillTriangles(np.concatenate(xy), np.concatenate(depth), np.concatenate(shade))
+            stats.count("drawn", sum(len(values) for values in shade))
+        stats.lap("rasterize")
+        stats.count("pixels", self.painter.pixelsDrawn - pixels)
+
+    def presentFrame(self) -> None:
+        """
+        Present the painter's canvas and clear it for the next frame, closing the frame's stats record.
+
+        With a pipelined painter the frame is only queued for presentation, so the "present"
+        stage measures the hand-off, including any wait for the previous frame to finish.
+        """
+        self.stats.lap()
+        self.painter.updateFrame()
+        self.stats.lap("present")
+        self.painter.clearFrame()
+        self.stats.lap("clear")
+        self.stats.endFrame()
+
+    def renderBatch(self, poses: Sequence[Dict[str, Any]], workers: Optional[int] = None,
+                    output: Optional[str] = None, fmt: str = "png", mode: Optional[str] = None,
+                    progress: Optional[Callable[[int, int, float], None]] = None) -> Dict[str, Any]:
+        """
+        Render the scene from many poses offline, in parallel worker processes (see batchRender).
+
+        Each worker receives a copy of the scene and camera once; every frame starts from their
+        current state, so this engine's scene is left untouched.
+
+        Parameters:
+          poses (list): One pose per frame, e.g. from batchRender.turntable or batchRender.orbit.
+          workers (int, optional): Worker processes; all cores if None, 1 to render in this process.
+          output (str, optional): Directory to write numbered frame files to; in memory if None.
+          fmt (str, optional): 'png' or 'raw' when writing files. Default is 'png'.
+          mode (str, optional): Render mode; defaults to self.mode.
+          progress (Callable, optional): Called after each frame with (done, total, frames_per_second).
+
+        Returns:
+          dict: 'frames', 'elapsed', 'fps', 'workers' and 'images' (see batchRender.render_batch).
+        """
+        from batchRender import render_batch
+        return render_batch(self.scene, poses, self.painter.W, self.cam, self.mode if mode is None else mode,
+                            workers, output, fmt, progress=progress)
+
+    def run(self, update_callback: Optional[Callable[[float], None]] = None, target_fps: Optional[float] = None,
+            max_frames: Optional[int] = None, mode: Optional[str] = None, max_skip: int = 5) -> FrameStats:
+        """
+        Run the render loop at a fixed rate: update, project, rasterize, present, clear.
+
+        The scene is advanced with fixed-timestep updates, one per frame slot of 1/target_fps
+        seconds, paced against a monotonic clock. When a frame slot has already passed by the
+        time its update finishes, rendering and presentation are skipped for that slot (a
+        dropped frame), so the loop catches up instead of drifting behind. At most `max_skip`
+        slots in a row are dropped, so something is still shown if updates alone are too slow.
+
+        Parameters:
+          update_callback (Callable, optional): Called once per frame slot with the fixed timestep in seconds.
+          target_fps (float, optional): Frame rate to pace to. Default is the engine's FPS.
+          max_frames (int, optional): Stop after this many frame slots; run until interrupted if None.
+          mode (str, optional): Render mode passed to renderFrame.
+          max_skip (int, optional): Maximum number of consecutive dropped frames. Default is 5.
+
+        Returns:
+          FrameStats: Frame-time statistics (mean, p95, dropped frames), also kept in self.frameStats.
+        """
+        target_fps = self.painter.FPS if target_fps is None else target_fps
+        step: float = 1 / target_fps
+        stats: FrameStats = FrameStats(target_fps)
+        self.frameStats = stats
+        started: float = time.perf_counter()
+        skipped: int = 0
+        try:
+            while max_frames is None or stats.updates < max_frames:
+                frame_start: float = time.perf_counter()
+                deadline: float = started + (stats.updates + 1) * step
+                if update_callback is not None:
+                    update_callback(step)
+                stats.updates += 1
+                if time.perf_counter() > deadline and skipped < max_skip:
+                    stats.dropped += 1
+                    skipped += 1
+                    continue
+                skipped = 0
+                self.renderFrame(mode)
+                self.presentFrame()
+                stats.presented += 1
+                stats.frame_times.append(time.perf_counter() - frame_start)
+                remaining: float = deadline - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+            self.painter.flush()
+        finally:
+            stats.elapsed = time.perf_counter() - started
+        return stats
@@ -1,8 +1,15 @@
-from typing import Dict , Tuple ,List , Optional , Callable
+from typing import Any, Dict , Tuple ,List , Optional , Callable, Union
 from assets import Object3D
+import weakref
 import numpy as np
 from assets import create_cube  , create_pyramid , create_sphere
-from assets import Object3D ,Triangle
+from assets import Object3D ,Triangle, Mesh
+from meshIO import load_mesh
+from mathCam import MathCam
+from bvh import BVH, ray_triangles, closest_points_on_triangles
+
+# A ray or pick hit: (object name, triangle index, distance along the ray, world-space point).
+Hit = Tuple[str, int, float, np.ndarray]
 
 
 class Scene:
@@ -11,14 +18,87 @@ class Scene:
 
     Attributes:
       assetSet (Dict[str, Object3D]): Dictionary mapping asset names to Object3D instances.
+      cullStats (Dict[str, int]): Object and triangle counts from the last culled gather:
+                                  'objects', 'objects_culled', 'triangles', 'triangles_culled'.
+      meshSet (Dict[str, Mesh]): Shared meshes that instances can be created from.
+      lodStats (Dict[str, int]): Level-of-detail counts from the last updateLOD: 'objects' with
+                                 levels, 'reduced' objects drawn coarser, 'triangles_full',
+                                 'triangles_drawn' and 'triangles_saved'.
+      worldBuffer (np.ndarray): Read-only view of the persistent world-space vertex buffer (computed).
+
+    World-space vertices of objects with geometry of their own live in one contiguous
+    buffer, with a slice per object. Objects added with add_object report their changes
+    (Object3D.markChanged), and updateWorldBuffer recopies only the slices of the objects
+    that reported one since they were last written, so static objects cost nothing per
+    frame. Removed objects leave holes that are reused by compaction once they make up half
+    the buffer.
+
+    Instances of a shared Mesh, and objects drawing one of their levels of detail, keep no
+    world-space copy: returnBatches transforms all gathered instances of a mesh in one
+    batched multiply and draws them with the mesh's own index and edge arrays, so another
+    instance only costs its model matrix. Only the gathered objects are handed out, so rows
+    of culled objects and holes are never projected.
+
+    Spatial queries (pick, rayCast, queryRadius) go through two levels of bounding volume
+    hierarchies (see bvh): one over the objects' world-space boxes, and one per object over
+    its triangles in local space (Object3D.triangleBVH), which transforms do not touch. The
+    object hierarchy is rebuilt when objects are added or removed; otherwise only the leaves
+    of objects flagged as changed since the last query are refit, so queries in a static
+    scene do no per-object work.
     """
     def __init__(self) -> None:
         """
         Initialize an empty Scene.
         """
         self.assetSet: Dict[str, Object3D] = {}
-        
-    
+        self.cullStats: Dict[str, int] = {"objects": 0, "objects_culled": 0, "triangles": 0, "triangles_culled": 0}
+        self.meshSet: Dict[str, Mesh] = {}
+        self.lodStats: Dict[str, int] = {"objects": 0, "reduced": 0, "triangles_full": 0,
+                                         "triangles_drawn": 0, "triangles_saved": 0}
+        self._buffer: np.ndarray = np.zeros((0, 3))
+        self._used: int = 0
+        self._free: int = 0
+        # id(obj) -> [obj, start, length, number of times the slice was written]
+        self._slots: Dict[int, List[Any]] = {}
+        # Objects whose changes this scene listens to, and those changed since their slice was written.
+        self._watched: Dict[int, Object3D] = {}
+        self._dirty: Dict[int, Object3D] = {}
+        self._indexKey: Optional[Tuple] = None
+        self._indexCache: Optional[np.ndarray] = None
+        self._edgeKey: Optional[Tuple] = None
+        self._edgeCache: Optional[np.ndarray] = None
+        self._vertexKey: Optional[Tuple] = None
+        self._vertexCache: Optional[np.ndarray] = None
+        # Number of names in assetSet when it was last changed through the scene.
+        self._names: int = 0
+        # The object hierarchy (None when it must be rebuilt), its (name, object) primitives,
+        # id(obj) -> the object's primitives, and objects changed since it was last refit.
+        self._tree: Optional[BVH] = None
+        self._treeObjects: List[Tuple[str, Object3D]] = []
+        self._treeRows: Dict[int, List[int]] = {}
+        self._moved: Dict[int, Object3D] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Pickle the objects and meshes only; the world buffer is keyed on object ids, which
+        do not survive unpickling, so it is rebuilt on first use instead.
+
+        Returns:
+          dict: The picklable state.
+        """
+        return {"assetSet": self.assetSet, "meshSet": self.meshSet}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a pickled scene with an empty world buffer.
+
+        Parameters:
+          state (dict): The state from __getstate__.
+        """
+        self.__init__()
+        for name, obj in state["assetSet"].items():
+            self.add_object(name, obj)
+        self.meshSet.update(state["meshSet"])
 
     def add_object(self, name: str, obj: Object3D) -> None:
         """
@@ -28,9 +108,33 @@ class Scene:
           name (str): Identifier for the asset.
           obj (Object3D): The 3D object to add.
           """
-        
+        self._sweep()
+        previous: Optional[Object3D] = self.assetSet.get(name)
         self.assetSet[name] = obj
-        
+        self._names, self._tree = len(self.assetSet), None
+        if previous is not None and previous is not obj:
+            self._forget(previous)
+        self._watch(obj)
+
+    def remove_object(self, name: str) -> Object3D:
+        """
+        Remove a 3D object from the scene and free its slice of the world buffer.
+
+        Parameters:
+          name (str): Identifier of the asset.
+
+        Returns:
+          Object3D: The removed object.
+
+        Raises:
+          KeyError: If there is no asset with that name.
+        """
+        self._sweep()
+        obj: Object3D = self.assetSet.pop(name)
+        self._names, self._tree = len(self.assetSet), None
+        self._forget(obj)
+        return obj
+
         
     def add_cube(self, name: str, x: float, y: float, z: float, size: float = 1) -> None:
         """
@@ -60,7 +164,8 @@ class Scene:
         pyramid :Object3D  = create_pyramid(x, y, z, size)
         self.add_object(name, pyramid)
 
-    def add_sphere(self, name: str, x: float, y: float, z: float, radius: float = 1, resolution: int = 10) -> None:
+    def add_sphere(self, name: str, x: float, y: float, z: float, radius: float = 1, resolution: int = 10,
+                   lod: bool = False) -> None:
         """
         Create and add a sphere to the scene.
 
@@ -71,54 +176,685 @@ class Scene:
           z (float): Z coordinate of the sphere's center.
           radius (float, optional): Radius of the sphere. Default is 1.
           resolution (int, optional): Number of segments for approximation. Default is 10.
+          lod (bool, optional): Attach lower-resolution levels of detail. Default is False.
         """
-        sphere:Object3D = create_sphere(x, y, z, radius, resolution)
+        sphere:Object3D = create_sphere(x, y, z, radius, resolution, lod)
         self.add_object(name, sphere)
-    def add_file(self, name :str , filename: str, x: float = 0.0, y: float = 0.0, z: float = 0.0) -> None:
+    def add_file(self, name :str , filename: str, x: float = 0.0, y: float = 0.0, z: float = 0.0, cache: bool = True,
+                 progress: Optional[Callable[[int, int, int, float], None]] = None, lod: int = 0) -> None:
         """
-        Parses a file containing 3D triangle data and returns an Object3D instance.
+        Parses a file containing 3D triangle data and adds it to the scene as an Object3D.
 
         The file is expected to contain lines of vertex coordinates. Each triangle is defined by three consecutive
-        lines, each containing three floating-point numbers representing a vertex in 3D space.
+        lines, each containing three floating-point numbers representing a vertex in 3D space. Shared vertices
+        are welded into an indexed mesh. The first load writes a compiled binary copy next to the file, which
+        later loads memory-map instead of parsing the text (see meshIO).
 
         Parameters:
+          name (str): Identifier for the asset.
           filename (str): The path to the file containing the 3D triangle data.
           x (float): X coordinate of the object's position. Default is 0.0.
           y (float): Y coordinate of the object's position. Default is 0.0.
           z (float): Z coordinate of the object's position. Default is 0.0.
-
-        Returns:
-          Object3D: An instance of Object3D containing the parsed triangles.
+          cache (bool, optional): Read and maintain the compiled binary copy. Default is True.
+          progress (Callable, optional): Called while the text is parsed with
+                                         (triangles, bytes_read, total_bytes, triangles_per_second).
+          lod (int, optional): Number of decimated levels of detail to build (see Object3D.buildLODs). Default is 0.
         """
-        obj = Object3D(x, y, z)
-        
-        with open(filename , "r") as file :
-          points = file.readlines()
-          triList = []
-          for point in points :
-            if point == '\n':
-              continue
-            else :
-              x, y , z = tuple(point.replace("\n" , "").split())
-              x, y , z = float(x) , float(y) , float(z)
-              triList.append((x, y , z))
-              if len(triList) == 3 :
-                tri = Triangle(triList[0] ,triList[1] , triList[2])
-                obj.addTriangle(tri)
-                triList = []
+        vertices, indices = load_mesh(filename, cache=cache, progress=progress)
+        obj = Object3D(x, y, z, vertices=vertices, indices=indices)
+        if lod:
+            obj.buildLODs(lod)
         self.add_object(name , obj)
               
 
         
-    def returnTriangles(self) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    def add_mesh(self, name: str, mesh: Mesh) -> Mesh:
+        """
+        Register a shared mesh for add_instance.
+
+        Parameters:
+          name (str): Identifier for the mesh.
+          mesh (Mesh): The mesh.
+
+        Returns:
+          Mesh: The registered mesh.
+        """
+        self.meshSet[name] = mesh
+        return mesh
+
+    def add_mesh_file(self, name: str, filename: str, cache: bool = True,
+                      progress: Optional[Callable[[int, int, int, float], None]] = None, lod: int = 0) -> Mesh:
+        """
+        Load a .engine3D file once as a shared mesh for add_instance.
+
+        Parameters:
+          name (str): Identifier for the mesh.
+          filename (str): The path to the .engine3D file.
+          cache (bool, optional): Read and maintain the compiled binary copy (see add_file). Default is True.
+          progress (Callable, optional): Parsing progress callback (see add_file).
+          lod (int, optional): Number of decimated levels of detail to build, shared by all instances. Default is 0.
+
+        Returns:
+          Mesh: The registered mesh.
+        """
+        vertices, indices = load_mesh(filename, cache=cache, progress=progress)
+        mesh: Mesh = Mesh(vertices, indices)
+        if lod:
+            mesh.buildLODs(lod)
+        return self.add_mesh(name, mesh)
+
+    def add_instance(self, name: str, mesh: Union[str, Mesh], x: float = 0.0, y: float = 0.0, z: float = 0.0) -> None:
+        """
+        Place another copy of a shared mesh in the scene.
+
+        The instance references the mesh's vertex and index arrays instead of copying them,
+        so it only adds a model matrix; it can be moved with shift/rotate/scale like any
+        other object. All drawn instances of a mesh are transformed in one batch and share
+        the mesh's index buffer (see returnBatches).
+
+        Parameters:
+          name (str): Identifier for the instance.
+          mesh (str or Mesh): The mesh, or the name it was registered under in meshSet.
+          x (float): X coordinate of the instance's position. Default is 0.0.
+          y (float): Y coordinate of the instance's position. Default is 0.0.
+          z (float): Z coordinate of the instance's position. Default is 0.0.
+
+        Raises:
+          KeyError: If `mesh` is a name that is not in meshSet.
+        """
+        if isinstance(mesh, str):
+            mesh = self.meshSet[mesh]
+        self.add_object(name, Object3D(x, y, z, mesh=mesh))
+
+    def visibleObjects(self, cam: Optional[MathCam] = None) -> List[Object3D]:
+        """
+        Return the objects that may be visible from a camera, rejecting whole objects early.
+
+        Each object's bounding sphere is tested against the camera's frustum planes, and objects
+        that straddle a plane are tested again with their AABB, all vectorized across objects.
+        An object is culled only if it lies entirely outside one plane. The counts are stored
+        in self.cullStats.
+
+        Parameters:
+          cam (MathCam, optional): The camera; without one every object is returned.
+
+        Returns:
+          list: The objects that were not culled, in scene order.
+        """
+        objects: List[Object3D] = [obj for obj in self.assetSet.values() if len(obj.Indices)]
+        triangles: np.ndarray = np.array([len(obj.Indices) for obj in objects], dtype=np.int64)
+        if cam is None or not objects:
+            keep: np.ndarray = np.ones(len(objects), dtype=bool)
+        else:
+            planes: np.ndarray = cam.frustum_planes()
+            bounds: List[Tuple[np.ndarray, np.ndarray, float]] = [obj._worldBounds() for obj in objects]
+            centres: np.ndarray = np.array([b[1] for b in bounds])
+            radii: np.ndarray = np.array([b[2] for b in bounds])
+            boxes: np.ndarray = np.array([b[0] for b in bounds])
+            distance: np.ndarray = centres @ planes[:, :3].T + planes[:, 3]
+            keep = ~(distance < -radii[:, None]).any(axis=1)
+            straddling: np.ndarray = keep & (distance < radii[:, None]).any(axis=1)
+            if straddling.any():
+                # The box corner furthest along each plane normal decides whether the box is out.
+                positive: np.ndarray = planes[:, :3] > 0
+                far: np.ndarray = np.where(positive[None], boxes[straddling, 1][:, None], boxes[straddling, 0][:, None])
+                outside: np.ndarray = (np.einsum("opk,pk->op", far, planes[:, :3]) + planes[:, 3] < 0).any(axis=1)
+                keep[np.flatnonzero(straddling)[outside]] = False
+        self.cullStats = {"objects": len(objects), "objects_culled": int((~keep).sum()),
+                          "triangles": int(triangles.sum()), "triangles_culled": int(triangles[~keep].sum())}
+        return [obj for obj, visible in zip(objects, keep) if visible]
+
+    def updateLOD(self, cam: MathCam, objects: Optional[List[Object3D]] = None, hysteresis: float = 0.2) -> int:
+        """
+        Choose the level of detail of every object that has some, from its size on screen.
+
+        The projected radius of each object's bounding sphere (MathCam.projected_radius) is
+        compared with its lodThresholds. To avoid popping back and forth at a boundary, an
+        object only moves to a coarser level once it is `hysteresis` below the threshold, and
+        back to a finer one once it is `hysteresis` above it. The counts are stored in
+        self.lodStats.
+
+        Parameters:
+          cam (MathCam): The camera the objects are seen from.
+          objects (List[Object3D], optional): Objects to update; every object in the scene if None.
+          hysteresis (float, optional): Relative band around each threshold. Default is 0.2.
+
+        Returns:
+          int: Number of objects whose level changed.
+        """
+        candidates: List[Object3D] = [obj for obj in (self.assetSet.values() if objects is None else objects) if obj.lods]
+        changed: int = 0
+        full: int = 0
+        drawn: int = 0
+        reduced: int = 0
+        if candidates:
+            bounds: List[Tuple[np.ndarray, np.ndarray, float]] = [obj._worldBounds() for obj in candidates]
+            pixels: np.ndarray = cam.projected_radius(np.array([b[1] for b in bounds]), np.array([b[2] for b in bounds]))
+            for obj, size in zip(candidates, pixels):
+                thresholds: np.ndarray = np.asarray(obj.lodThresholds)
+                coarsest: int = int((size < thresholds * (1 - hysteresis)).sum())
+                finest: int = int((size < thresholds * (1 + hysteresis)).sum())
+                level: int = min(max(obj.lodLevel, coarsest), finest)
+                if level != obj.lodLevel:
+                    obj.lodLevel = level
+                    changed += 1
+                full += len(obj.Indices)
+                drawn += len(obj.currentMesh()[1])
+                reduced += level > 0
+        self.lodStats = {"objects": len(candidates), "reduced": reduced, "triangles_full": full,
+                         "triangles_drawn": drawn, "triangles_saved": full - drawn}
+        return changed
+
+    def _watch(self, obj: Object3D) -> None:
+        """
+        Start listening to an object's changes, and flag it so its slice gets written.
+
+        Parameters:
+          obj (Object3D): An object of the scene.
+        """
+        if id(obj) not in self._watched:
+            self._watched[id(obj)] = obj
+            obj._listeners.append(weakref.WeakMethod(self._objectChanged))
+        self._objectChanged(obj)
+
+    def _objectChanged(self, obj: Object3D) -> None:
+        """
+        Flag an object whose transform, geometry or level of detail changed (see Object3D.markChanged).
+
+        Parameters:
+          obj (Object3D): The object.
+        """
+        self._dirty[id(obj)] = obj
+        self._moved[id(obj)] = obj
+
+    def _forget(self, obj: Object3D) -> None:
+        """
+        Stop listening to an object and free its slice unless it is still in the scene under another name.
+
+        Parameters:
+          obj (Object3D): The object that was removed or replaced.
+        """
+        if id(obj) not in self._watched or any(other is obj for other in self.assetSet.values()):
+            return
+        self._unwatch(id(obj))
+
+    def _unwatch(self, key: int) -> None:
+        """
+        Stop listening to a watched object and free its slice of the world buffer.
+
+        Parameters:
+          key (int): The id of the object.
+        """
+        obj: Object3D = self._watched.pop(key)
+        obj._listeners = [listener for listener in obj._listeners if listener() not in (None, self._objectChanged)]
+        self._dirty.pop(key, None)
+        self._moved.pop(key, None)
+        self._release(key)
+
+    def _release(self, key: int) -> None:
+        """
+        Free an object's slice of the world buffer, if it has one.
+
+        Parameters:
+          key (int): The id of the object.
+        """
+        slot: Optional[List[Any]] = self._slots.pop(key, None)
+        if slot is None:
+            return
+        self._free += slot[2]
+        self._indexKey = self._edgeKey = None
+        if self._free * 2 > self._used:
+            self._compact()
+
+    def _allocate(self, length: int) -> int:
+        """
+        Reserve `length` rows at the end of the world buffer, growing it geometrically.
+
+        Parameters:
+          length (int): Number of vertices.
+
+        Returns:
+          int: The first row of the new slice.
+        """
+        start: int = self._used
+        if start + length > len(self._buffer):
+            grown: np.ndarray = np.zeros((max(start + length, 2 * len(self._buffer), 64), 3))
+            grown[:start] = self._buffer[:start]
+            self._buffer = grown
+        self._used += length
+        return start
+
+    def _compact(self) -> None:
+        """
+        Close the holes left by removed objects by sliding live slices down, keeping their contents.
+        """
+        start: int = 0
+        for slot in sorted(self._slots.values(), key=lambda slot: slot[1]):
+            if slot[1] != start:
+                self._buffer[start:start + slot[2]] = self._buffer[slot[1]:slot[1] + slot[2]]
+                slot[1] = start
+            start += slot[2]
+        self._used, self._free = start, 0
+        self._indexKey = self._edgeKey = None
+
+    def updateWorldBuffer(self, objects: Optional[List[Object3D]] = None) -> int:
+        """
+        Bring the world-space vertices of objects up to date in the persistent buffer.
+
+        Only objects flagged since their slice was last written are visited: those just added,
+        and those shifted, rotated, scaled, given new geometry or switched to another level of
+        detail (see Object3D.markChanged). Objects whose vertex count changed move to a new
+        slice. Objects drawing a shared mesh have no slice (see returnBatches), and lose the
+        one they had. Objects removed from assetSet directly (rather than with remove_object)
+        are noticed here and their slices freed.
+
+        Parameters:
+          objects (List[Object3D], optional): Objects to update; every flagged object in the
+                                              scene if None. Flagged objects left out stay flagged.
+
+        Returns:
+          int: Number of objects whose vertices were recomputed.
+        """
+        self._sweep()
+        if not self._dirty:
+            return 0
+        if objects is None:
+            flagged: List[Object3D] = list(self._dirty.values())
+        else:
+            wanted: set = {id(obj) for obj in objects}
+            flagged = [obj for key, obj in self._dirty.items() if key in wanted]
+        written: int = 0
+        for obj in flagged:
+            del self._dirty[id(obj)]
+            if Scene._sharedMesh(obj) is not None:
+                self._release(id(obj))
+                continue
+            slot: Optional[List[Any]] = self._slots.get(id(obj))
+            length: int = len(obj.Vertices)
+            if slot is None or slot[2] != length:
+                if slot is not None:
+                    self._free += slot[2]
+                slot = [obj, self._allocate(length), length, 0]
+                self._slots[id(obj)] = slot
+            target: np.ndarray = self._buffer[slot[1]:slot[1] + length]
+            np.matmul(obj.Vertices, obj.Model[:3, :3].T, out=target)
+            target += obj.Model[:3, 3]
+            slot[3] += 1
+            written += 1
+        return written
+
+    def _sweep(self) -> None:
+        """
+        Notice names removed from assetSet directly rather than with remove_object, and stop
+        listening to the objects that left the scene with them.
+        """
+        if len(self.assetSet) == self._names:
+            return
+        self._names, self._tree = len(self.assetSet), None
+        live: set = {id(obj) for obj in self.assetSet.values()}
+        for key in [key for key in self._watched if key not in live]:
+            self._unwatch(key)
+
+    @staticmethod
+    def _sharedMesh(obj: Object3D) -> Optional[Mesh]:
+        """
+        Return the mesh an object draws if it is shared or a level of detail, else None.
+
+        Parameters:
+          obj (Object3D): The object.
+
+        Returns:
+          Mesh: The level of detail being drawn, or the mesh the object is an instance of.
+        """
+        return obj.lods[obj.lodLevel - 1] if obj.lodLevel else obj.mesh
+
+    @staticmethod
+    def _instanceVertices(vertices: np.ndarray, objects: List[Object3D]) -> np.ndarray:
+        """
+        Transform one mesh's vertices by the model matrices of K objects, in one batched multiply.
+
+        Parameters:
+          vertices (np.ndarray): The (V, 3) local vertices the objects share.
+          objects (List[Object3D]): The objects.
+
+        Returns:
+          np.ndarray: A read-only (K, V, 3) array of world-space vertices.
+        """
+        models: np.ndarray = np.array([obj.Model for obj in objects])
+        world: np.ndarray = np.matmul(vertices, models[:, :3, :3].transpose(0, 2, 1))
+        world += models[:, None, :3, 3]
+        world.setflags(write=False)
+        return world
+
+    @property
+    def worldBuffer(self) -> np.ndarray:
+        """
+        A read-only view of the used part of the world-space vertex buffer.
+        """
+        view: np.ndarray = self._buffer[:self._used]
+        view.setflags(write=False)
+        return view
+
+    def _gatherVertices(self, objects: List[Object3D], slots: List[List[Any]]) -> np.ndarray:
+        """
+        Return the world-space vertices of some objects, packed one after another in order.
+
+        When the objects' slices already lie back to back in the world buffer, this is a view
+        of it. Otherwise the slices are copied out, and the copy is reused until one of the
+        objects is rewritten or moves.
+
+        Parameters:
+          objects (List[Object3D]): The gathered objects, with up-to-date slices.
+          slots (List): Their world buffer slots.
+
+        Returns:
+          np.ndarray: A read-only (V, 3) array.
+        """
+        key: Tuple = (id(self._buffer),) + tuple((id(obj), slot[1], slot[2], slot[3])
+                                                 for obj, slot in zip(objects, slots))
+        if key != self._vertexKey:
+            starts: np.ndarray = np.array([slot[1] for slot in slots], dtype=np.int64)
+            lengths: np.ndarray = np.array([slot[2] for slot in slots], dtype=np.int64)
+            if len(slots) == 0:
+                vertices: np.ndarray = np.empty((0, 3))
+            elif (starts[1:] == starts[:-1] + lengths[:-1]).all():
+                vertices = self._buffer[starts[0]:starts[0] + int(lengths.sum())]
+            else:
+                vertices = np.concatenate([self._buffer[slot[1]:slot[1] + slot[2]] for slot in slots])
+            vertices.setflags(write=False)
+            self._vertexCache, self._vertexKey = vertices, key
+        return self._vertexCache
+
+    def _gatherIndices(self, objects: List[Object3D], slots: List[List[Any]], edges: bool) -> np.ndarray:
+        """
+        Return the index (or edge) buffer of objects gathered by _gatherVertices.
+
+        Each object's own indices are offset by the rows of the objects before it. The buffer
+        is rebuilt only when the gathered objects or their topology change.
+
+        Parameters:
+          objects (List[Object3D]): The gathered objects, with geometry of their own.
+          slots (List): Their world buffer slots.
+          edges (bool): Gather the unique edges (Object3D.Edges) instead of the triangles.
+
+        Returns:
+          np.ndarray: A read-only (N, 3) index or (E, 2) edge array.
+        """
+        key: Tuple = tuple((id(obj), obj._topologyVersion if edges else obj._geometryVersion, slot[2])
+                           for obj, slot in zip(objects, slots))
+        if key != (self._edgeKey if edges else self._indexKey):
+            offsets: np.ndarray = np.cumsum([0] + [slot[2] for slot in slots[:-1]])
+            merged: np.ndarray = np.concatenate([(obj.Edges if edges else obj.Indices) + offset
+                                                 for obj, offset in zip(objects, offsets)])
+            merged.setflags(write=False)
+            if edges:
+                self._edgeCache, self._edgeKey = merged, key
+            else:
+                self._indexCache, self._indexKey = merged, key
+        return self._edgeCache if edges else self._indexCache
+
+    def returnBatches(self, cam: Optional[MathCam] = None, objects: Optional[List[Object3D]] = None,
+                      edges: bool = False) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Gather the world-space geometry of the scene, grouped by the mesh it is drawn from.
+
+        Objects with geometry of their own come first, as one batch: their vertices are those
+        of the world buffer (see returnMesh) and their indices are merged once and cached.
+        Then each shared mesh gives a batch of all its gathered instances (and objects
+        showing it as a level of detail), transformed together in one batched multiply, with
+        the mesh's own index or edge array, so nothing is kept or copied per instance.
+        MathCam.project_triangles and project_segments project such stacked copies directly.
+
+        Parameters:
+          cam (MathCam, optional): If given, objects outside its view frustum are left out
+                                   (see visibleObjects).
+          objects (List[Object3D], optional): Objects of the scene to gather instead; `cam` is then ignored.
+          edges (bool, optional): Give each batch's unique edges, for wireframe drawing,
+                                  instead of its triangles. Default is False.
+
+        Returns:
+          list: (vertices, indices) pairs, each with a (C, V, 3) read-only array of C copies of
+                V world-space vertices and an (N, 3) index buffer (or (E, 2) edge array) that
+                every copy uses.
+        """
+        objects = self.visibleObjects(cam) if objects is None else objects
+        self.updateWorldBuffer(objects)
+        own: List[Object3D] = []
+        shared: Dict[int, Tuple[Mesh, List[Object3D]]] = {}
+        for obj in objects:
+            mesh: Optional[Mesh] = Scene._sharedMesh(obj)
+            if mesh is None:
+                own.append(obj)
+            else:
+                shared.setdefault(id(mesh), (mesh, []))[1].append(obj)
+        batches: List[Tuple[np.ndarray, np.ndarray]] = []
+        if own:
+            slots: List[List[Any]] = [self._slots[id(obj)] for obj in own]
+            batches.append((self._gatherVertices(own, slots)[None], self._gatherIndices(own, slots, edges)))
+        for mesh, group in shared.values():
+            batches.append((Scene._instanceVertices(mesh.Vertices, group), mesh.Edges if edges else mesh.Indices))
+        return batches
+
+    @staticmethod
+    def _merge(batches: List[Tuple[np.ndarray, np.ndarray]], width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Merge batches from returnBatches into one vertex array and one index array into it.
+
+        Parameters:
+          batches (list): The batches.
+          width (int): Indices per row: 3 for triangles, 2 for edges.
+
+        Returns:
+          tuple: ((V, 3) vertices, (N, width) indices).
+        """
+        if not batches:
+            return np.empty((0, 3)), np.empty((0, width), dtype=np.int64)
+        if len(batches) == 1 and len(batches[0][0]) == 1:
+            return batches[0][0][0], batches[0][1]
+        vertices: List[np.ndarray] = []
+        indices: List[np.ndarray] = []
+        base: int = 0
+        for copies, rows in batches:
+            offsets: np.ndarray = base + np.arange(len(copies)) * copies.shape[1]
+            indices.append((rows[None] + offsets[:, None, None]).reshape(-1, width))
+            vertices.append(copies.reshape(-1, 3))
+            base += copies.shape[0] * copies.shape[1]
+        return np.concatenate(vertices), np.concatenate(indices)
+
+    def returnMesh(self, cam: Optional[MathCam] = None,
+                   objects: Optional[List[Object3D]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aggregate the indexed meshes of all objects in the scene into one buffer.
+
+        Without instances of shared meshes, the vertices are a view of the persistent world
+        buffer when the gathered objects' slices are adjacent there (see updateWorldBuffer),
+        otherwise a copy of the slices, and the cached index buffer of returnBatches; they are
+        valid until the scene's objects next change. Instances are merged into a new copy on
+        every call, so drawing goes through returnBatches instead.
+
+        Parameters:
+          cam (MathCam, optional): If given, objects outside its view frustum are left out
+                                   (see visibleObjects).
+          objects (List[Object3D], optional): Objects of the scene to gather instead, e.g. the
+                                              result of an earlier visibleObjects call; `cam`
+                                              is then ignored.
+
+        Returns:
+          tuple: (vertices, indices) with a (V, 3) array of absolute vertex positions and an
+                 (N, 3) index buffer into it covering every gathered triangle.
+        """
+        return Scene._merge(self.returnBatches(cam, objects), 3)
+
+    def returnEdges(self, cam: Optional[MathCam] = None,
+                    objects: Optional[List[Object3D]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aggregate the unique edges of all objects in the scene into one buffer.
+
+        Like returnMesh, but with each object's edge list (Object3D.currentEdges), so an edge
+        shared by two triangles appears once.
+
+        Parameters:
+          cam (MathCam, optional): If given, objects outside its view frustum are left out.
+          objects (List[Object3D], optional): Objects of the scene to gather instead; `cam` is then ignored.
+
+        Returns:
+          tuple: (vertices, edges) with the (V, 3) vertices of the gathered objects, as
+                 returned by returnMesh, and an (E, 2) array of vertex index pairs into them.
+        """
+        return Scene._merge(self.returnBatches(cam, objects, edges=True), 2)
+
+    def _objectTree(self) -> Tuple[List[Tuple[str, Object3D]], BVH]:
+        """
+        Return the objects with triangles and a BVH over their world-space AABBs.
+
+        The hierarchy is rebuilt when objects are added or removed, or gain or lose all their
+        triangles. Otherwise only the boxes of objects flagged since the last query (see
+        Object3D.markChanged) are recomputed and their leaves refit; with nothing flagged the
+        hierarchy is returned as it is.
+
+        Returns:
+          tuple: ((name, object) pairs, BVH whose primitive i is pair i).
+        """
+        self._sweep()
+        if self._tree is not None and self._moved:
+            moved: List[Object3D] = list(self._moved.values())
+            if any((id(obj) in self._treeRows) != bool(len(obj.Indices)) for obj in moved):
+                self._tree = None
+            else:
+                rows: List[int] = []
+                boxes: List[np.ndarray] = []
+                for obj in moved:
+                    for row in self._treeRows.get(id(obj), []):
+                        rows.append(row)
+                        boxes.append(obj.AABB)
+                if rows:
+                    corners: np.ndarray = np.array(boxes)
+                    self._tree.refit(corners[:, 0], corners[:, 1], np.array(rows))
+        if self._tree is None:
+            items: List[Tuple[str, Object3D]] = [(name, obj) for name, obj in self.assetSet.items() if len(obj.Indices)]
+            corners = np.array([obj.AABB for _, obj in items]).reshape(-1, 2, 3)
+            self._tree = BVH(corners[:, 0], corners[:, 1], leaf_size=2)
+            self._treeObjects = items
+            self._treeRows = {}
+            for row, (_, obj) in enumerate(items):
+                self._treeRows.setdefault(id(obj), []).append(row)
+        self._moved.clear()
+        return self._treeObjects, self._tree
+
+    def rayCast(self, origin: np.ndarray, direction: np.ndarray, max_distance: float = np.inf,
+                min_distance: float = 0.0) -> Optional[Hit]:
+        """
+        Find the nearest triangle hit by a ray.
+
+        Objects are visited in the order the ray enters their boxes and skipped once they
+        start beyond the nearest hit so far. Within an object the ray is moved into local
+        space, where the object's triangle BVH gives the candidates for an exact test. Both
+        faces of a triangle count.
+
+        Parameters:
+          origin (np.ndarray): Ray origin in world space.
+          direction (np.ndarray): Ray direction; it need not be normalized.
+          max_distance (float, optional): Ignore hits further than this from the origin. Default is infinity.
+          min_distance (float, optional): Ignore hits nearer than this. Default is 0.
+
+        Returns:
+          tuple: (name, triangle index, distance, point) of the nearest hit, or None.
+
+        Raises:
+          ValueError: If the direction is zero.
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        length: float = float(np.linalg.norm(direction))
+        if length == 0:
+            raise ValueError("The ray direction must not be zero")
+        direction = direction / length
+        items, tree = self._objectTree()
+        candidates, entries = tree.intersect_ray(origin, direction, min_distance, max_distance)
+        best: Optional[Hit] = None
+        nearest: float = max_distance
+        for candidate, entry in zip(candidates, entries):
+            if entry > nearest:
+                break
+            name, obj = items[candidate]
+            inverse: np.ndarray = np.linalg.inv(obj.Model)
+            local_origin: np.ndarray = inverse[:3, :3] @ origin + inverse[:3, 3]
+            local_direction: np.ndarray = inverse[:3, :3] @ direction
+            triangles, _ = obj.triangleBVH().intersect_ray(local_origin, local_direction, min_distance, nearest)
+            if len(triangles) == 0:
+                continue
+            t: np.ndarray = ray_triangles(local_origin, local_direction, obj.Vertices[obj.Indices[triangles]])
+            t[(t < min_distance) | (t > nearest)] = np.inf
+            closest: int = int(np.argmin(t))
+            if np.isfinite(t[closest]):
+                nearest = float(t[closest])
+                best = (name, int(triangles[closest]), nearest, origin + nearest * direction)
+        return best
+
+    def pick(self, screen_x: float, screen_y: float, cam: MathCam) -> Optional[Hit]:
+        """
+        Find the triangle seen at a point of the screen.
+
+        Parameters:
+          screen_x (float): First projection coordinate, i.e. the painter's row; the centre of
+                            pixel (r, c) is (r + 0.5, c + 0.5).
+          screen_y (float): Second projection coordinate, the painter's column.
+          cam (MathCam): The camera the scene is rendered with.
+
+        Returns:
+          tuple: (name, triangle index, distance from the camera, point), or None if nothing
+                 beyond the camera's view plane is there.
+        """
+        origin, direction = cam.ray(screen_x, screen_y)
+        return self.rayCast(origin, direction, min_distance=float(np.linalg.norm(direction)))
+
+    def queryRadius(self, centre: np.ndarray, radius: float) -> Dict[str, np.ndarray]:
+        """
+        Find the triangles that come within a distance of a point.
+
+        Objects are found through the scene BVH. Within each one, the object's triangle BVH is
+        searched with the query sphere moved to local space (its radius divided by the
+        smallest axis scale), and the candidates are tested exactly in world space.
+
+        Parameters:
+          centre (np.ndarray): The point in world space.
+          radius (float): The distance.
+
+        Returns:
+          dict: Object name -> sorted indices of its triangles within `radius`, for every
+                object that has any.
+        """
+        centre = np.asarray(centre, dtype=np.float64)
+        items, tree = self._objectTree()
+        found: Dict[str, np.ndarray] = {}
+        for candidate in tree.intersect_sphere(centre, radius):
+            name, obj = items[candidate]
+            inverse: np.ndarray = np.linalg.inv(obj.Model)
+            smallest: float = float(np.linalg.svd(obj.Model[:3, :3], compute_uv=False).min())
+            triangles: np.ndarray = obj.triangleBVH().intersect_sphere(inverse[:3, :3] @ centre + inverse[:3, 3],
+                                                                      radius / smallest)
+            if len(triangles) == 0:
+                continue
+            world: np.ndarray = obj.Vertices[obj.Indices[triangles]] @ obj.Model[:3, :3].T + obj.Model[:3, 3]
+            gap: np.ndarray = closest_points_on_triangles(centre, world) - centre
+            inside: np.ndarray = np.einsum("ij,ij->i", gap, gap) <= radius * radius
+            if inside.any():
+                found[name] = triangles[inside]
+        return found
+
+    def returnTriangles(self, cam: Optional[MathCam] = None) -> np.ndarray:
         """
         Aggregate triangles from all objects in the scene.
 
+        Parameters:
+          cam (MathCam, optional): If given, objects outside its view frustum are left out
+                                   (see visibleObjects).
+
         Returns:
-          list: A list of triangles from all scene assets.
+          np.ndarray: An (N, 3, 3) array of triangles from all scene assets.
         """
-        pointsToRender: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
-        for obj in self.assetSet.values():
-            pointsToRender.extend(obj.returnTriangles())
-        return pointsToRender
-    
\ No newline at end of file
+        batches: List[Tuple[np.ndarray, np.ndarray]] = self.returnBatches(cam)
+        if not batches:
+            return np.empty((0, 3, 3))
+        return np.concatenate([copies[:, indices].reshape(-1, 3, 3) for copies, indices in batches])
@@ -1,6 +1,9 @@
 import numpy as np
 import math
+import weakref
+from functools import lru_cache
 from typing import List, Tuple, Optional, Dict, Any
+from bvh import BVH
 
 class Triangle:
     """
@@ -25,15 +28,300 @@ class Triangle:
         self.p3: np.ndarray = np.array(p3)
 
 
+DEFAULT_TOLERANCE: float = 1e-6
+
+
+def weld_vertices(vertices: np.ndarray, indices: Optional[np.ndarray] = None,
+                  tolerance: float = DEFAULT_TOLERANCE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge vertices that coincide within a tolerance and remap the index buffer.
+
+    Vertices are snapped to a grid of `tolerance`-sized cells and those that land in the same
+    cell are merged, keeping the first one's exact coordinates.
+
+    Parameters:
+      vertices (np.ndarray): A (V, 3) array of vertices.
+      indices (np.ndarray, optional): An (N, 3) index buffer into `vertices`. Default treats every
+                                      three consecutive vertices as a triangle.
+      tolerance (float, optional): Grid cell size used to decide which vertices are equal.
+
+    Returns:
+      tuple: (vertices, indices) with the unique (U, 3) vertices and the remapped (N, 3) index buffer.
+    """
+    vertices = np.asarray(vertices).reshape(-1, 3)
+    if indices is None:
+        indices = np.arange(len(vertices)).reshape(-1, 3)
+    if len(vertices) == 0:
+        return vertices.copy(), np.asarray(indices).reshape(-1, 3)
+    keys: np.ndarray = np.round(vertices / tolerance).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    dtype: Any = np.int32 if len(first) < 2 ** 31 else np.int64
+    return vertices[first], inverse.reshape(-1).astype(dtype)[indices]
+
+
+def unique_edges(indices: np.ndarray) -> np.ndarray:
+    """
+    Return every edge of an indexed mesh once.
+
+    Triangles are outlined v0->v1, v1->v2, v2->v0. An edge shared by several triangles, as
+    every edge of a closed mesh is, is kept once, in the direction and position of its
+    first occurrence.
+
+    Parameters:
+      indices (np.ndarray): An (N, 3) index buffer.
+
+    Returns:
+      np.ndarray: A read-only (E, 2) array of vertex index pairs.
+    """
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    edges: np.ndarray = np.stack((indices, np.roll(indices, -1, axis=1)), axis=2).reshape(-1, 2)
+    span: int = int(edges.max()) + 1 if len(edges) else 1
+    keys: np.ndarray = edges.min(axis=1) * span + edges.max(axis=1)
+    _, first = np.unique(keys, return_index=True)
+    edges = edges[np.sort(first)]
+    edges.setflags(write=False)
+    return edges
+
+
+def mesh_bounds(vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+    """
+    Compute the axis-aligned box and a bounding sphere of a vertex array.
+
+    Parameters:
+      vertices (np.ndarray): A (V, 3) array of vertices.
+
+    Returns:
+      tuple: (lo, hi, centre, radius) with the AABB corners, and the centre and radius of a
+             bounding sphere around the AABB centre. An empty array has zero-size bounds.
+    """
+    if len(vertices) == 0:
+        return np.zeros(3), np.zeros(3), np.zeros(3), 0.0
+    lo: np.ndarray = vertices.min(axis=0).astype(np.float64)
+    hi: np.ndarray = vertices.max(axis=0).astype(np.float64)
+    centre: np.ndarray = (lo + hi) / 2
+    radius: float = float(np.sqrt(((vertices - centre) ** 2).sum(axis=1).max()))
+    return lo, hi, centre, radius
+
+
+LOD_PIXELS: float = 64.0
+
+
+def decimate(vertices: np.ndarray, indices: np.ndarray, cell: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simplify a mesh by vertex clustering.
+
+    Vertices are grouped by the grid cell of size `cell` they fall in and each group is
+    replaced by its mean. Triangles that collapse (two corners in one cell) and repeated
+    triangles are dropped, and vertices no longer used are removed.
+
+    Parameters:
+      vertices (np.ndarray): A (V, 3) array of vertices.
+      indices (np.ndarray): An (N, 3) index buffer.
+      cell (float): Grid cell size; larger cells remove more detail.
+
+    Returns:
+      tuple: (vertices, indices) of the simplified mesh.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    indices = np.asarray(indices).reshape(-1, 3)
+    if len(indices) == 0:
+        return np.empty((0, 3)), np.empty((0, 3), dtype=np.int64)
+    _, cluster = np.unique(np.floor(vertices / cell).astype(np.int64), axis=0, return_inverse=True)
+    cluster = cluster.reshape(-1)
+    counts: np.ndarray = np.bincount(cluster)
+    merged: np.ndarray = np.stack([np.bincount(cluster, weights=vertices[:, k]) for k in range(3)], axis=1) / counts[:, None]
+    triangles: np.ndarray = cluster[indices]
+    keep: np.ndarray = ((triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2])
+                        & (triangles[:, 2] != triangles[:, 0]))
+    triangles = triangles[keep]
+    _, first = np.unique(np.sort(triangles, axis=1), axis=0, return_index=True)
+    triangles = triangles[np.sort(first)]
+    used, remapped = np.unique(triangles, return_inverse=True)
+    return merged[used], remapped.reshape(-1, 3)
+
+
+def decimation_lods(vertices: np.ndarray, indices: np.ndarray, levels: int = 3) -> List["Mesh"]:
+    """
+    Build coarser versions of a mesh with decimate for level-of-detail rendering.
+
+    Level k clusters vertices on a grid of 1/(64 / 2**k) of the bounding-box diagonal, so
+    each level is roughly a quarter of the triangles of the one before. Levels that would
+    not remove any triangles are skipped.
+
+    Parameters:
+      vertices (np.ndarray): A (V, 3) array of vertices.
+      indices (np.ndarray): An (N, 3) index buffer.
+      levels (int, optional): Maximum number of coarser levels. Default is 3.
+
+    Returns:
+      list: Meshes from finest to coarsest, not including the original.
+    """
+    lo, hi, _, _ = mesh_bounds(np.asarray(vertices).reshape(-1, 3))
+    diagonal: float = float(np.linalg.norm(hi - lo))
+    meshes: List[Mesh] = []
+    count: int = len(indices)
+    for k in range(levels):
+        if diagonal == 0:
+            break
+        coarse: Tuple[np.ndarray, np.ndarray] = decimate(vertices, indices, diagonal / (64 / 2 ** k))
+        if len(coarse[1]) == 0 or len(coarse[1]) >= count:
+            continue
+        meshes.append(Mesh(*coarse))
+        count = len(coarse[1])
+    return meshes
+
+
+def lod_thresholds(levels: int, pixels: float = LOD_PIXELS) -> List[float]:
+    """
+    Return default switch points for `levels` coarser meshes.
+
+    Level k (k >= 1) is used once the projected bounding-sphere radius is below
+    pixels / 2**(k - 1), i.e. 64, 32, 16, ... pixels by default.
+
+    Parameters:
+      levels (int): Number of coarser meshes.
+      pixels (float, optional): Radius in pixels below which the first coarser level is used.
+
+    Returns:
+      list: Decreasing radii in pixels, one per coarser level.
+    """
+    return [pixels / 2 ** k for k in range(levels)]
+
+
+class Mesh:
+    """
+    Read-only indexed geometry shared by any number of Object3D instances.
+
+    An instance (Object3D(x, y, z, mesh=mesh)) references the mesh's arrays instead of
+    copying them, so it costs only its model matrix and bookkeeping. Changing an instance's
+    geometry gives it a private copy and detaches it from the mesh.
+
+    Attributes:
+      Vertices (np.ndarray): A read-only (V, 3) array of vertices in local space.
+      Indices (np.ndarray): A read-only (N, 3) index buffer.
+      Triangles (np.ndarray): The (N, 3, 3) triangle vertices (computed).
+      Edges (np.ndarray): The (E, 2) unique edges (computed once, see unique_edges).
+      lods (List[Mesh]): Coarser versions of the mesh, finest first, inherited by new instances.
+      lodThresholds (List[float]): Projected radii in pixels below which each of `lods` is used.
+    """
+    def __init__(self, vertices: np.ndarray, indices: Optional[np.ndarray] = None) -> None:
+        """
+        Initialize the Mesh.
+
+        Parameters:
+          vertices (np.ndarray): A (V, 3) array of vertices.
+          indices (np.ndarray, optional): An (N, 3) index buffer; default treats every three
+                                          consecutive vertices as a triangle.
+        """
+        vertices = np.asarray(vertices)
+        if vertices.dtype.kind != 'f':
+            vertices = vertices.astype(np.float64)
+        vertices = vertices.reshape(-1, 3).view()
+        indices = np.arange(len(vertices)).reshape(-1, 3) if indices is None else np.asarray(indices).reshape(-1, 3)
+        indices = indices.view()
+        vertices.setflags(write=False)
+        indices.setflags(write=False)
+        self.Vertices: np.ndarray = vertices
+        self.Indices: np.ndarray = indices
+        self._bounds: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, float]] = None
+        self._edges: Optional[np.ndarray] = None
+        self._bvh: Optional[BVH] = None
+        self.lods: List[Mesh] = []
+        self.lodThresholds: List[float] = []
+
+    def buildLODs(self, levels: int = 3) -> List["Mesh"]:
+        """
+        Generate coarser levels of detail by decimation (see decimation_lods) with default thresholds.
+
+        Parameters:
+          levels (int, optional): Maximum number of coarser levels. Default is 3.
+
+        Returns:
+          list: The new `lods`.
+        """
+        self.lods = decimation_lods(self.Vertices, self.Indices, levels)
+        self.lodThresholds = lod_thresholds(len(self.lods))
+        return self.lods
+
+    @classmethod
+    def from_object(cls, obj: "Object3D") -> "Mesh":
+        """
+        Create a mesh holding a copy of an object's local geometry.
+
+        Parameters:
+          obj (Object3D): The object to copy.
+
+        Returns:
+          Mesh: The new mesh.
+        """
+        return cls(obj.Vertices.copy(), obj.Indices.copy())
+
+    @property
+    def Triangles(self) -> np.ndarray:
+        """
+        The (N, 3, 3) array of triangle vertices in local space.
+        """
+        return self.Vertices[self.Indices]
+
+    @property
+    def Edges(self) -> np.ndarray:
+        """
+        The (E, 2) array of unique edges, each listed once (see unique_edges).
+        """
+        if self._edges is None:
+            self._edges = unique_edges(self.Indices)
+        return self._edges
+
+    def triangleBVH(self) -> BVH:
+        """
+        Return a bounding volume hierarchy over the mesh's triangles in local space, built once.
+
+        Returns:
+          BVH: Primitive i is triangle i of Indices.
+        """
+        if self._bvh is None:
+            self._bvh = BVH.from_triangles(self.Triangles)
+        return self._bvh
+
+    def _localBounds(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Return the mesh's bounds (see mesh_bounds), computed once.
+        """
+        if self._bounds is None:
+            self._bounds = mesh_bounds(self.Vertices)
+        return self._bounds
+
+
 class Object3D:
     """
     Represents a 3D object composed of triangles and a position.
 
+    The geometry is an indexed mesh: one contiguous (V, 3) array of unique vertices and an
+    (N, 3) index buffer, so transforms run over every shared vertex once instead of once per
+    triangle that uses it. The base geometry is never rewritten: rotate, scale and shift only
+    update a 4x4 model matrix, and world-space vertices are computed from it in one matrix
+    multiply when they are asked for, then cached until the transform or geometry changes.
+
+    Every change of transform, geometry or level of detail goes through markChanged, which
+    tells the scenes holding the object (see Scene.add_object), so they only update what moved.
+
     Attributes:
-      Object_position (np.ndarray): The pivot position of the object.
-      TriangleSet (List[Triangle]): A list of Triangle objects relative to the pivot.
+      Object_position (np.ndarray): The pivot position of the object (a view of Model[:3, 3]).
+      Model (np.ndarray): The 4x4 model matrix mapping local vertices to world space.
+      Vertices (np.ndarray): A (V, 3) array of vertices in local space, relative to the pivot.
+      Indices (np.ndarray): An (N, 3) integer array of vertex indices, one row per triangle.
+      Triangles (np.ndarray): The (N, 3, 3) triangle vertices in local space (computed).
+      Edges (np.ndarray): The (E, 2) unique edges, cached until the topology changes (computed).
+      AABB (np.ndarray): World-space axis-aligned bounding box (computed).
+      BoundingSphere (tuple): World-space bounding sphere centre and radius (computed).
+      mesh (Optional[Mesh]): The shared mesh this object is an instance of, if any.
+      lods (List[Mesh]): Optional coarser versions of the geometry, finest first.
+      lodThresholds (List[float]): Projected bounding-sphere radii in pixels below which each of `lods` is used.
+      lodLevel (int): Level drawn: 0 for the full geometry, k for lods[k - 1] (see Scene.updateLOD).
     """
-    def __init__(self, x: float, y: float, z: float) -> None:
+    def __init__(self, x: float, y: float, z: float, triangles: Optional[np.ndarray] = None,
+                 vertices: Optional[np.ndarray] = None, indices: Optional[np.ndarray] = None,
+                 mesh: Optional[Mesh] = None) -> None:
         """
         Initialize the Object3D.
 
@@ -41,9 +329,278 @@ class Object3D:
           x (float): X coordinate of the object's position.
           y (float): Y coordinate of the object's position.
           z (float): Z coordinate of the object's position.
+          triangles (np.ndarray, optional): Initial (N, 3, 3) triangle array relative to the pivot.
+          vertices (np.ndarray, optional): Initial (V, 3) vertex array relative to the pivot, used with `indices`.
+          indices (np.ndarray, optional): Initial (N, 3) index buffer into `vertices`.
+          mesh (Mesh, optional): Shared geometry to instance instead of `vertices`/`indices`.
+
+        Initial arrays are used as is (e.g. a read-only memmap) until the geometry is changed.
+        """
+        # Weak references to the callbacks of the scenes holding the object (see markChanged).
+        self._listeners: List[weakref.WeakMethod] = []
+        self.Model: np.ndarray = np.eye(4)
+        self.Model[:3, 3] = (x, y, z)
+        self._geometryVersion: int = 0
+        self._topologyVersion: int = 0
+        self._worldKey: Optional[Tuple[int, bytes]] = None
+        self._world: Optional[np.ndarray] = None
+        self._vertices: np.ndarray = np.empty((0, 3), dtype=np.float64)
+        self._vertexCount: int = 0
+        self._indices: np.ndarray = np.empty((0, 3), dtype=np.int64)
+        self._count: int = 0
+        self.mesh: Optional[Mesh] = None
+        self.lods: List[Mesh] = []
+        self.lodThresholds: List[float] = []
+        self.lodLevel: int = 0
+        if mesh is not None:
+            self.setMesh(mesh.Vertices, mesh.Indices)
+            self.mesh = mesh
+            self.setLODs(mesh.lods, mesh.lodThresholds)
+        elif vertices is not None:
+            self.setMesh(vertices, indices)
+        elif triangles is not None:
+            self.Triangles = triangles
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Pickle the object without the scenes listening to it; a copy belongs to no scene.
+
+        Returns:
+          dict: The picklable state.
+        """
+        state: Dict[str, Any] = self.__dict__.copy()
+        state["_listeners"] = []
+        return state
+
+    def markChanged(self) -> None:
+        """
+        Tell the scenes holding the object that its transform, geometry or level of detail changed.
+
+        shift, rotate, scale and the geometry and level-of-detail setters call this; call it
+        after writing Model directly.
+        """
+        for listener in self._listeners:
+            callback: Any = listener()
+            if callback is not None:
+                callback(self)
+
+    @property
+    def Object_position(self) -> np.ndarray:
+        """
+        The pivot position of the object; a view into the translation column of Model.
+        """
+        return self.Model[:3, 3]
+
+    @Object_position.setter
+    def Object_position(self, position: np.ndarray) -> None:
+        self.Model[:3, 3] = position
+        self.markChanged()
+
+    @property
+    def lodLevel(self) -> int:
+        """
+        Level drawn: 0 for the full geometry, k for lods[k - 1] (see Scene.updateLOD).
+        """
+        return self._lodLevel
+
+    @lodLevel.setter
+    def lodLevel(self, level: int) -> None:
+        if level != getattr(self, "_lodLevel", None):
+            self._lodLevel: int = level
+            self.markChanged()
+
+    @property
+    def Vertices(self) -> np.ndarray:
+        """
+        The (V, 3) array of vertices in local space, relative to the pivot.
+        """
+        return self._vertices[:self._vertexCount]
+
+    @Vertices.setter
+    def Vertices(self, vertices: np.ndarray) -> None:
+        vertices = np.asarray(vertices)
+        if vertices.dtype.kind != 'f':
+            vertices = vertices.astype(np.float64)
+        vertices = vertices.reshape(-1, 3)
+        if len(vertices) != self._vertexCount:
+            raise ValueError("Use setMesh to change the number of vertices")
+        self._vertices = vertices
+        self._detach()
+        self._geometryVersion += 1
+        self.markChanged()
+
+    @property
+    def Indices(self) -> np.ndarray:
+        """
+        The (N, 3) index buffer, one row of vertex indices per triangle.
         """
-        self.Object_position: np.ndarray = np.array((x, y, z))
-        self.TriangleSet: List[Triangle] = []
+        return self._indices[:self._count]
+
+    @property
+    def Triangles(self) -> np.ndarray:
+        """
+        The (N, 3, 3) array of triangle vertices in local space.
+        """
+        return self.Vertices[self.Indices]
+
+    @Triangles.setter
+    def Triangles(self, triangles: np.ndarray) -> None:
+        triangles = np.asarray(triangles)
+        self.setMesh(triangles.reshape(-1, 3), np.arange(triangles.size // 3).reshape(-1, 3))
+
+    @property
+    def Edges(self) -> np.ndarray:
+        """
+        The (E, 2) array of unique edges, each listed once (see unique_edges).
+
+        Instances share their mesh's edges. Otherwise the list is built on first use and kept
+        until the topology changes (setMesh, addTriangles); moving vertices or transforming the
+        object keeps it.
+        """
+        if self.mesh is not None:
+            return self.mesh.Edges
+        if getattr(self, "_edgesVersion", None) != self._topologyVersion:
+            self._edges: np.ndarray = unique_edges(self.Indices)
+            self._edgesVersion: int = self._topologyVersion
+        return self._edges
+
+    def triangleBVH(self) -> BVH:
+        """
+        Return a bounding volume hierarchy over the object's triangles in local space.
+
+        Transforms never touch it, since queries are moved into local space instead. It is
+        refit when vertices move and rebuilt only when the topology changes. Instances share
+        their mesh's hierarchy.
+
+        Returns:
+          BVH: Primitive i is triangle i of Indices.
+        """
+        if self.mesh is not None:
+            return self.mesh.triangleBVH()
+        if getattr(self, "_bvhTopology", None) != self._topologyVersion:
+            self._bvh: BVH = BVH.from_triangles(self.Triangles)
+        elif self._bvhGeometry != self._geometryVersion:
+            triangles: np.ndarray = self.Triangles
+            self._bvh.refit(triangles.min(axis=1), triangles.max(axis=1))
+        self._bvhTopology: int = self._topologyVersion
+        self._bvhGeometry: int = self._geometryVersion
+        return self._bvh
+
+    @property
+    def TriangleSet(self) -> Tuple[Triangle, ...]:
+        """
+        The object's triangles as Triangle objects, built on each access for callers of the old
+        list API. It is a tuple so that mutating it fails loudly; add geometry with addTriangle
+        or addTriangles instead.
+        """
+        return tuple(Triangle(tri[0], tri[1], tri[2]) for tri in self.Triangles)
+
+    def setMesh(self, vertices: np.ndarray, indices: Optional[np.ndarray] = None) -> None:
+        """
+        Replace the object's geometry.
+
+        Parameters:
+          vertices (np.ndarray): A (V, 3) array of vertices relative to the pivot.
+          indices (np.ndarray, optional): An (N, 3) index buffer; default treats every three
+                                          consecutive vertices as a triangle.
+        """
+        vertices = np.asarray(vertices)
+        if vertices.dtype.kind != 'f':
+            vertices = vertices.astype(np.float64)
+        vertices = vertices.reshape(-1, 3)
+        indices = np.arange(len(vertices)).reshape(-1, 3) if indices is None else np.asarray(indices).reshape(-1, 3)
+        self._vertices, self._vertexCount = vertices, len(vertices)
+        self._indices, self._count = indices, len(indices)
+        self._detach()
+        self._geometryVersion += 1
+        self._topologyVersion += 1
+        self.markChanged()
+
+    def _detach(self) -> None:
+        """
+        Forget the shared mesh and levels of detail after the geometry was changed.
+        """
+        self.mesh = None
+        self.lods, self.lodThresholds, self.lodLevel = [], [], 0
+
+    def setLODs(self, lods: List[Mesh], thresholds: Optional[List[float]] = None) -> None:
+        """
+        Give the object coarser versions of its geometry to draw when it is small on screen.
+
+        Parameters:
+          lods (List[Mesh]): Coarser meshes in the same local space, finest first.
+          thresholds (List[float], optional): Decreasing projected radii in pixels below which
+                                              each level is used; default is lod_thresholds.
+        """
+        self.lods = list(lods)
+        self.lodThresholds = lod_thresholds(len(self.lods)) if not thresholds else list(thresholds)
+        if len(self.lodThresholds) != len(self.lods):
+            raise ValueError("There must be one threshold per level of detail")
+        self.lodLevel = min(self.lodLevel, len(self.lods))
+        self.markChanged()
+
+    def buildLODs(self, levels: int = 3) -> None:
+        """
+        Generate levels of detail for arbitrary geometry by decimation (see decimation_lods).
+
+        Parameters:
+          levels (int, optional): Maximum number of coarser levels. Default is 3.
+        """
+        self.setLODs(decimation_lods(self.Vertices, self.Indices, levels))
+
+    def currentMesh(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the local vertices and index buffer of the level of detail being drawn.
+
+        Returns:
+          tuple: (vertices, indices); the full geometry at level 0.
+        """
+        if self.lodLevel == 0:
+            return self.Vertices, self.Indices
+        level: Mesh = self.lods[self.lodLevel - 1]
+        return level.Vertices, level.Indices
+
+    def currentEdges(self) -> np.ndarray:
+        """
+        Return the unique edges of the level of detail being drawn.
+
+        Returns:
+          np.ndarray: An (E, 2) array indexing the vertices of currentMesh().
+        """
+        if self.lodLevel == 0:
+            return self.Edges
+        return self.lods[self.lodLevel - 1].Edges
+
+    def deduplicate(self, tolerance: float = DEFAULT_TOLERANCE) -> None:
+        """
+        Merge vertices that coincide within `tolerance` so each is stored and transformed once.
+
+        Parameters:
+          tolerance (float, optional): Grid cell size used to decide which vertices are equal.
+        """
+        self.setMesh(*weld_vertices(self.Vertices, self.Indices, tolerance))
+
+    @staticmethod
+    def _grow(buffer: np.ndarray, used: int, extra: int) -> np.ndarray:
+        """
+        Return `buffer`, or a geometrically larger copy of it, with room for `extra` more rows.
+
+        Parameters:
+          buffer (np.ndarray): The current buffer.
+          used (int): Number of rows in use.
+          extra (int): Number of rows about to be appended.
+
+        Returns:
+          np.ndarray: A writable buffer with at least `used + extra` rows.
+        """
+        needed: int = used + extra
+        if needed <= len(buffer) and buffer.flags.writeable:
+            return buffer
+        capacity: int = max(needed, 2 * len(buffer), 16)
+        dtype: Any = np.float64 if buffer.dtype.kind == 'f' else np.int64
+        grown: np.ndarray = np.empty((capacity,) + buffer.shape[1:], dtype=dtype)
+        grown[:used] = buffer[:used]
+        return grown
 
     def addTriangle(self, triangle: Triangle) -> None:
         """
@@ -52,21 +609,117 @@ class Object3D:
         Parameters:
           triangle (Triangle): The triangle to add.
         """
-        self.TriangleSet.append(triangle)
+        self.addTriangles(np.array((triangle.p1, triangle.p2, triangle.p3), dtype=np.float64))
 
-    def returnTriangles(self) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    def addTriangles(self, triangles: np.ndarray) -> None:
+        """
+        Add many triangles at once.
+
+        The new triangles get their own vertices; call deduplicate() afterwards to share them.
+
+        Parameters:
+          triangles (np.ndarray): An (N, 3, 3) array of triangle vertices relative to the pivot.
+        """
+        vertices: np.ndarray = np.asarray(triangles, dtype=np.float64).reshape(-1, 3)
+        self._vertices = Object3D._grow(self._vertices, self._vertexCount, len(vertices))
+        self._indices = Object3D._grow(self._indices, self._count, len(vertices) // 3)
+        self._vertices[self._vertexCount:self._vertexCount + len(vertices)] = vertices
+        self._indices[self._count:self._count + len(vertices) // 3] = \
+            np.arange(self._vertexCount, self._vertexCount + len(vertices)).reshape(-1, 3)
+        self._vertexCount += len(vertices)
+        self._count += len(vertices) // 3
+        self._detach()
+        self._geometryVersion += 1
+        self._topologyVersion += 1
+        self.markChanged()
+
+    def _stateKey(self) -> Tuple[int, bytes]:
+        """
+        Return a value that changes whenever the object's world-space geometry changes.
+
+        Returns:
+          tuple: The geometry version and the raw bytes of the model matrix.
+        """
+        return (self._geometryVersion, self.Model.tobytes())
+
+    def returnVertices(self) -> np.ndarray:
+        """
+        Get the absolute coordinates of the object's unique vertices.
+
+        The result is computed with one matrix multiply and cached; repeated calls return the
+        same read-only array until the object is transformed or its geometry changes.
+
+        Returns:
+          np.ndarray: A (V, 3) array of vertices; index it with Indices to get triangles.
+        """
+        key: Tuple[int, bytes] = self._stateKey()
+        if key != self._worldKey:
+            world: np.ndarray = self.Vertices @ self.Model[:3, :3].T
+            world += self.Model[:3, 3]
+            world.setflags(write=False)
+            self._world, self._worldKey = world, key
+        return self._world
+
+    def _localBounds(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Return the local-space bounds of the geometry, cached until the geometry changes.
+
+        Instances share the bounds computed once by their mesh.
+
+        Returns:
+          tuple: (lo, hi, centre, radius); see mesh_bounds.
+        """
+        if self.mesh is not None:
+            return self.mesh._localBounds()
+        if getattr(self, "_boundsVersion", None) != self._geometryVersion:
+            self._bounds = mesh_bounds(self.Vertices)
+            self._boundsVersion = self._geometryVersion
+        return self._bounds
+
+    def _worldBounds(self) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Return the world-space bounds, recomputed only when the transform or geometry changes.
+
+        The box comes from the eight transformed corners of the local box, so it costs a few
+        dozen flops per transform and stays conservative under rotation. The sphere is the
+        local sphere moved by the model matrix, with its radius grown by the largest axis scale.
+
+        Returns:
+          tuple: (aabb, centre, radius) with a (2, 3) array of min/max corners.
+        """
+        key: Tuple[int, bytes] = self._stateKey()
+        if getattr(self, "_worldBoundsKey", None) != key:
+            lo, hi, centre, radius = self._localBounds()
+            corners: np.ndarray = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+            world: np.ndarray = corners @ self.Model[:3, :3].T + self.Model[:3, 3]
+            scale: float = float(np.linalg.norm(self.Model[:3, :3], axis=0).max())
+            self._worldBoundsCache = (np.array([world.min(axis=0), world.max(axis=0)]),
+                                      self.Model[:3, :3] @ centre + self.Model[:3, 3], radius * scale)
+            self._worldBoundsKey = key
+        return self._worldBoundsCache
+
+    @property
+    def AABB(self) -> np.ndarray:
+        """
+        The world-space axis-aligned bounding box as a (2, 3) array of (min, max) corners.
+        """
+        return self._worldBounds()[0]
+
+    @property
+    def BoundingSphere(self) -> Tuple[np.ndarray, float]:
+        """
+        The world-space bounding sphere as (centre, radius).
+        """
+        return self._worldBounds()[1], self._worldBounds()[2]
+
+    def returnTriangles(self) -> np.ndarray:
         """
         Get the absolute coordinates of all triangles in the object.
 
         Returns:
-          list: A list of tuples, each containing three np.ndarray points representing a triangle.
+          np.ndarray: An (N, 3, 3) array; each row holds the three points of a triangle.
         """
-        trianglePoints: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
-        for tri in self.TriangleSet:
-            trianglePoints.append((tri.p1 + self.Object_position, 
-                                     tri.p2 + self.Object_position, 
-                                     tri.p3 + self.Object_position))
-        return trianglePoints
+        return self.returnVertices()[self.Indices]
 
     def shift(self, x: float, y: float, z: float) -> None:
         """
@@ -78,7 +731,8 @@ class Object3D:
           z (float): Shift along the z-axis.
         """
         shiftValue: np.ndarray = np.array((x, y, z))
-        self.Object_position += shiftValue
+        self.Model[:3, 3] += shiftValue
+        self.markChanged()
 
     def scale(self, factor: float) -> None:
         """
@@ -87,10 +741,8 @@ class Object3D:
         Parameters:
           factor (float): Scaling factor to apply.
         """
-        for tri in self.TriangleSet:
-            tri.p1 = self.Object_position + (tri.p1 - self.Object_position) * factor
-            tri.p2 = self.Object_position + (tri.p2 - self.Object_position) * factor
-            tri.p3 = self.Object_position + (tri.p3 - self.Object_position) * factor
+        self.Model[:3, :3] *= factor
+        self.markChanged()
 
     def rotate(self, axis: str, angle: float) -> None:
         """
@@ -126,16 +778,93 @@ class Object3D:
             ])
         else:
             raise ValueError("Axis must be 'x', 'y', or 'z'")
-        for tri in self.TriangleSet:
-            tri.p1 = np.dot(rotation_matrix, tri.p1 - self.Object_position) + self.Object_position
-            tri.p2 = np.dot(rotation_matrix, tri.p2 - self.Object_position) + self.Object_position
-            tri.p3 = np.dot(rotation_matrix, tri.p3 - self.Object_position) + self.Object_position
+        self.Model[:3, :3] = rotation_matrix @ self.Model[:3, :3]
+        self.markChanged()
+
+
+PRIMITIVE_CACHE_SIZE: int = 32
+
+
+@lru_cache(maxsize=PRIMITIVE_CACHE_SIZE)
+def unit_mesh(kind: str, resolution: int = 1) -> Mesh:
+    """
+    Return the shared unit-size mesh of a primitive, building it on first use.
+
+    Meshes are kept in a least-recently-used cache of PRIMITIVE_CACHE_SIZE entries keyed by
+    (kind, resolution), so creating the same primitive again costs no geometry work. The
+    create_* functions return instances of these meshes scaled by their model matrix.
+
+    Parameters:
+      kind (str): 'cube' (edge 1), 'pyramid' (base and height 1) or 'sphere' (radius 1).
+      resolution (int, optional): Number of latitude bands of a sphere; ignored otherwise.
+
+    Returns:
+      Mesh: The read-only unit mesh, centred on the origin.
+
+    Raises:
+      ValueError: If the kind is unknown.
+    """
+    if kind == "cube":
+        vertices: np.ndarray = np.array([(-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+                                         (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)], dtype=np.float64) / 2
+        # Faces are wound counter-clockwise when seen from outside so back-face culling works.
+        faces: np.ndarray = np.array([(0, 2, 1), (2, 0, 3), (4, 5, 6), (6, 7, 4),
+                                      (0, 1, 5), (5, 4, 0), (2, 3, 7), (7, 6, 2),
+                                      (0, 7, 3), (7, 0, 4), (1, 2, 6), (6, 5, 1)])
+        return Mesh(vertices, faces)
+    if kind == "pyramid":
+        vertices = np.array([(-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1), (0, 0, 1)], dtype=np.float64) / 2
+        faces = np.array([(0, 2, 1), (2, 0, 3)] + [(i, (i + 1) % 4, 4) for i in range(4)])
+        return Mesh(vertices, faces)
+    if kind == "sphere":
+        return Mesh(*_sphereGrid(resolution))
+    raise ValueError("kind must be 'cube', 'pyramid' or 'sphere'")
+
+
+def _sphereGrid(resolution: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build a unit UV sphere from a latitude/longitude meshgrid.
+
+    The grid has resolution + 1 rings of 2 * resolution + 1 points. Each quad of the grid
+    gives the triangles (p1, p3, p2) and (p2, p3, p4), both wound counter-clockwise when seen
+    from outside so back-face culling works. The scalar construction emitted (p1, p2, p3),
+    which faced inward. The duplicated seam and pole points are then welded, and the
+    triangles at the poles have zero area.
+
+    Parameters:
+      resolution (int): Number of latitude bands.
+
+    Returns:
+      tuple: (vertices, indices) of the welded mesh.
+    """
+    theta, phi = np.meshgrid(np.arange(resolution + 1) / resolution * np.pi,
+                             np.arange(2 * resolution + 1) / (2 * resolution) * 2 * np.pi, indexing="ij")
+    points: np.ndarray = np.stack((np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)), axis=-1)
+    grid: np.ndarray = np.arange(points.shape[0] * points.shape[1]).reshape(points.shape[:2])
+    p1: np.ndarray = grid[:-1, :-1].reshape(-1)
+    p2: np.ndarray = grid[:-1, 1:].reshape(-1)
+    p3: np.ndarray = grid[1:, :-1].reshape(-1)
+    p4: np.ndarray = grid[1:, 1:].reshape(-1)
+    faces: np.ndarray = np.stack((np.stack((p1, p3, p2), axis=1), np.stack((p2, p3, p4), axis=1)), axis=1).reshape(-1, 3)
+    return weld_vertices(points.reshape(-1, 3), faces)
+
+
+def _instance(x: float, y: float, z: float, mesh: Mesh, size: float) -> "Object3D":
+    """
+    Create an instance of a unit mesh scaled to `size` by its model matrix.
+    """
+    obj: Object3D = Object3D(x, y, z, mesh=mesh)
+    if size != 1:
+        obj.scale(size)
+    return obj
 
 
 def create_cube(x: float, y: float, z: float, size: float = 1) -> "Object3D":
     """
     Create a cube 3D object composed of triangles.
 
+    The cube is an instance of the cached unit cube (see unit_mesh), scaled by its model matrix.
+
     Parameters:
       x (float): X coordinate of the cube's position.
       y (float): Y coordinate of the cube's position.
@@ -145,23 +874,14 @@ def create_cube(x: float, y: float, z: float, size: float = 1) -> "Object3D":
     Returns:
       Object3D: A 3D object representing a cube constructed from triangles.
     """
-    obj: Object3D = Object3D(x, y, z)
-    s: float = size / 2
-    vertices: List[Tuple[float, float, float]] = [
-        (-s, -s, -s), (s, -s, -s), (s, s, -s), (-s, s, -s),
-        (-s, -s, s), (s, -s, s), (s, s, s), (-s, s, s)
-    ]
-    faces: List[Tuple[int, int, int]] = [(0, 1, 2), (2, 3, 0), (4, 5, 6), (6, 7, 4),
-                                          (0, 1, 5), (5, 4, 0), (2, 3, 7), (7, 6, 2),
-                                          (0, 3, 7), (7, 4, 0), (1, 2, 6), (6, 5, 1)]
-    for f in faces:
-        obj.addTriangle(Triangle(vertices[f[0]], vertices[f[1]], vertices[f[2]]))
-    return obj
+    return _instance(x, y, z, unit_mesh("cube"), size)
 
 def create_pyramid(x: float, y: float, z: float, size: float = 1) -> "Object3D":
     """
     Create a pyramid 3D object with a square base and four triangular faces.
 
+    The pyramid is an instance of the cached unit pyramid (see unit_mesh), scaled by its model matrix.
+
     Parameters:
       x (float): X coordinate of the pyramid's position.
       y (float): Y coordinate of the pyramid's position.
@@ -171,50 +891,32 @@ def create_pyramid(x: float, y: float, z: float, size: float = 1) -> "Object3D":
     Returns:
       Object3D: A 3D object representing a pyramid constructed from triangles.
     """
-    obj: Object3D = Object3D(x, y, z)
-    s: float = size / 2
-    base: List[Tuple[float, float, float]] = [(-s, -s, -s), (s, -s, -s), (s, s, -s), (-s, s, -s)]
-    top: Tuple[float, float, float] = (0, 0, s)
-    obj.addTriangle(Triangle(base[0], base[1], base[2]))
-    obj.addTriangle(Triangle(base[2], base[3], base[0]))
-    for i in range(4):
-        obj.addTriangle(Triangle(base[i], base[(i+1) % 4], top))
-    return obj
+    return _instance(x, y, z, unit_mesh("pyramid"), size)
 
-def create_sphere(x: float, y: float, z: float, radius: float = 1, resolution: int = 10) -> "Object3D":
+def create_sphere(x: float, y: float, z: float, radius: float = 1, resolution: int = 10,
+                  lod: bool = False) -> "Object3D":
     """
     Create a sphere 3D object approximated by triangles.
 
+    The sphere is an instance of the cached unit sphere of that resolution (see unit_mesh),
+    scaled by its model matrix. With `lod`, the spheres at half, a quarter, ... of the
+    resolution (down to 4) become its levels of detail.
+
     Parameters:
       x (float): X coordinate of the sphere's center.
       y (float): Y coordinate of the sphere's center.
       z (float): Z coordinate of the sphere's center.
       radius (float, optional): Radius of the sphere. Default is 1.
       resolution (int, optional): Number of segments for approximation. Default is 10.
+      lod (bool, optional): Attach lower-resolution levels of detail. Default is False.
 
     Returns:
       Object3D: A 3D object representing a sphere constructed from triangles.
     """
-    obj: Object3D = Object3D(x, y, z)
-    for i in range(resolution):
-        theta1: float = (i / resolution) * np.pi
-        theta2: float = ((i + 1) / resolution) * np.pi
-        for j in range(resolution * 2):
-            phi1: float = (j / (resolution * 2)) * 2 * np.pi
-            phi2: float = ((j + 1) / (resolution * 2)) * 2 * np.pi
-            p1: np.ndarray = np.array([radius * np.sin(theta1) * np.cos(phi1),
-                                       radius * np.sin(theta1) * np.sin(phi1),
-                                       radius * np.cos(theta1)])
-            p2: np.ndarray = np.array([radius * np.sin(theta1) * np.cos(phi2),
-                                       radius * np.sin(theta1) * np.sin(phi2),
-                                       radius * np.cos(theta1)])
-            p3: np.ndarray = np.array([radius * np.sin(theta2) * np.cos(phi1),
-                                       radius * np.sin(theta2) * np.sin(phi1),
-                                       radius * np.cos(theta2)])
-            p4: np.ndarray = np.array([radius * np.sin(theta2) * np.cos(phi2),
-                                       radius * np.sin(theta2) * np.sin(phi2),
-                                       radius * np.cos(theta2)])
-            obj.addTriangle(Triangle(p1, p2, p3))
-            obj.addTriangle(Triangle(p2, p3, p4))
+    obj: Object3D = _instance(x, y, z, unit_mesh("sphere", resolution), radius)
+    if lod:
+        coarser: List[int] = []
+        while resolution // 2 ** (len(coarser) + 1) >= 4:
+            coarser.append(resolution // 2 ** (len(coarser) + 1))
+        obj.setLODs([unit_mesh("sphere", level) for level in coarser])
     return obj
-    
\ No newline at end of file
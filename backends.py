@@ -0,0 +1,240 @@
+import os
+import struct
+import zlib
+import numpy as np
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class PresentBackend:
+    """
+    Base class for the presentation backends Painter2D hands finished frames to.
+
+    A backend receives the painter's pixel matrix once per frame through `update`, which by
+    default calls `present`, and is released through `close`. Subclasses only need to
+    override the methods they use; backends that can upload part of a frame override
+    `update` to use the changed rectangles.
+
+    Attributes:
+      threaded (bool): Whether `update` may be called from a thread other than the one that
+                       opened the backend, as a pipelined Painter2D does.
+    """
+    threaded: bool = True
+
+    def open(self, width: int, height: int, FPS: int) -> None:
+        """
+        Prepare the backend for frames of the given size.
+
+        Parameters:
+          width (int): Number of rows of the pixel matrix.
+          height (int): Number of columns of the pixel matrix.
+          FPS (int): Frames per second requested by the painter.
+        """
+
+    def present(self, frame: np.ndarray) -> None:
+        """
+        Present a finished frame.
+
+        Parameters:
+          frame (np.ndarray): The painter's pixel matrix with values in 0..255. It is owned by
+                              the painter and may be reused after this call returns.
+        """
+
+    def update(self, frame: np.ndarray, dirty: List[Tuple[int, int, int, int]]) -> None:
+        """
+        Present a finished frame, knowing which parts of it changed since the previous one.
+
+        Parameters:
+          frame (np.ndarray): The painter's pixel matrix (see present).
+          dirty (list): (row0, row1, col0, col1) rectangles outside which `frame` is unchanged
+                        since the previous call. Empty if nothing changed.
+        """
+        self.present(frame)
+
+    def close(self) -> None:
+        """
+        Release any resources held by the backend.
+        """
+
+
+class MatplotlibBackend(PresentBackend):
+    """
+    Interactive viewer that shows frames in a matplotlib window.
+
+    Attributes:
+      fig (plt.Figure): The matplotlib figure object.
+      ax (plt.Axes): The matplotlib axes object.
+      img (Any): The image object for displaying the matrix.
+
+    GUI calls have to stay on the main thread, so this backend is not `threaded`.
+    """
+    threaded: bool = False
+
+    def open(self, width: int, height: int, FPS: int) -> None:
+        """
+        Create the figure in interactive mode.
+
+        Parameters:
+          width (int): Number of rows of the pixel matrix.
+          height (int): Number of columns of the pixel matrix.
+          FPS (int): Frames per second requested by the painter. Pacing is left to the caller
+                     (see Engine3D.run); the GUI event loop only gets a minimal pause per frame.
+        """
+        import matplotlib.pyplot as plt
+        self.plt = plt
+        self.interval: float = 1e-3
+        plt.ion()
+        self.fig, self.ax = plt.subplots()
+        self.img: Any = self.ax.imshow(np.zeros((width, height)), cmap='gray', vmin=0, vmax=255)
+
+    def present(self, frame: np.ndarray) -> None:
+        """
+        Draw the frame and let the GUI event loop run.
+
+        Parameters:
+          frame (np.ndarray): The pixel matrix to display.
+        """
+        self.img.set_data(frame)
+        self.plt.draw()
+        self.plt.pause(self.interval)
+
+    def update(self, frame: np.ndarray, dirty: List[Tuple[int, int, int, int]]) -> None:
+        """
+        Redraw only if something changed; otherwise just let the GUI event loop run.
+
+        Parameters:
+          frame (np.ndarray): The pixel matrix to display.
+          dirty (list): Rectangles changed since the previous frame.
+        """
+        if dirty:
+            self.present(frame)
+        else:
+            self.plt.pause(self.interval)
+
+    def close(self) -> None:
+        """
+        Turn off interactive mode and close the figure.
+        """
+        self.plt.ioff()
+        self.plt.close(self.fig)
+
+
+class HeadlessBackend(PresentBackend):
+    """
+    Offscreen backend that keeps the last frame as a NumPy array and/or passes it to a callback.
+
+    Attributes:
+      frame (Optional[np.ndarray]): Copy of the most recently presented frame.
+      frames (int): Number of frames presented so far.
+      dirty (List[tuple]): Rectangles that changed in the most recent frame.
+    """
+    def __init__(self, callback: Optional[Callable[[np.ndarray], None]] = None, keep: bool = True) -> None:
+        """
+        Initialize the headless backend.
+
+        Parameters:
+          callback (Callable, optional): Called with the painter's matrix for every frame. The array
+                                         is only valid during the call; copy it to keep it.
+          keep (bool, optional): Store a copy of each frame in `frame`. Default is True.
+        """
+        self.callback: Optional[Callable[[np.ndarray], None]] = callback
+        self.keep: bool = keep
+        self.frame: Optional[np.ndarray] = None
+        self.frames: int = 0
+        self.dirty: List[Tuple[int, int, int, int]] = []
+
+    def update(self, frame: np.ndarray, dirty: List[Tuple[int, int, int, int]]) -> None:
+        """
+        Record the frame, copying only the changed rectangles into `frame` after the first one.
+
+        Parameters:
+          frame (np.ndarray): The pixel matrix of the finished frame.
+          dirty (list): Rectangles changed since the previous frame.
+        """
+        self.dirty = list(dirty)
+        if self.keep and self.frame is not None and self.frame.shape == frame.shape and self.frame.dtype == frame.dtype:
+            for row0, row1, col0, col1 in dirty:
+                self.frame[row0:row1, col0:col1] = frame[row0:row1, col0:col1]
+            if self.callback is not None:
+                self.callback(frame)
+            self.frames += 1
+            return
+        self.present(frame)
+
+    def present(self, frame: np.ndarray) -> None:
+        """
+        Record the frame and forward it to the callback.
+
+        Parameters:
+          frame (np.ndarray): The pixel matrix of the finished frame.
+        """
+        if self.keep:
+            self.frame = frame.copy()
+        if self.callback is not None:
+            self.callback(frame)
+        self.frames += 1
+
+
+class FileBackend(PresentBackend):
+    """
+    Backend that writes every frame to its own file as 8-bit grayscale raw bytes or PNG.
+
+    Attributes:
+      directory (str): Directory the frames are written to.
+      fmt (str): 'png' or 'raw'.
+      frames (int): Number of frames written so far.
+    """
+    FORMATS = ("png", "raw")
+
+    def __init__(self, directory: str, fmt: str = "png", prefix: str = "frame") -> None:
+        """
+        Initialize the file backend.
+
+        Parameters:
+          directory (str): Directory to write frames to; created if missing.
+          fmt (str, optional): 'png' or 'raw'. Default is 'png'.
+          prefix (str, optional): File name prefix; files are named '<prefix>_000000.<fmt>'.
+
+        Raises:
+          ValueError: If an invalid format is provided.
+        """
+        if fmt not in FileBackend.FORMATS:
+            raise ValueError("fmt must be 'png' or 'raw'")
+        self.directory: str = directory
+        self.fmt: str = fmt
+        self.prefix: str = prefix
+        self.frames: int = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def present(self, frame: np.ndarray) -> None:
+        """
+        Write the frame to the next numbered file.
+
+        Parameters:
+          frame (np.ndarray): The pixel matrix of the finished frame.
+        """
+        pixels: np.ndarray = np.clip(frame, 0, 255).astype(np.uint8)
+        path: str = os.path.join(self.directory, f"{self.prefix}_{self.frames:06d}.{self.fmt}")
+        with open(path, "wb") as file:
+            file.write(encode_png(pixels) if self.fmt == "png" else pixels.tobytes())
+        self.frames += 1
+
+
+def encode_png(pixels: np.ndarray) -> bytes:
+    """
+    Encode an 8-bit grayscale image as PNG using only the standard library.
+
+    Parameters:
+      pixels (np.ndarray): A 2D uint8 array; rows become image rows.
+
+    Returns:
+      bytes: The PNG file contents.
+    """
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    rows, cols = pixels.shape
+    scanlines: np.ndarray = np.zeros((rows, cols + 1), dtype=np.uint8)
+    scanlines[:, 1:] = pixels
+    header: bytes = struct.pack(">IIBBBBB", cols, rows, 8, 0, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 6)) + chunk(b"IEND", b""))
@@ -0,0 +1,301 @@
+"""
+Offline batch rendering of one scene from many poses, fanned out to a process pool.
+
+A pose says how the scene differs from its starting state in one frame:
+
+  {"objects": {"teapot": [("rotate", "z", 30), ("shift", 0, 1, 0)]},
+   "camera": {"position": (-10, 0, 2), "look_at": (0, 0, 0)}}
+
+Object operations are Object3D method calls (rotate, shift, scale) applied in order, and
+camera entries are MathCam calls ("position" -> setPosition, "orientation" -> setOrientation
+with (yaw, pitch, roll), "look_at" -> lookAt), applied after position and orientation.
+Every frame starts again from the starting state, so frames do not depend on each other
+or on which worker renders them. Each worker builds the scene once, either by loading the
+mesh files itself (through the compiled .e3db cache) or from a pickled Scene. Finished
+frames come back in order and go to numbered files or into one in-memory array:
+
+  python batchRender.py utah_teapot.engine3D --pre-rotate x 90 --frames 360 -o frames -j 4
+  python batchRender.py utah_teapot.engine3D --orbit 10 --frames 72 --mode solid -o sweep
+"""
+import argparse
+import copy
+import math
+import os
+import sys
+import time
+import numpy as np
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from backends import FileBackend, HeadlessBackend, encode_png
+from Engine3D import Engine3D
+from mathCam import MathCam
+from Scene import Scene
+
+Pose = Dict[str, Any]
+# Either a Scene, or the mesh files to load into one (each named after its file).
+SceneSource = Union[Scene, str, Sequence[str]]
+
+_worker: Dict[str, Any] = {}
+
+
+def load_scene(files: Union[str, Sequence[str]], cache: bool = True) -> Scene:
+    """
+    Build a scene from .engine3D mesh files, one object per file named after it.
+
+    Parameters:
+      files (str or list): One path or several.
+      cache (bool, optional): Use the compiled .e3db sidecars (see meshIO). Default is True.
+
+    Returns:
+      Scene: The new scene.
+    """
+    scene: Scene = Scene()
+    for filename in [files] if isinstance(files, str) else files:
+        scene.add_file(os.path.splitext(os.path.basename(filename))[0], filename, cache=cache)
+    return scene
+
+
+def turntable(name: str, frames: int = 360, axis: str = 'z', degrees: float = 360) -> List[Pose]:
+    """
+    Poses that spin one object about an axis in equal steps.
+
+    Parameters:
+      name (str): The object to rotate.
+      frames (int, optional): Number of frames. Default is 360.
+      axis (str, optional): 'x', 'y' or 'z'. Default is 'z'.
+      degrees (float, optional): Total rotation over all frames. Default is 360.
+
+    Returns:
+      list: One pose per frame; the first is the unrotated object.
+    """
+    return [{"objects": {name: [("rotate", axis, degrees * k / frames)]}} for k in range(frames)]
+
+
+def orbit(radius: float, frames: int = 360, height: float = 0.0,
+          target: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> List[Pose]:
+    """
+    Poses that move the camera around a point in a horizontal circle, looking at it.
+
+    Parameters:
+      radius (float): Distance from the target in the xy plane.
+      frames (int, optional): Number of frames. Default is 360.
+      height (float, optional): Camera height above the target. Default is 0.
+      target (tuple, optional): The point looked at. Default is the origin.
+
+    Returns:
+      list: One pose per frame, starting on the -x side of the target.
+    """
+    poses: List[Pose] = []
+    for k in range(frames):
+        angle: float = 2 * math.pi * k / frames
+        position: Tuple[float, float, float] = (target[0] - radius * math.cos(angle),
+                                                target[1] - radius * math.sin(angle), target[2] + height)
+        poses.append({"camera": {"position": position, "look_at": target}})
+    return poses
+
+
+def _start(scene: SceneSource, cam: MathCam, resolution: int, mode: str, fmt: Optional[str]) -> None:
+    """
+    Worker initializer: build the engine and scene once and remember their starting state.
+
+    Parameters:
+      scene (Scene, str or list): The scene, or mesh files to load into one.
+      cam (MathCam): The starting camera.
+      resolution (int): Canvas resolution.
+      mode (str): Render mode.
+      fmt (Optional[str]): 'png' or 'raw' to return encoded files, or None for pixel arrays.
+    """
+    engine: Engine3D = Engine3D(resolution, backend=HeadlessBackend(keep=False), mode=mode, dtype=np.uint8)
+    engine.scene = scene if isinstance(scene, Scene) else load_scene(scene)
+    engine.cam = cam
+    _worker["engine"] = engine
+    _worker["cam"] = copy.deepcopy(cam)
+    _worker["state"] = {name: (obj.Model.copy(), obj.lodLevel) for name, obj in engine.scene.assetSet.items()}
+    _worker["fmt"] = fmt
+
+
+def _pose(engine: Engine3D, pose: Pose) -> None:
+    """
+    Reset the worker's scene and camera to their starting state and apply a pose.
+
+    Parameters:
+      engine (Engine3D): The worker's engine.
+      pose (dict): The pose (see the module docstring).
+
+    Raises:
+      KeyError: If the pose names an object that is not in the scene.
+      ValueError: If it uses an unknown object or camera operation.
+    """
+    for name, (model, level) in _worker["state"].items():
+        obj: Any = engine.scene.assetSet[name]
+        obj.Model[:] = model
+        obj.lodLevel = level
+        obj.markChanged()
+    for name, operations in pose.get("objects", {}).items():
+        obj = engine.scene.assetSet[name]
+        for operation, *args in operations:
+            if operation not in ("rotate", "shift", "scale"):
+                raise ValueError(f"Unknown object operation {operation!r}")
+            getattr(obj, operation)(*args)
+    cam: MathCam = copy.deepcopy(_worker["cam"])
+    settings: Dict[str, Any] = dict(pose.get("camera", {}))
+    unknown: set = set(settings) - {"position", "orientation", "look_at"}
+    if unknown:
+        raise ValueError(f"Unknown camera settings {sorted(unknown)}")
+    if "position" in settings:
+        cam.setPosition(*settings["position"])
+    if "orientation" in settings:
+        cam.setOrientation(*settings["orientation"])
+    if "look_at" in settings:
+        cam.lookAt(*settings["look_at"])
+    engine.cam = cam
+
+
+def _renderPose(pose: Pose) -> Union[np.ndarray, bytes]:
+    """
+    Worker: render one pose.
+
+    Parameters:
+      pose (dict): The pose.
+
+    Returns:
+      np.ndarray or bytes: The uint8 frame, or its encoded file contents.
+    """
+    engine: Engine3D = _worker["engine"]
+    _pose(engine, pose)
+    engine.renderFrame()
+    frame: np.ndarray = engine.painter.matrix.copy()
+    engine.painter.clearFrame()
+    if _worker["fmt"] == "png":
+        return encode_png(frame)
+    if _worker["fmt"] == "raw":
+        return frame.tobytes()
+    return frame
+
+
+def render_batch(scene: SceneSource, poses: Sequence[Pose], resolution: int = 500, cam: Optional[MathCam] = None,
+                 mode: str = "wireframe", workers: Optional[int] = None, output: Optional[str] = None,
+                 fmt: str = "png", prefix: str = "frame", chunksize: int = 4,
+                 progress: Optional[Callable[[int, int, float], None]] = None) -> Dict[str, Any]:
+    """
+    Render one frame per pose, in parallel, and collect the frames in order.
+
+    Parameters:
+      scene (Scene, str or list): The scene (pickled once to each worker), or .engine3D files
+                                  that each worker loads itself (see load_scene).
+      poses (list): One pose per frame (see the module docstring, turntable and orbit).
+      resolution (int, optional): Canvas resolution. Default is 500.
+      cam (MathCam, optional): Starting camera. Default is Engine3D's default camera for `resolution`.
+      mode (str, optional): 'wireframe' or 'solid'. Default is 'wireframe'.
+      workers (int, optional): Worker processes; os.cpu_count() if None. 1 renders in this process.
+      output (str, optional): Directory to write '<prefix>_000000.<fmt>' files to. If None the
+                              frames are returned in memory.
+      fmt (str, optional): 'png' or 'raw' when writing files. Default is 'png'.
+      prefix (str, optional): File name prefix. Default is 'frame'.
+      chunksize (int, optional): Poses sent to a worker at a time. Default is 4.
+      progress (Callable, optional): Called after each frame with (done, total, frames_per_second).
+
+    Returns:
+      dict: 'frames', 'elapsed' (seconds), 'fps' (frames per second), 'workers', and 'images',
+            a (frames, resolution, resolution) uint8 array, or None when writing files.
+
+    Raises:
+      ValueError: If an invalid mode or format is provided.
+    """
+    if mode not in Engine3D.RENDER_MODES:
+        raise ValueError("mode must be 'wireframe' or 'solid'")
+    if fmt not in FileBackend.FORMATS:
+        raise ValueError("fmt must be 'png' or 'raw'")
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    cam = MathCam(-10, 0, 0, 5, max_value=resolution) if cam is None else cam
+    encoding: Optional[str] = None
+    images: Optional[np.ndarray] = None
+    if output is not None:
+        os.makedirs(output, exist_ok=True)
+        encoding = fmt
+    else:
+        images = np.zeros((len(poses), resolution, resolution), dtype=np.uint8)
+    setup: Tuple = (scene, cam, resolution, mode, encoding)
+    started: float = time.perf_counter()
+    pool: Optional[Any] = None
+    if workers > 1:
+        pool = Pool(workers, initializer=_start, initargs=setup)
+        frames: Iterator[Union[np.ndarray, bytes]] = pool.imap(_renderPose, poses, chunksize=chunksize)
+    else:
+        _start(*copy.deepcopy(setup))
+        frames = map(_renderPose, poses)
+    try:
+        for index, frame in enumerate(frames):
+            if images is not None:
+                images[index] = frame
+            else:
+                with open(os.path.join(output, f"{prefix}_{index:06d}.{fmt}"), "wb") as file:
+                    file.write(frame)
+            if progress is not None:
+                progress(index + 1, len(poses), (index + 1) / max(time.perf_counter() - started, 1e-9))
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        else:
+            _worker.clear()
+    elapsed: float = time.perf_counter() - started
+    return {"frames": len(poses), "elapsed": elapsed, "fps": len(poses) / elapsed if elapsed > 0 else 0.0,
+            "workers": workers, "images": images}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point: render a turntable or camera orbit of mesh files.
+
+    Parameters:
+      argv (list, optional): Arguments; defaults to sys.argv[1:].
+
+    Returns:
+      int: Exit status.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Render many poses of a scene in parallel.")
+    parser.add_argument("files", nargs="+", help=".engine3D mesh files making up the scene")
+    parser.add_argument("-n", "--frames", type=int, default=360, help="number of frames (default 360)")
+    parser.add_argument("-o", "--output", default="frames", help="directory for the frames (default ./frames)")
+    parser.add_argument("-f", "--format", choices=FileBackend.FORMATS, default="png", help="frame file format")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-r", "--resolution", type=int, default=500, help="canvas resolution in pixels")
+    parser.add_argument("--angle", type=float, default=90, help="camera field of view in degrees")
+    parser.add_argument("--mode", choices=Engine3D.RENDER_MODES, default="wireframe", help="render mode")
+    parser.add_argument("--pre-rotate", nargs=2, action="append", default=[], metavar=("AXIS", "DEGREES"),
+                        help="rotate every object before rendering; may be repeated")
+    parser.add_argument("--axis", choices=("x", "y", "z"), default="z", help="turntable axis (default z)")
+    parser.add_argument("--orbit", type=float, metavar="RADIUS",
+                        help="orbit the camera around the origin at this radius instead of turning the objects")
+    parser.add_argument("--height", type=float, default=0.0, help="camera height for --orbit")
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    scene: Scene = load_scene(args.files)
+    for obj in scene.assetSet.values():
+        for axis, degrees in args.pre_rotate:
+            obj.rotate(axis, float(degrees))
+    poses: List[Pose] = []
+    if args.orbit is not None:
+        poses = orbit(args.orbit, args.frames, args.height)
+    else:
+        for name in scene.assetSet:
+            for index, pose in enumerate(turntable(name, args.frames, args.axis)):
+                if index == len(poses):
+                    poses.append({"objects": {}})
+                poses[index]["objects"].update(pose["objects"])
+    cam: MathCam = MathCam(-10, 0, 0, 5, Angle=args.angle, max_value=args.resolution)
+
+    def report(done: int, total: int, rate: float) -> None:
+        print(f"\r{done}/{total} frames, {rate:.1f} frames/s", end="", file=sys.stderr, flush=True)
+
+    result: Dict[str, Any] = render_batch(scene, poses, args.resolution, cam, args.mode, args.workers, args.output,
+                                          args.format, progress=report)
+    print(file=sys.stderr)
+    print(f"{result['frames']} frames in {result['elapsed']:.2f} s ({result['fps']:.1f} frames/s, "
+          f"{result['workers']} workers) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Fixed, headless benchmarks of the render pipeline.
+
+Each workload times one operation repeatedly and reports mean/median/p95 seconds per call,
+plus triangles/s, points/s and pixels/s where they apply. Results can be written as JSON and later
+compared against, so a change can be checked for speed-ups or regressions:
+
+  python benchmark.py -o baseline.json
+  python benchmark.py --compare baseline.json
+  python benchmark.py -w frame_1000 sphere_50 -r 20
+
+Random inputs are seeded, and frames go to a HeadlessBackend, so no display is needed.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+from assets import Object3D, create_sphere, unit_mesh
+from backends import HeadlessBackend
+from Engine3D import Engine3D
+from mathCam import MathCam
+from Scene import Scene
+
+TEAPOT: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "utah_teapot.engine3D")
+SEED: int = 1234
+
+# A workload is set up once and returns a step; each call of the step is one timed sample
+# and returns how much it processed, as counts keyed by RATES (missing counts are 0).
+Step = Callable[[], Dict[str, int]]
+# Counted quantities and their labels in the table; each is reported as <name>_per_s.
+RATES: Dict[str, str] = {"triangles": "tri/s", "points": "pts/s", "pixels": "px/s"}
+
+
+def teapot_load(cache: bool) -> Step:
+    """
+    Load the Utah teapot through Scene.add_file.
+
+    Parameters:
+      cache (bool): Use the compiled .e3db sidecar (created during warm-up) instead of parsing the text.
+
+    Returns:
+      Step: The timed step.
+    """
+    scene: Scene = Scene()
+
+    def step() -> Dict[str, int]:
+        scene.add_file("teapot", TEAPOT, cache=cache)
+        return {"triangles": len(scene.assetSet["teapot"].Indices)}
+    return step
+
+
+def sphere(resolution: int, cached: bool = False) -> Step:
+    """
+    Build a sphere with create_sphere.
+
+    Parameters:
+      resolution (int): The sphere's resolution (2 * resolution ** 2 triangles).
+      cached (bool, optional): Keep the unit-mesh cache warm; by default it is cleared before
+                               every call, so the geometry is generated each time. A cached
+                               call generates nothing, so it reports only its time.
+
+    Returns:
+      Step: The timed step.
+    """
+    def step() -> Dict[str, int]:
+        if not cached:
+            unit_mesh.cache_clear()
+        triangles: int = len(create_sphere(0, 0, 0, 1, resolution).Indices)
+        return {} if cached else {"triangles": triangles}
+    return step
+
+
+def rotate(triangles: int) -> Step:
+    """
+    Rotate an object and bring its world-space vertices up to date.
+
+    Rotation itself only updates the model matrix, so the step also calls returnVertices,
+    which is where the per-vertex work happens.
+
+    Parameters:
+      triangles (int): Number of (unshared) random triangles in the object.
+
+    Returns:
+      Step: The timed step.
+    """
+    rng: np.random.Generator = np.random.default_rng(SEED)
+    obj: Object3D = Object3D(0, 0, 0, triangles=rng.uniform(-1, 1, (triangles, 3, 3)))
+
+    def step() -> Dict[str, int]:
+        obj.rotate('z', 1)
+        obj.returnVertices()
+        return {"triangles": triangles}
+    return step
+
+
+def project(points: int) -> Step:
+    """
+    Project random points in front of the camera with MathCam.project_points.
+
+    Parameters:
+      points (int): Number of points per call.
+
+    Returns:
+      Step: The timed step.
+    """
+    rng: np.random.Generator = np.random.default_rng(SEED)
+    cam: MathCam = MathCam(-10, 0, 0, 5, max_value=1000)
+    cloud: np.ndarray = rng.uniform(-5, 5, (points, 3))
+
+    def step() -> Dict[str, int]:
+        cam.project_points(cloud)
+        return {"points": points}
+    return step
+
+
+def frame(resolution: int, mode: str = "wireframe") -> Step:
+    """
+    Render, present and clear one full frame of the rotating teapot.
+
+    Parameters:
+      resolution (int): Canvas resolution in pixels.
+      mode (str, optional): 'wireframe' or 'solid'. Default is 'wireframe'.
+
+    Returns:
+      Step: The timed step.
+    """
+    engine: Engine3D = Engine3D(resolution, Angel=45, mode=mode, backend=HeadlessBackend(keep=False))
+    engine.scene.add_file("teapot", TEAPOT)
+    teapot: Object3D = engine.scene.assetSet["teapot"]
+    teapot.rotate('x', 90)
+    engine.stats.enabled = True
+
+    def step() -> Dict[str, int]:
+        teapot.rotate('z', 5)
+        engine.renderFrame()
+        engine.presentFrame()
+        record: Dict[str, float] = engine.stats.frames[-1]
+        # Wireframe frames hand edges, not triangles, to the rasterizer; rate them by the
+        # triangles whose edges were gathered.
+        return {"triangles": int(record["drawn"] if mode == "solid" else record["triangles"]),
+                "pixels": int(record["pixels"])}
+    return step
+
+
+WORKLOADS: Dict[str, Callable[[], Step]] = {
+    "teapot_load": partial(teapot_load, False),
+    "teapot_load_cached": partial(teapot_load, True),
+    "sphere_10": partial(sphere, 10),
+    "sphere_50": partial(sphere, 50),
+    "sphere_200": partial(sphere, 200),
+    "sphere_200_cached": partial(sphere, 200, True),
+    "rotate_100k": partial(rotate, 100_000),
+    "project_1M": partial(project, 1_000_000),
+    "frame_500": partial(frame, 500),
+    "frame_1000": partial(frame, 1000),
+    "frame_2000": partial(frame, 2000),
+    "frame_1000_solid": partial(frame, 1000, "solid"),
+}
+
+
+def measure(name: str, repeat: int = 10, warmup: int = 1, min_time: float = 0.0) -> Dict[str, Any]:
+    """
+    Time one workload.
+
+    Parameters:
+      name (str): A key of WORKLOADS.
+      repeat (int, optional): Minimum number of timed calls. Default is 10.
+      warmup (int, optional): Untimed calls made first (to fill caches). Default is 1.
+      min_time (float, optional): Keep sampling until this many seconds have been timed. Default is 0.
+
+    Returns:
+      dict: name, samples, mean, median, p95, min (seconds per call), and triangles_per_s,
+            points_per_s and pixels_per_s (0 where the workload does not count them).
+    """
+    np.random.seed(SEED)
+    step: Step = WORKLOADS[name]()
+    for _ in range(warmup):
+        step()
+    times: List[float] = []
+    counts: Dict[str, int] = dict.fromkeys(RATES, 0)
+    while len(times) < repeat or sum(times) < min_time:
+        start: float = time.perf_counter()
+        done: Dict[str, int] = step()
+        times.append(time.perf_counter() - start)
+        for quantity, n in done.items():
+            counts[quantity] += n
+    total: float = sum(times)
+    result: Dict[str, Any] = {"name": name, "samples": len(times), "mean": total / len(times),
+                              "median": float(np.median(times)), "p95": float(np.percentile(times, 95)),
+                              "min": min(times)}
+    for quantity, n in counts.items():
+        result[f"{quantity}_per_s"] = n / total if total > 0 else 0.0
+    return result
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describe the machine and library versions the benchmark ran on.
+
+    Returns:
+      dict: python, numpy, platform, processor and cpu_count.
+    """
+    return {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+            "processor": platform.processor(), "cpu_count": os.cpu_count()}
+
+
+def run(names: Optional[List[str]] = None, repeat: int = 10, warmup: int = 1, min_time: float = 0.0,
+        report: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Run several workloads.
+
+    Parameters:
+      names (list, optional): Workloads to run; all of WORKLOADS if None.
+      repeat (int, optional): Minimum number of timed calls per workload.
+      warmup (int, optional): Untimed calls per workload.
+      min_time (float, optional): Minimum timed seconds per workload.
+      report (Callable, optional): Called with each workload's result as soon as it is done.
+
+    Returns:
+      dict: {"environment": ..., "results": {name: result}}, the format saved by --output.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in WORKLOADS if names is None else names:
+        results[name] = measure(name, repeat, warmup, min_time)
+        if report is not None:
+            report(results[name])
+    return {"environment": environment(), "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Compare median timings against a baseline run.
+
+    Parameters:
+      current (dict): Output of run().
+      baseline (dict): An earlier output of run(), e.g. loaded from a --output file.
+      threshold (float, optional): Relative slow-down above which a workload counts as a regression. Default is 0.1.
+
+    Returns:
+      list: One dict per workload present in both runs with name, baseline, current (median
+            seconds), speedup (baseline / current) and regression (bool).
+    """
+    rows: List[Dict[str, Any]] = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before: float = baseline["results"][name]["median"]
+        after: float = result["median"]
+        rows.append({"name": name, "baseline": before, "current": after,
+                     "speedup": before / after if after > 0 else float("inf"),
+                     "regression": after > before * (1 + threshold)})
+    return rows
+
+
+def _format(result: Dict[str, Any]) -> str:
+    """
+    Format one workload result as a table row.
+    """
+    rates: str = ""
+    for quantity, label in RATES.items():
+        if result.get(f"{quantity}_per_s"):
+            rates += f"  {result[f'{quantity}_per_s']:>14,.0f} {label}"
+    return (f"{result['name']:<20} {result['mean'] * 1000:>10.3f} {result['median'] * 1000:>10.3f} "
+            f"{result['p95'] * 1000:>10.3f}  ms (mean/median/p95, n={result['samples']}){rates}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Parameters:
+      argv (list, optional): Arguments; defaults to sys.argv[1:].
+
+    Returns:
+      int: 0, or 1 if --compare found a regression.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Benchmark the Engine3D render pipeline.")
+    parser.add_argument("-w", "--workloads", nargs="+", choices=list(WORKLOADS), help="workloads to run (default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="minimum timed calls per workload")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed calls per workload")
+    parser.add_argument("--min-time", type=float, default=0.0, help="minimum timed seconds per workload")
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    parser.add_argument("-c", "--compare", help="compare against a JSON file written by --output")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1,
+                        help="relative slow-down counted as a regression with --compare (default 0.1)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON instead of a table")
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    report: Optional[Callable[[Dict[str, Any]], None]] = None
+    if not args.json:
+        report = lambda result: print(_format(result), flush=True)
+    current: Dict[str, Any] = run(args.workloads, args.repeat, args.warmup, args.min_time, report)
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(current, handle, indent=2)
+    if args.json:
+        print(json.dumps(current, indent=2))
+    if not args.compare:
+        return 0
+    with open(args.compare) as handle:
+        baseline: Dict[str, Any] = json.load(handle)
+    rows: List[Dict[str, Any]] = compare(current, baseline, args.threshold)
+    for row in rows:
+        flag: str = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<20} {row['baseline'] * 1000:>10.3f} -> {row['current'] * 1000:>10.3f} ms  "
+              f"x{row['speedup']:.2f}{flag}", file=sys.stderr if args.json else sys.stdout)
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""
+Bounding volume hierarchies over axis-aligned boxes, and the exact ray and distance tests
+used with them.
+
+A BVH is built top-down with median splits: each node's primitives are sorted by box
+centre along the longest axis of their centres and halved, one whole tree level at a
+time with a single sort, until a node holds at most `leaf_size` primitives. Nodes live
+in flat arrays. When the primitives move but stay the same set, refit recomputes the
+node boxes bottom-up, one level at a time, instead of rebuilding the tree; when only a
+few moved, just their leaves and the leaves' ancestors are recomputed. Queries also
+walk the tree a level at a time, testing the whole frontier of nodes in one vectorized
+step, so a query that reaches k leaves costs about k + log(N) box tests.
+"""
+import numpy as np
+from typing import Callable, List, Optional, Tuple
+
+LEAF_SIZE: int = 4
+
+# Maps (K, 3) box minima and maxima to a (K,) bool array of boxes to keep.
+BoxTest = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+class BVH:
+    """
+    A bounding volume hierarchy over N primitive boxes.
+
+    Attributes:
+      lo (np.ndarray): (M, 3) minimum corners of the node boxes; node 0 is the root.
+      hi (np.ndarray): (M, 3) maximum corners of the node boxes.
+      left (np.ndarray): (M,) index of each node's first child, -1 for leaves.
+      right (np.ndarray): (M,) index of each node's second child, -1 for leaves.
+      start (np.ndarray): (M,) first position of each node's primitives in `order`.
+      count (np.ndarray): (M,) number of primitives under each node.
+      order (np.ndarray): (N,) primitive indices, grouped so every node covers a contiguous run.
+      boxes (np.ndarray): (N, 2, 3) primitive boxes as of the last build or refit.
+    """
+    def __init__(self, lo: np.ndarray, hi: np.ndarray, leaf_size: int = LEAF_SIZE) -> None:
+        """
+        Build the hierarchy.
+
+        Parameters:
+          lo (np.ndarray): (N, 3) minimum corners of the primitive boxes.
+          hi (np.ndarray): (N, 3) maximum corners of the primitive boxes.
+          leaf_size (int, optional): Most primitives per leaf. Default is LEAF_SIZE.
+        """
+        lo = np.asarray(lo, dtype=np.float64).reshape(-1, 3)
+        hi = np.asarray(hi, dtype=np.float64).reshape(-1, 3)
+        centres: np.ndarray = (lo + hi) / 2
+        self.order: np.ndarray = np.arange(len(lo))
+        starts: np.ndarray = np.zeros(1, dtype=np.int64)
+        counts: np.ndarray = np.array([len(lo)], dtype=np.int64)
+        ids: np.ndarray = np.zeros(1, dtype=np.int64)
+        nodeStarts: List[np.ndarray] = [starts]
+        nodeCounts: List[np.ndarray] = [counts]
+        nodeDepths: List[np.ndarray] = [np.zeros(1, dtype=np.int64)]
+        parents: List[np.ndarray] = []
+        children: List[np.ndarray] = []
+        # Internal nodes per level, deepest last, for refit.
+        self._levels: List[np.ndarray] = []
+        total: int = 1
+        while True:
+            split: np.ndarray = counts > leaf_size
+            if not split.any():
+                break
+            starts, counts, ids = starts[split], counts[split], ids[split]
+            owner: np.ndarray = np.repeat(np.arange(len(starts)), counts)
+            bounds: np.ndarray = np.cumsum(counts) - counts
+            positions: np.ndarray = np.arange(int(counts.sum())) + np.repeat(starts - bounds, counts)
+            members: np.ndarray = self.order[positions]
+            low: np.ndarray = np.minimum.reduceat(centres[members], bounds)
+            spread: np.ndarray = np.maximum.reduceat(centres[members], bounds) - low
+            axis: np.ndarray = np.argmax(spread, axis=1)
+            # One sort for the whole level: the node number plus the centre's position within
+            # the node's extent, scaled into [0, 1).
+            width: np.ndarray = spread[np.arange(len(starts)), axis] * (1 + 1e-9) + 1e-300
+            offset: np.ndarray = (centres[members, axis[owner]] - low[owner, axis[owner]]) / width[owner]
+            self.order[positions] = members[np.argsort(owner + offset)]
+            half: np.ndarray = counts // 2
+            self._levels.append(ids)
+            parents.append(ids)
+            starts = np.stack((starts, starts + half), axis=1).reshape(-1)
+            counts = np.stack((half, counts - half), axis=1).reshape(-1)
+            ids = total + np.arange(len(starts))
+            children.append(ids)
+            nodeStarts.append(starts)
+            nodeCounts.append(counts)
+            nodeDepths.append(np.full(len(starts), len(self._levels), dtype=np.int64))
+            total += len(starts)
+        self.start: np.ndarray = np.concatenate(nodeStarts)
+        self.count: np.ndarray = np.concatenate(nodeCounts)
+        self.left: np.ndarray = np.full(total, -1, dtype=np.int64)
+        self.right: np.ndarray = np.full(total, -1, dtype=np.int64)
+        self._parent: np.ndarray = np.full(total, -1, dtype=np.int64)
+        self._depth: np.ndarray = np.concatenate(nodeDepths)
+        for parent, child in zip(parents, children):
+            self.left[parent] = child[0::2]
+            self.right[parent] = child[1::2]
+            self._parent[child] = np.repeat(parent, 2)
+        self._leaves: np.ndarray = np.flatnonzero((self.left < 0) & (self.count > 0))
+        self._leaves = self._leaves[np.argsort(self.start[self._leaves])]
+        # The leaf holding each primitive.
+        self._leafOf: np.ndarray = np.empty(len(lo), dtype=np.int64)
+        self._leafOf[self.order] = np.repeat(self._leaves, self.count[self._leaves])
+        self.lo: np.ndarray = np.zeros((total, 3))
+        self.hi: np.ndarray = np.zeros((total, 3))
+        self.refit(lo, hi)
+
+    @classmethod
+    def from_triangles(cls, triangles: np.ndarray, leaf_size: int = LEAF_SIZE) -> "BVH":
+        """
+        Build a hierarchy over the bounding boxes of triangles.
+
+        Parameters:
+          triangles (np.ndarray): An (N, 3, 3) array of triangle vertices.
+          leaf_size (int, optional): Most triangles per leaf.
+
+        Returns:
+          BVH: The new hierarchy; primitive i is triangle i.
+        """
+        triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+        return cls(triangles.min(axis=1), triangles.max(axis=1), leaf_size)
+
+    def __len__(self) -> int:
+        """
+        Return the number of primitives.
+        """
+        return len(self.order)
+
+    def refit(self, lo: np.ndarray, hi: np.ndarray, primitives: Optional[np.ndarray] = None) -> None:
+        """
+        Update the node boxes for moved primitives, keeping the tree's structure.
+
+        Parameters:
+          lo (np.ndarray): (N, 3) new minimum corners of the primitive boxes, or (K, 3) with `primitives`.
+          hi (np.ndarray): (N, 3) new maximum corners of the primitive boxes, or (K, 3) with `primitives`.
+          primitives (np.ndarray, optional): The K primitives that moved; only their leaves and
+                                             the leaves' ancestors are recomputed. Default is all.
+        """
+        lo = np.asarray(lo, dtype=np.float64).reshape(-1, 3)
+        hi = np.asarray(hi, dtype=np.float64).reshape(-1, 3)
+        if primitives is not None:
+            self._refitSome(np.asarray(primitives, dtype=np.int64).reshape(-1), lo, hi)
+            return
+        self.boxes: np.ndarray = np.stack((lo, hi), axis=1)
+        if len(self.order) == 0:
+            self.lo[:] = np.inf
+            self.hi[:] = -np.inf
+            return
+        self.lo[self._leaves] = np.minimum.reduceat(lo[self.order], self.start[self._leaves])
+        self.hi[self._leaves] = np.maximum.reduceat(hi[self.order], self.start[self._leaves])
+        for nodes in reversed(self._levels):
+            self.lo[nodes] = np.minimum(self.lo[self.left[nodes]], self.lo[self.right[nodes]])
+            self.hi[nodes] = np.maximum(self.hi[self.left[nodes]], self.hi[self.right[nodes]])
+
+    def _refitSome(self, primitives: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> None:
+        """
+        Update the boxes of some primitives, their leaves and the leaves' ancestors.
+
+        Parameters:
+          primitives (np.ndarray): (K,) primitive indices.
+          lo (np.ndarray): (K, 3) their new minimum corners.
+          hi (np.ndarray): (K, 3) their new maximum corners.
+        """
+        if len(primitives) == 0:
+            return
+        self.boxes[primitives, 0] = lo
+        self.boxes[primitives, 1] = hi
+        leaves: np.ndarray = np.unique(self._leafOf[primitives])
+        members: np.ndarray = self._leafPrimitives(leaves)
+        bounds: np.ndarray = np.cumsum(self.count[leaves]) - self.count[leaves]
+        self.lo[leaves] = np.minimum.reduceat(self.boxes[members, 0], bounds)
+        self.hi[leaves] = np.maximum.reduceat(self.boxes[members, 1], bounds)
+        ancestors: List[np.ndarray] = []
+        nodes: np.ndarray = np.unique(self._parent[leaves])
+        nodes = nodes[nodes >= 0]
+        while len(nodes):
+            ancestors.append(nodes)
+            nodes = np.unique(self._parent[nodes])
+            nodes = nodes[nodes >= 0]
+        if not ancestors:
+            return
+        nodes = np.unique(np.concatenate(ancestors))
+        depth: np.ndarray = self._depth[nodes]
+        # Deepest first, so every node sees its children's new boxes.
+        for level in range(int(depth.max()), -1, -1):
+            current: np.ndarray = nodes[depth == level]
+            self.lo[current] = np.minimum(self.lo[self.left[current]], self.lo[self.right[current]])
+            self.hi[current] = np.maximum(self.hi[self.left[current]], self.hi[self.right[current]])
+
+    def _leafPrimitives(self, nodes: np.ndarray) -> np.ndarray:
+        """
+        Return the primitives under some leaf nodes.
+
+        Parameters:
+          nodes (np.ndarray): Leaf node indices.
+
+        Returns:
+          np.ndarray: Primitive indices, leaf by leaf.
+        """
+        counts: np.ndarray = self.count[nodes]
+        positions: np.ndarray = (np.arange(int(counts.sum()))
+                                 + np.repeat(self.start[nodes] - (np.cumsum(counts) - counts), counts))
+        return self.order[positions]
+
+    def _walk(self, test: BoxTest) -> np.ndarray:
+        """
+        Collect the primitives in leaves whose boxes pass a test, visiting a level at a time.
+
+        Parameters:
+          test (Callable): Maps (K, 3) lo and hi arrays to a (K,) bool array.
+
+        Returns:
+          np.ndarray: Candidate primitive indices.
+        """
+        found: List[np.ndarray] = []
+        frontier: np.ndarray = np.zeros(1 if len(self.order) else 0, dtype=np.int64)
+        while len(frontier):
+            frontier = frontier[test(self.lo[frontier], self.hi[frontier])]
+            leaf: np.ndarray = self.left[frontier] < 0
+            found.append(self._leafPrimitives(frontier[leaf]))
+            inner: np.ndarray = frontier[~leaf]
+            frontier = np.concatenate((self.left[inner], self.right[inner]))
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+    def intersect_ray(self, origin: np.ndarray, direction: np.ndarray, t_min: float = 0.0,
+                      t_max: float = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the primitives whose boxes the ray origin + t * direction enters for t_min <= t <= t_max.
+
+        Parameters:
+          origin (np.ndarray): Ray origin.
+          direction (np.ndarray): Ray direction; t is measured in its length.
+          t_min (float, optional): Start of the ray segment. Default is 0.
+          t_max (float, optional): End of the ray segment. Default is infinity.
+
+        Returns:
+          tuple: (primitives, entry) sorted by entry, the t at which the ray enters each box.
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            inverse: np.ndarray = 1 / np.asarray(direction, dtype=np.float64)
+
+        def slabs(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            with np.errstate(invalid="ignore"):
+                t0: np.ndarray = (lo - origin) * inverse
+                t1: np.ndarray = (hi - origin) * inverse
+            # NaN (0 * inf) means the ray runs inside a slab's boundary plane; fmin/fmax skip it.
+            near: np.ndarray = np.maximum(np.fmax.reduce(np.fmin(t0, t1), axis=1), t_min)
+            far: np.ndarray = np.minimum(np.fmin.reduce(np.fmax(t0, t1), axis=1), t_max)
+            return near, far
+
+        def test(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+            near, far = slabs(lo, hi)
+            return near <= far
+
+        primitives: np.ndarray = self._walk(test)
+        near, far = slabs(self.boxes[primitives, 0], self.boxes[primitives, 1])
+        hit: np.ndarray = near <= far
+        primitives, near = primitives[hit], near[hit]
+        order: np.ndarray = np.argsort(near, kind="stable")
+        return primitives[order], near[order]
+
+    def intersect_sphere(self, centre: np.ndarray, radius: float) -> np.ndarray:
+        """
+        Find the primitives whose boxes come within `radius` of a point.
+
+        Parameters:
+          centre (np.ndarray): The point.
+          radius (float): The distance.
+
+        Returns:
+          np.ndarray: Sorted primitive indices.
+        """
+        centre = np.asarray(centre, dtype=np.float64)
+
+        def test(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+            gap: np.ndarray = np.maximum(np.maximum(lo - centre, centre - hi), 0)
+            return np.einsum("ij,ij->i", gap, gap) <= radius * radius
+
+        primitives: np.ndarray = self._walk(test)
+        primitives = primitives[test(self.boxes[primitives, 0], self.boxes[primitives, 1])]
+        return np.sort(primitives)
+
+
+def ray_triangles(origin: np.ndarray, direction: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """
+    Intersect a ray with many triangles (Moller-Trumbore, both faces).
+
+    Parameters:
+      origin (np.ndarray): Ray origin.
+      direction (np.ndarray): Ray direction; t is measured in its length.
+      triangles (np.ndarray): An (N, 3, 3) array of triangle vertices.
+
+    Returns:
+      np.ndarray: (N,) ray parameter t of each hit, inf where the line misses the triangle.
+                  Hits behind the origin have negative t.
+    """
+    triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    origin = np.asarray(origin, dtype=np.float64)
+    direction = np.asarray(direction, dtype=np.float64)
+    a: np.ndarray = triangles[:, 0]
+    ab: np.ndarray = triangles[:, 1] - a
+    ac: np.ndarray = triangles[:, 2] - a
+    p: np.ndarray = np.cross(direction, ac)
+    det: np.ndarray = np.einsum("ij,ij->i", ab, p)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverse: np.ndarray = 1 / det
+        s: np.ndarray = origin - a
+        u: np.ndarray = np.einsum("ij,ij->i", s, p) * inverse
+        q: np.ndarray = np.cross(s, ab)
+        v: np.ndarray = (q @ direction) * inverse
+        t: np.ndarray = np.einsum("ij,ij->i", ac, q) * inverse
+        hit: np.ndarray = (det != 0) & (u >= 0) & (v >= 0) & (u + v <= 1) & np.isfinite(t)
+    return np.where(hit, t, np.inf)
+
+
+def closest_points_on_triangles(point: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """
+    Return the point of each triangle nearest to a given point.
+
+    The point is classified against the triangle's vertex, edge and face regions with
+    barycentric tests, all vectorized across triangles.
+
+    Parameters:
+      point (np.ndarray): The query point.
+      triangles (np.ndarray): An (N, 3, 3) array of triangle vertices.
+
+    Returns:
+      np.ndarray: An (N, 3) array of closest points.
+    """
+    triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    point = np.asarray(point, dtype=np.float64)
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    ab: np.ndarray = b - a
+    ac: np.ndarray = c - a
+    ap: np.ndarray = point - a
+    bp: np.ndarray = point - b
+    cp: np.ndarray = point - c
+    d1, d2 = np.einsum("ij,ij->i", ab, ap), np.einsum("ij,ij->i", ac, ap)
+    d3, d4 = np.einsum("ij,ij->i", ab, bp), np.einsum("ij,ij->i", ac, bp)
+    d5, d6 = np.einsum("ij,ij->i", ab, cp), np.einsum("ij,ij->i", ac, cp)
+    va: np.ndarray = d3 * d6 - d5 * d4
+    vb: np.ndarray = d5 * d2 - d1 * d6
+    vc: np.ndarray = d1 * d4 - d3 * d2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Face region by default, then override with the edge and vertex regions, lowest
+        # priority first, so the outcome matches the usual early-return order.
+        total: np.ndarray = va + vb + vc
+        result: np.ndarray = a + ab * (vb / total)[:, None] + ac * (vc / total)[:, None]
+        edge_bc: np.ndarray = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        w: np.ndarray = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        result[edge_bc] = (b + (c - b) * w[:, None])[edge_bc]
+        edge_ac: np.ndarray = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        w = d2 / (d2 - d6)
+        result[edge_ac] = (a + ac * w[:, None])[edge_ac]
+        vertex_c: np.ndarray = (d6 >= 0) & (d5 <= d6)
+        result[vertex_c] = c[vertex_c]
+        edge_ab: np.ndarray = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        w = d1 / (d1 - d3)
+        result[edge_ab] = (a + ab * w[:, None])[edge_ab]
+    vertex_b: np.ndarray = (d3 >= 0) & (d4 <= d3)
+    result[vertex_b] = b[vertex_b]
+    vertex_a: np.ndarray = (d1 <= 0) & (d2 <= 0)
+    result[vertex_a] = a[vertex_a]
+    degenerate: np.ndarray = ~np.isfinite(result).all(axis=1)
+    if degenerate.any():
+        # Zero-area triangles: fall back to the nearest vertex.
+        corners: np.ndarray = triangles[degenerate]
+        nearest: np.ndarray = np.argmin(((corners - point) ** 2).sum(axis=2), axis=1)
+        result[degenerate] = corners[np.arange(len(corners)), nearest]
+    return result
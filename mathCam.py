@@ -10,12 +10,19 @@ class MathCam:
       Distance (float): The distance from the camera to the view plane.
       Angle (float): The half-angle of the camera's field of view in radians.
       max_value (int): The maximum coordinate value for the projection.
+      Orientation (np.ndarray): 3x3 matrix whose columns are the camera's forward, left and up
+                                directions in world space; the identity looks down +x with +z up.
       p1 (np.ndarray): First corner point of the view plane.
       p2 (np.ndarray): Second corner point of the view plane.
       p3 (np.ndarray): Third corner point of the view plane.
       p4 (np.ndarray): Fourth corner point of the view plane.
+
+    p1..p4 are derived from the position and orientation by setPosition, move, setOrientation
+    and lookAt, but they remain the camera's definition: they can still be assigned directly,
+    and all projection caches are keyed on them.
     """
-    def __init__(self, x: float, y: float, z: float, Distance: float, Angle: float = 90, max_value: int = 500) -> None:
+    def __init__(self, x: float, y: float, z: float, Distance: float, Angle: float = 90, max_value: int = 500,
+                 yaw: float = 0, pitch: float = 0, roll: float = 0) -> None:
         """
         Initialize the MathCam object.
 
@@ -26,15 +33,89 @@ class MathCam:
           Distance (float): Distance from the camera to the view plane.
           Angle (float, optional): Full field of view angle in degrees. Default is 90.
           max_value (int, optional): Maximum projection coordinate value. Default is 500.
+          yaw (float, optional): Initial orientation in degrees (see setOrientation). Default is 0.
+          pitch (float, optional): Initial orientation in degrees. Default is 0.
+          roll (float, optional): Initial orientation in degrees. Default is 0.
         """
         self.CenterPoint: np.ndarray = np.array([x, y, z])
         self.Distance: float = Distance
         self.Angle: float = math.radians(Angle) / 2
         self.max_value: int = max_value
-        self.p1: np.ndarray = np.array([x + Distance, y + math.tan(self.Angle) * Distance, z + math.tan(self.Angle) * Distance])
-        self.p2: np.ndarray = np.array([x + Distance, y + math.tan(self.Angle) * Distance, z - math.tan(self.Angle) * Distance])
-        self.p3: np.ndarray = np.array([x + Distance, y - math.tan(self.Angle) * Distance, z + math.tan(self.Angle) * Distance])
-        self.p4: np.ndarray = np.array([x + Distance, y - math.tan(self.Angle) * Distance, z - math.tan(self.Angle) * Distance])
+        self.setOrientation(yaw, pitch, roll)
+
+    def _placePlane(self) -> None:
+        """
+        Recompute the view plane corners p1..p4 from CenterPoint, Orientation, Distance and Angle.
+        """
+        forward, left, up = self.Orientation.T
+        half: float = math.tan(self.Angle) * self.Distance
+        centre: np.ndarray = self.CenterPoint + self.Distance * forward
+        self.p1: np.ndarray = centre + half * left + half * up
+        self.p2: np.ndarray = centre + half * left - half * up
+        self.p3: np.ndarray = centre - half * left + half * up
+        self.p4: np.ndarray = centre - half * left - half * up
+
+    def setPosition(self, x: float, y: float, z: float) -> None:
+        """
+        Move the camera to a new position, keeping its orientation.
+
+        Parameters:
+          x (float): X coordinate of the camera's position.
+          y (float): Y coordinate of the camera's position.
+          z (float): Z coordinate of the camera's position.
+        """
+        self.CenterPoint = np.array([x, y, z], dtype=np.float64)
+        self._placePlane()
+
+    def move(self, dx: float, dy: float, dz: float) -> None:
+        """
+        Move the camera by an offset in world space, keeping its orientation.
+
+        Parameters:
+          dx (float): Offset along x.
+          dy (float): Offset along y.
+          dz (float): Offset along z.
+        """
+        self.setPosition(*(self.CenterPoint + np.array([dx, dy, dz])))
+
+    def setOrientation(self, yaw: float, pitch: float = 0, roll: float = 0) -> None:
+        """
+        Orient the camera by angles in degrees, applied as roll, then pitch, then yaw.
+
+        Parameters:
+          yaw (float): Turn about the world z axis; positive turns from +x towards +y.
+          pitch (float, optional): Tilt of the view direction; positive looks up (+z). Default is 0.
+          roll (float, optional): Rotation about the view direction; positive turns the image
+                                  counter-clockwise as seen by the camera. Default is 0.
+        """
+        a, b, c = (math.radians(angle) for angle in (yaw, pitch, roll))
+        Rz: np.ndarray = np.array([[math.cos(a), -math.sin(a), 0], [math.sin(a), math.cos(a), 0], [0, 0, 1]])
+        Ry: np.ndarray = np.array([[math.cos(b), 0, -math.sin(b)], [0, 1, 0], [math.sin(b), 0, math.cos(b)]])
+        Rx: np.ndarray = np.array([[1, 0, 0], [0, math.cos(c), -math.sin(c)], [0, math.sin(c), math.cos(c)]])
+        self.Orientation: np.ndarray = Rz @ Ry @ Rx
+        self._placePlane()
+
+    def lookAt(self, x: float, y: float, z: float, up: Tuple[float, float, float] = (0, 0, 1)) -> None:
+        """
+        Turn the camera to face a point, keeping `up` as the top of the image.
+
+        Parameters:
+          x (float): X coordinate of the target.
+          y (float): Y coordinate of the target.
+          z (float): Z coordinate of the target.
+          up (tuple, optional): World direction shown upwards. Default is +z.
+
+        Raises:
+          ValueError: If the target is at the camera's position or straight along `up`.
+        """
+        forward: np.ndarray = np.array([x, y, z], dtype=np.float64) - self.CenterPoint
+        left: np.ndarray = np.cross(np.asarray(up, dtype=np.float64), forward)
+        if np.linalg.norm(forward) == 0 or np.linalg.norm(left) == 0:
+            raise ValueError("lookAt target must differ from the camera position and not lie along up")
+        forward = MathCam.normalize(forward)
+        left = MathCam.normalize(left)
+        self.Orientation = np.column_stack((forward, left, np.cross(forward, left)))
+        self._placePlane()
 
     @staticmethod
     def normalize(v: np.ndarray) -> np.ndarray:
@@ -50,6 +131,269 @@ class MathCam:
         norm: float = np.linalg.norm(v)
         return v if norm == 0 else v / norm
 
+    def _cameraKey(self) -> Tuple:
+        """
+        Return a value that changes whenever the camera's geometry changes.
+
+        Returns:
+          tuple: The raw bytes of CenterPoint and p1..p4, plus max_value.
+        """
+        return (self.CenterPoint.tobytes(), self.p1.tobytes(), self.p2.tobytes(),
+                self.p3.tobytes(), self.p4.tobytes(), self.max_value)
+
+    def _plane(self) -> Tuple[bool, np.ndarray, np.ndarray]:
+        """
+        Return the view plane and 2D basis, recomputing them only when the camera has changed.
+
+        The cache is keyed on CenterPoint, p1..p4 and max_value, so moving the camera by
+        assigning or editing any of those refreshes it on the next projection.
+
+        Returns:
+          tuple: (degenerate, axes, offsets). `axes` is a 3x3 matrix whose columns are the
+                 plane normal and the two scaled screen axes; `offsets` holds n·p1 - n·C and
+                 the screen coordinates of the camera centre.
+        """
+        key: Tuple = self._cameraKey()
+        if getattr(self, "_planeKey", None) == key:
+            return self._planeCache
+        u: np.ndarray = self.p2 - self.p1
+        v: np.ndarray = self.p3 - self.p1
+        n: np.ndarray = np.cross(u, v)
+        degenerate: bool = bool(np.linalg.norm(n) == 0)
+        n = MathCam.normalize(n)
+        u_hat: np.ndarray = MathCam.normalize(u)
+        v_hat: np.ndarray = MathCam.normalize(v)
+        max_x: float = np.dot(u, u_hat)
+        max_y: float = np.dot(v, v_hat)
+        ax: np.ndarray = u_hat * (self.max_value / max_x) if max_x != 0 else np.zeros(3)
+        ay: np.ndarray = v_hat * (self.max_value / max_y) if max_y != 0 else np.zeros(3)
+        axes: np.ndarray = np.column_stack((n, ax, ay))
+        offsets: np.ndarray = np.array([np.dot(n, self.p1) - np.dot(n, self.CenterPoint),
+                                        np.dot(self.CenterPoint - self.p1, ax),
+                                        np.dot(self.CenterPoint - self.p1, ay)])
+        self._planeKey = key
+        self._planeCache = (degenerate, axes, offsets)
+        return self._planeCache
+
+    def view_projection(self) -> np.ndarray:
+        """
+        Return the 4x4 view-projection matrix, rebuilding it only when the camera has changed.
+
+        A point P maps to clip coordinates (X, Y, Z, W) = [P, 1] @ matrix, where W is the
+        point's depth along the view direction, (X / W, Y / W) its projection coordinates, and
+        Z = W - Distance, so Z >= 0 exactly for points on or beyond the view plane, which
+        serves as the near plane.
+
+        Returns:
+          np.ndarray: The matrix, for row vectors. All zero if the view plane is degenerate.
+        """
+        key: Tuple = self._cameraKey()
+        if getattr(self, "_matrixKey", None) == key:
+            return self._matrixCache
+        degenerate, axes, offsets = self._plane()
+        matrix: np.ndarray = np.zeros((4, 4))
+        if not degenerate:
+            sign: float = float(np.sign(offsets[0]))
+            near: float = abs(offsets[0])
+            view: np.ndarray = np.eye(4)
+            view[:3, :3] = axes
+            view[3, :3] = -self.CenterPoint @ axes
+            projection: np.ndarray = np.array([[offsets[1] * sign, offsets[2] * sign, sign, sign],
+                                               [near, 0, 0, 0],
+                                               [0, near, 0, 0],
+                                               [0, 0, -near, 0]])
+            matrix = view @ projection
+        self._matrixKey = key
+        self._matrixCache = matrix
+        return matrix
+
+    def clip_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Transform points to clip coordinates with one multiply by the view-projection matrix.
+
+        Parameters:
+          points (np.ndarray): An (N, 3) array of points in 3D space.
+
+        Returns:
+          np.ndarray: An (N, 4) array of (X, Y, Z, W) rows (see view_projection).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        matrix: np.ndarray = self.view_projection()
+        return points @ matrix[:3] + matrix[3]
+
+    def project_points(self, points: np.ndarray, return_depth: bool = False) -> Tuple[np.ndarray, ...]:
+        """
+        Project a batch of 3D points onto the view plane.
+
+        Points go through the view-projection matrix (see clip_points); a point projects where
+        its line to the camera centre meets the view plane, and only points on or beyond that
+        plane project at all, as with line_plane_intersection.
+
+        Parameters:
+          points (np.ndarray): An (N, 3) array of points in 3D space.
+          return_depth (bool, optional): Also return each point's depth along the view direction.
+
+        Returns:
+          tuple: (xy, valid) where xy is an (N, 2) array of 2D projection coordinates and
+                 valid is an (N,) bool array that is False where there is no intersection.
+                 Invalid rows of xy are NaN. With `return_depth`, a third (N,) array holds
+                 the distance of each point from the camera measured along the plane normal.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        degenerate, _, _ = self._plane()
+        if degenerate:
+            result: Tuple[np.ndarray, ...] = (np.full((len(points), 2), np.nan), np.zeros(len(points), dtype=bool))
+            return result + (np.full(len(points), np.nan),) if return_depth else result
+        clip: np.ndarray = self.clip_points(points)
+        depth: np.ndarray = clip[:, 3]
+        valid: np.ndarray = (clip[:, 2] >= 0) & (depth > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            xy: np.ndarray = clip[:, :2] / depth[:, None]
+        xy[~valid] = np.nan
+        if return_depth:
+            return xy, valid, depth
+        return xy, valid
+
+    def _clipCopies(self, points: np.ndarray) -> np.ndarray:
+        """
+        Transform a (V, 3) array of points, or a stack of C such arrays, to clip coordinates.
+
+        Parameters:
+          points (np.ndarray): A (V, 3) or (C, V, 3) array of points.
+
+        Returns:
+          np.ndarray: A (C, V, 4) array, with C = 1 for a single array.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        shape: Tuple[int, ...] = points.shape[:2] if points.ndim == 3 else (1, -1)
+        return self.clip_points(points).reshape(shape + (4,))
+
+    def project_triangles(self, points: np.ndarray, indices: np.ndarray,
+                          keep: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Project indexed triangles, clipping them against the near (view) plane.
+
+        Triangles entirely beyond the plane are kept as they are and triangles entirely in
+        front of it are dropped. The others are cut in clip space where they cross it: one
+        vertex beyond leaves a smaller triangle, two leave a quad that is split into two
+        triangles. Winding is preserved, and output triangles follow the order of their
+        source triangles.
+
+        Several copies of one mesh (e.g. instances, see Scene.returnBatches) can be projected
+        at once by stacking their vertices; they all use the same `indices`, and the
+        triangles are numbered copy by copy, triangle m of copy c being c * M + m.
+
+        Parameters:
+          points (np.ndarray): An (N, 3) array of vertices, or a (C, N, 3) stack of C copies.
+          indices (np.ndarray): An (M, 3) integer array of triangle vertex indices.
+          keep (np.ndarray, optional): A bool mask over the (C * M) triangles; only those set
+                                       are projected, e.g. the ones facing the camera.
+
+        Returns:
+          tuple: (xy, depth, source): an (K, 3, 2) array of projected vertices, an (K, 3) array
+                 of their positive depths, and for each output triangle the (K,) index of the
+                 triangle it comes from, counting only the kept ones when `keep` is given.
+        """
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        if self._plane()[0]:
+            return np.zeros((0, 3, 2)), np.zeros((0, 3)), np.zeros(0, dtype=np.int64)
+        clip: np.ndarray = self._clipCopies(points)
+        selected: np.ndarray = np.flatnonzero(keep) if keep is not None else None
+        if len(clip) == 1:
+            triangles: np.ndarray = clip[0][indices if keep is None else indices[selected]]
+        elif keep is None:
+            triangles = clip[:, indices].reshape(-1, 3, 4)
+        else:
+            triangles = clip[(selected // len(indices))[:, None], indices[selected % len(indices)]]
+        inside: np.ndarray = triangles[:, :, 2] >= 0
+        count: np.ndarray = inside.sum(axis=1)
+        whole: np.ndarray = np.flatnonzero(count == 3)
+        pieces: List[np.ndarray] = [triangles[whole]]
+        sources: List[np.ndarray] = [whole]
+        for kept in (1, 2):
+            cut: np.ndarray = np.flatnonzero(count == kept)
+            if len(cut) == 0:
+                continue
+            # Rotate each triangle so the odd one out (the only vertex in front for kept == 1,
+            # the only one behind for kept == 2) comes first; rotation keeps the winding.
+            odd: np.ndarray = inside[cut] if kept == 1 else ~inside[cut]
+            first: np.ndarray = np.argmax(odd, axis=1)
+            order: np.ndarray = (first[:, None] + np.arange(3)) % 3
+            a, b, c = np.moveaxis(np.take_along_axis(triangles[cut], order[:, :, None], axis=1), 1, 0)
+            ab: np.ndarray = a + (a[:, 2] / (a[:, 2] - b[:, 2]))[:, None] * (b - a)
+            ac: np.ndarray = a + (a[:, 2] / (a[:, 2] - c[:, 2]))[:, None] * (c - a)
+            if kept == 1:
+                pieces.append(np.stack((a, ab, ac), axis=1))
+                sources.append(cut)
+            else:
+                pieces.append(np.stack((ab, b, c, ab, c, ac), axis=1).reshape(-1, 3, 4))
+                sources.append(np.repeat(cut, 2))
+        source: np.ndarray = np.concatenate(sources)
+        order = np.argsort(source, kind="stable")
+        clipped: np.ndarray = np.concatenate(pieces)[order]
+        depth: np.ndarray = clipped[:, :, 3]
+        return clipped[:, :, :2] / depth[:, :, None], depth, source[order]
+
+    def project_segments(self, points: np.ndarray, edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Project indexed line segments, clipping them against the near (view) plane.
+
+        Segments entirely beyond the plane are kept and segments entirely in front of it are
+        dropped; a segment crossing it has its near end moved to the crossing point in clip
+        space. As with project_triangles, stacked copies of the points share `edges`.
+
+        Parameters:
+          points (np.ndarray): An (N, 3) array of vertices, or a (C, N, 3) stack of C copies.
+          edges (np.ndarray): An (M, 2) integer array of segment end point indices.
+
+        Returns:
+          tuple: (lines, source): an (K, 2, 2) array of projected end points and the (K,) index
+                 of each kept segment, in order, segment m of copy c being c * M + m.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if self._plane()[0]:
+            return np.zeros((0, 2, 2)), np.zeros(0, dtype=np.int64)
+        clip: np.ndarray = self._clipCopies(points)
+        inside: np.ndarray = (clip[:, :, 2] >= 0)[:, edges].reshape(-1, 2)
+        source: np.ndarray = np.flatnonzero(inside.any(axis=1))
+        if len(clip) == 1:
+            segments: np.ndarray = clip[0][edges[source]]
+        else:
+            segments = clip[(source // len(edges))[:, None], edges[source % len(edges)]]
+        cut: np.ndarray = np.flatnonzero(~inside[source].all(axis=1))
+        if len(cut):
+            a, b = segments[cut, 0], segments[cut, 1]
+            crossing: np.ndarray = a + (a[:, 2] / (a[:, 2] - b[:, 2]))[:, None] * (b - a)
+            behind: np.ndarray = ~inside[source[cut], 0]
+            segments[cut[behind], 0] = crossing[behind]
+            segments[cut[~behind], 1] = crossing[~behind]
+        return segments[:, :, :2] / segments[:, :, 3:], source
+
+    def projected_radius(self, centres: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """
+        Estimate the on-screen radius of spheres, in projection units (pixels).
+
+        A sphere at depth d along the view direction appears about r * f / d units large, where
+        f is the view plane's distance times its projection scale. Spheres that reach the
+        camera's depth are reported as infinitely large.
+
+        Parameters:
+          centres (np.ndarray): An (N, 3) array of sphere centres.
+          radii (np.ndarray): An (N,) array of sphere radii.
+
+        Returns:
+          np.ndarray: An (N,) array of projected radii.
+        """
+        centres = np.asarray(centres, dtype=np.float64).reshape(-1, 3)
+        radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+        degenerate, axes, offsets = self._plane()
+        if degenerate:
+            return np.full(len(radii), np.inf)
+        depth: np.ndarray = ((centres - self.CenterPoint) @ axes[:, 0]) * np.sign(offsets[0])
+        focal: float = abs(offsets[0]) * np.linalg.norm(axes[:, 1])
+        with np.errstate(divide="ignore"):
+            return np.where(depth > radii, radii * focal / np.maximum(depth, 1e-300), np.inf)
+
     def line_plane_intersection(self, P1: np.ndarray) -> Tuple[Optional[float], Optional[float]]:
         """
         Compute the intersection of a line (from camera center to point P1) with the view plane.
@@ -61,19 +405,28 @@ class MathCam:
           tuple: A tuple (rel_x, rel_y) of 2D projection coordinates if intersection occurs;
                  (None, None) if there is no valid intersection.
         """
-        P1, P2 = self.CenterPoint, np.array(P1)
-        u: np.ndarray = self.p2 - self.p1
-        v: np.ndarray = self.p3 - self.p1
-        n: np.ndarray = np.cross(u, v)
-        if np.linalg.norm(n) == 0:
+        xy, valid = self.project_points(np.asarray(P1, dtype=np.float64).reshape(1, 3))
+        if not valid[0]:
             return (None, None)
-        n = MathCam.normalize(n)
-        d: float = np.dot(n, self.p1)
-        denom: float = np.dot(n, P2 - P1)
-        if np.isclose(denom, 0):
-            return (None, None)
-        t: float = (d - np.dot(n, P1)) / denom
-        return (None, None) if t < 0 or t > 1 else self.relative_2D(P1 + t * (P2 - P1))
+        return float(xy[0, 0]), float(xy[0, 1])
+
+    def ray(self, screen_x: float, screen_y: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the ray from the camera centre through a point of the view plane.
+
+        This inverts project_points: every point origin + t * direction with t >= 1 projects to
+        (screen_x, screen_y), and t = 1 is the view plane itself.
+
+        Parameters:
+          screen_x (float): First projection coordinate (the painter's row); pixel centres are at + 0.5.
+          screen_y (float): Second projection coordinate (the painter's column).
+
+        Returns:
+          tuple: (origin, direction) as 3D vectors.
+        """
+        u: np.ndarray = (self.p2 - self.p1) / self.max_value
+        v: np.ndarray = (self.p3 - self.p1) / self.max_value
+        return self.CenterPoint.astype(np.float64), self.p1 + screen_x * u + screen_y * v - self.CenterPoint
 
     def relative_2D(self, P: np.ndarray) -> Tuple[float, float]:
         """
@@ -85,13 +438,47 @@ class MathCam:
         Returns:
           tuple: A tuple (rel_x, rel_y) representing 2D coordinates scaled to max_value.
         """
-        P = np.array(P)
-        u: np.ndarray = MathCam.normalize(self.p2 - self.p1)
-        v: np.ndarray = MathCam.normalize(self.p3 - self.p1)
-        rel_x: float = np.dot(P - self.p1, u)
-        rel_y: float = np.dot(P - self.p1, v)
-        max_x: float = np.dot(self.p2 - self.p1, u)
-        max_y: float = np.dot(self.p3 - self.p1, v)
-        rel_x = (rel_x / max_x) * self.max_value if max_x != 0 else 0
-        rel_y = (rel_y / max_y) * self.max_value if max_y != 0 else 0
-        return rel_x, rel_y
\ No newline at end of file
+        _, axes, _ = self._plane()
+        rel_x, rel_y = (np.asarray(P, dtype=np.float64) - self.p1) @ axes[:, 1:]
+        return float(rel_x), float(rel_y)
+
+    def frustum_planes(self, margin: float = 1.0) -> np.ndarray:
+        """
+        Return the planes of the view frustum defined by CenterPoint and p1..p4.
+
+        There are four side planes through the camera centre and the edges of the view
+        rectangle, plus the view plane itself as the near plane, since only points beyond it
+        project. The rectangle is widened by `margin` projected units on every side, so that
+        geometry which truncates onto the border pixels is kept. Planes are cached until the
+        camera changes.
+
+        Parameters:
+          margin (float, optional): Extra border in projection units (pixels). Default is 1.
+
+        Returns:
+          np.ndarray: A (5, 4) array of planes (nx, ny, nz, d) with unit normals; a point P is
+                      inside the frustum when n·P + d >= 0 for every plane.
+        """
+        key: Tuple = self._cameraKey() + (margin,)
+        if getattr(self, "_frustumKey", None) == key:
+            return self._frustumCache
+        u: np.ndarray = (self.p2 - self.p1) / self.max_value
+        v: np.ndarray = (self.p3 - self.p1) / self.max_value
+        lo: float = -margin
+        hi: float = self.max_value + margin
+        corners: List[np.ndarray] = [self.p1 + a * u + b * v for a, b in ((lo, lo), (hi, lo), (hi, hi), (lo, hi))]
+        centre: np.ndarray = (self.p1 + self.p2 + self.p3 + self.p4) / 4
+        inside: np.ndarray = self.CenterPoint + 2 * (centre - self.CenterPoint)
+        planes: List[np.ndarray] = []
+        for a, b in zip(corners, corners[1:] + corners[:1]):
+            n: np.ndarray = MathCam.normalize(np.cross(a - self.CenterPoint, b - self.CenterPoint))
+            if np.dot(n, inside - self.CenterPoint) < 0:
+                n = -n
+            planes.append(np.append(n, -np.dot(n, self.CenterPoint)))
+        forward: np.ndarray = MathCam.normalize(np.cross(u, v))
+        if np.dot(forward, centre - self.CenterPoint) < 0:
+            forward = -forward
+        planes.append(np.append(forward, -np.dot(forward, centre)))
+        self._frustumKey = key
+        self._frustumCache = np.array(planes)
+        return self._frustumCache
@@ -0,0 +1,366 @@
+"""
+Loading of .engine3D mesh files and their compiled binary sidecars.
+
+A .engine3D file is text: one vertex per line as three floats, three lines per triangle,
+with blank lines between triangles. Parsing it is linear in Python-visible work, so the
+first load writes a compiled copy next to the source ('<file>.e3db'): a 64 byte header,
+the welded unique vertices as raw little-endian float32 and the triangle index buffer as
+int32. Later loads memory-map that copy
+as long as the header still matches the source's size and mtime (or, if only the mtime
+moved, its SHA-1).
+"""
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import time
+import numpy as np
+from typing import Any, Callable, List, Optional, Tuple
+from assets import weld_vertices
+
+MAGIC: bytes = b"E3DBIN\x00\x00"
+VERSION: int = 2
+HEADER: struct.Struct = struct.Struct("<8sIQQQq20s")
+HEADER_SIZE: int = 64
+SUFFIX: str = ".e3db"
+CHUNK_SIZE: int = 1 << 22
+BYTES_PER_TRIANGLE_GUESS: int = 80
+
+
+def stream_engine3D(filename: str, chunk_size: int = CHUNK_SIZE, dtype: Any = np.float64,
+                    progress: Optional[Callable[[int, int, int, float], None]] = None) -> np.ndarray:
+    """
+    Parse a text .engine3D file in fixed-size chunks.
+
+    Each chunk is cut at its last newline and parsed with one vectorized NumPy call. The
+    partial line after the cut is read again as the start of the next chunk. Values go straight into one output array
+    sized from the file length, which grows geometrically if that guess was short and is
+    trimmed in place at the end. Peak memory is therefore about the final array plus one
+    chunk. Blank separator lines, and any other whitespace between values, are skipped.
+
+    Parameters:
+      filename (str): The path to the .engine3D file.
+      chunk_size (int, optional): Bytes read per chunk. Default is 4 MiB.
+      dtype (Any, optional): Floating point type of the result. Default is np.float64.
+      progress (Callable, optional): Called after each chunk as
+                                     progress(triangles, bytes_read, total_bytes, triangles_per_second).
+
+    Returns:
+      np.ndarray: An (N, 3, 3) array of triangles. Trailing coordinates that do not
+                  complete a triangle are ignored.
+    """
+    total: int = os.path.getsize(filename)
+    values: np.ndarray = np.empty(max(9, total // BYTES_PER_TRIANGLE_GUESS * 9), dtype=dtype)
+    filled: int = 0
+    bytes_read: int = 0
+    started: float = time.perf_counter()
+    with open(filename, "rb") as file:
+        while True:
+            block: bytes = file.read(chunk_size)
+            if not block:
+                break
+            cut: int = block.rfind(b"\n") + 1
+            if cut == 0 and len(block) == chunk_size:
+                # A single line longer than the chunk: retry with a bigger one.
+                file.seek(-len(block), os.SEEK_CUR)
+                chunk_size *= 2
+                continue
+            if 0 < cut < len(block):
+                # Leave the partial last line in the file for the next read.
+                file.seek(cut - len(block), os.SEEK_CUR)
+                block = block[:cut]
+            bytes_read += len(block)
+            # np.fromstring turns a whitespace-only string into [-1.0], so skip those.
+            if not block.isspace():
+                parsed: np.ndarray = np.fromstring(block, dtype=dtype, sep=" ")
+                if filled + len(parsed) > len(values):
+                    values.resize(max(2 * len(values), filled + len(parsed)), refcheck=False)
+                values[filled:filled + len(parsed)] = parsed
+                filled += len(parsed)
+            if progress is not None:
+                elapsed: float = time.perf_counter() - started
+                progress(filled // 9, bytes_read, total, filled // 9 / elapsed if elapsed > 0 else 0.0)
+    values.resize(filled - filled % 9, refcheck=False)
+    return values.reshape(-1, 3, 3)
+
+
+def parse_engine3D(filename: str, dtype: Any = np.float64,
+                   progress: Optional[Callable[[int, int, int, float], None]] = None) -> np.ndarray:
+    """
+    Parse a text .engine3D file.
+
+    Parameters:
+      filename (str): The path to the .engine3D file.
+      dtype (Any, optional): Floating point type of the result. Default is np.float64.
+      progress (Callable, optional): Progress callback, see stream_engine3D.
+
+    Returns:
+      np.ndarray: An (N, 3, 3) array of triangles. Trailing coordinates that do not
+                  complete a triangle are ignored.
+    """
+    return stream_engine3D(filename, dtype=dtype, progress=progress)
+
+
+def compiled_path(filename: str) -> str:
+    """
+    Return the path of the compiled sidecar for a source file.
+
+    Parameters:
+      filename (str): The path to the .engine3D file.
+
+    Returns:
+      str: The sidecar path.
+    """
+    return filename + SUFFIX
+
+
+def _digest(filename: str) -> bytes:
+    """
+    Compute the SHA-1 of a file without reading it into memory at once.
+
+    Parameters:
+      filename (str): The file to hash.
+
+    Returns:
+      bytes: The 20 byte digest.
+    """
+    sha: Any = hashlib.sha1()
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            sha.update(block)
+    return sha.digest()
+
+
+def _readHeader(path: str) -> Optional[Tuple[int, int, int, int, bytes]]:
+    """
+    Read a compiled file header.
+
+    Parameters:
+      path (str): The compiled file.
+
+    Returns:
+      tuple: (triangles, vertices, source_size, source_mtime_ns, source_sha1), or None if the
+             file is missing, truncated or not a compiled mesh of this version.
+    """
+    try:
+        with open(path, "rb") as file:
+            raw: bytes = file.read(HEADER_SIZE)
+    except OSError:
+        return None
+    if len(raw) < HEADER_SIZE:
+        return None
+    magic, version, triangles, vertices, size, mtime, sha = HEADER.unpack_from(raw)
+    if magic != MAGIC or version != VERSION or os.path.getsize(path) != HEADER_SIZE + (triangles + vertices) * 12:
+        return None
+    return triangles, vertices, size, mtime, sha
+
+
+def _header(triangles: int, vertices: int, source: str, sha: bytes) -> bytes:
+    """
+    Build a compiled file header describing `source`.
+
+    Parameters:
+      triangles (int): Number of triangles stored.
+      vertices (int): Number of unique vertices stored.
+      source (str): The source file the mesh came from.
+      sha (bytes): The source's SHA-1.
+
+    Returns:
+      bytes: The padded header.
+    """
+    info: os.stat_result = os.stat(source)
+    return HEADER.pack(MAGIC, VERSION, triangles, vertices, info.st_size, info.st_mtime_ns, sha).ljust(HEADER_SIZE, b"\x00")
+
+
+def write_compiled(vertices: np.ndarray, indices: np.ndarray, source: str, target: Optional[str] = None) -> str:
+    """
+    Write an indexed mesh parsed from `source` to a compiled file.
+
+    The file is written under a temporary name and renamed into place, so readers never
+    see a partial file.
+
+    Parameters:
+      vertices (np.ndarray): A (V, 3) array of unique vertices.
+      indices (np.ndarray): An (N, 3) index buffer into `vertices`.
+      source (str): The source file the mesh came from.
+      target (str, optional): Output path. Default is the source's sidecar path.
+
+    Returns:
+      str: The path written.
+
+    Raises:
+      ValueError: If the mesh has too many vertices for 32-bit indices.
+    """
+    target = compiled_path(source) if target is None else target
+    points: np.ndarray = np.ascontiguousarray(vertices, dtype="<f4").reshape(-1, 3)
+    if len(points) >= 2 ** 31:
+        raise ValueError("compiled meshes are limited to 2**31 - 1 vertices")
+    faces: np.ndarray = np.ascontiguousarray(indices, dtype="<i4").reshape(-1, 3)
+    temporary: str = f"{target}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(_header(len(faces), len(points), source, _digest(source)))
+        points.tofile(file)
+        faces.tofile(file)
+    os.replace(temporary, target)
+    return target
+
+
+def load_compiled(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Memory-map a compiled mesh file.
+
+    Parameters:
+      path (str): The compiled file.
+
+    Returns:
+      tuple: (vertices, indices) as read-only memmaps: (V, 3) float32 and (N, 3) int32.
+
+    Raises:
+      ValueError: If the file is not a valid compiled mesh.
+    """
+    header: Optional[Tuple[int, int, int, int, bytes]] = _readHeader(path)
+    if header is None:
+        raise ValueError(f"{path} is not a compiled .engine3D mesh")
+    triangles, vertices = header[0], header[1]
+    if triangles == 0:
+        return np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.int32)
+    return (np.memmap(path, dtype="<f4", mode="r", offset=HEADER_SIZE, shape=(vertices, 3)),
+            np.memmap(path, dtype="<i4", mode="r", offset=HEADER_SIZE + vertices * 12, shape=(triangles, 3)))
+
+
+def _parseIndexed(source: str, progress: Optional[Callable[[int, int, int, float], None]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a text .engine3D file at float32 precision and weld its shared vertices.
+
+    Parameters:
+      source (str): The .engine3D file.
+      progress (Callable, optional): Parsing progress callback, see stream_engine3D.
+
+    Returns:
+      tuple: (vertices, indices) of the welded mesh.
+    """
+    return weld_vertices(parse_engine3D(source, dtype=np.float32, progress=progress))
+
+
+def compile_mesh(source: str, target: Optional[str] = None, force: bool = False,
+                 progress: Optional[Callable[[int, int, int, float], None]] = None) -> str:
+    """
+    Compile a .engine3D file unless an up-to-date compiled copy already exists.
+
+    Parameters:
+      source (str): The .engine3D file.
+      target (str, optional): Output path. Default is the source's sidecar path.
+      force (bool, optional): Recompile even if the existing copy is current. Default is False.
+      progress (Callable, optional): Parsing progress callback, see stream_engine3D.
+
+    Returns:
+      str: The compiled file path.
+    """
+    target = compiled_path(source) if target is None else target
+    if force or not _isCurrent(source, target):
+        write_compiled(*_parseIndexed(source, progress), source, target)
+    return target
+
+
+def _isCurrent(source: str, target: str) -> bool:
+    """
+    Check whether a compiled file still matches its source.
+
+    Size and mtime are compared first. If only the mtime differs, the source is hashed and,
+    when the contents are unchanged, the header is refreshed so the next check is cheap again.
+
+    Parameters:
+      source (str): The .engine3D file.
+      target (str): The compiled file.
+
+    Returns:
+      bool: True if the compiled file can be used.
+    """
+    header: Optional[Tuple[int, int, int, int, bytes]] = _readHeader(target)
+    if header is None:
+        return False
+    triangles, vertices, size, mtime, sha = header
+    info: os.stat_result = os.stat(source)
+    if info.st_size != size:
+        return False
+    if info.st_mtime_ns == mtime:
+        return True
+    digest: bytes = _digest(source)
+    if digest != sha:
+        return False
+    try:
+        with open(target, "r+b") as file:
+            file.write(_header(triangles, vertices, source, digest))
+    except OSError:
+        pass
+    return True
+
+
+def load_mesh(filename: str, cache: bool = True,
+              progress: Optional[Callable[[int, int, int, float], None]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load a .engine3D file as an indexed mesh, going through the compiled sidecar when possible.
+
+    Vertices that coincide within assets.DEFAULT_TOLERANCE are welded so each is stored once.
+    With `cache` set, an up-to-date sidecar is memory-mapped; otherwise the source is parsed and
+    a sidecar is written for next time. If the sidecar cannot be written (e.g. a read-only
+    directory), the parsed mesh is returned at the same float32 precision.
+
+    Parameters:
+      filename (str): The .engine3D file.
+      cache (bool, optional): Use and maintain the compiled sidecar. Default is True.
+      progress (Callable, optional): Parsing progress callback, see stream_engine3D. Not called
+                                     when an up-to-date sidecar is used.
+
+    Returns:
+      tuple: (vertices, indices) with a (V, 3) vertex array and an (N, 3) index buffer.
+    """
+    if not cache:
+        return weld_vertices(parse_engine3D(filename, progress=progress))
+    target: str = compiled_path(filename)
+    if _isCurrent(filename, target):
+        return load_compiled(target)
+    vertices, indices = _parseIndexed(filename, progress)
+    try:
+        write_compiled(vertices, indices, filename, target)
+    except OSError:
+        return vertices, indices
+    del vertices, indices
+    return load_compiled(target)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point: compile .engine3D files ahead of time.
+
+    Parameters:
+      argv (list, optional): Arguments; defaults to sys.argv[1:].
+
+    Returns:
+      int: Process exit status.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Compile .engine3D meshes to memory-mappable binaries.")
+    parser.add_argument("files", nargs="+", help=".engine3D files to compile")
+    parser.add_argument("-o", "--output", help="output path (only with a single input file)")
+    parser.add_argument("-f", "--force", action="store_true", help="recompile even if the compiled file is current")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report parsing progress")
+    args: argparse.Namespace = parser.parse_args(argv)
+    if args.output and len(args.files) != 1:
+        parser.error("--output needs exactly one input file")
+
+    def report(triangles: int, bytes_read: int, total_bytes: int, rate: float) -> None:
+        print(f"\r  {bytes_read * 100 // max(total_bytes, 1):3d}%  {triangles} triangles  {rate:,.0f} triangles/s",
+              end="", file=sys.stderr, flush=True)
+
+    for source in args.files:
+        target: str = compile_mesh(source, args.output, force=args.force, progress=None if args.quiet else report)
+        if not args.quiet:
+            print(file=sys.stderr)
+        header: Optional[Tuple[int, int, int, int, bytes]] = _readHeader(target)
+        print(f"{source} -> {target} ({header[0]} triangles, {header[1]} vertices)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
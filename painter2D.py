@@ -1,38 +1,93 @@
+import queue
+import threading
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import List, Tuple,Any
-
+from typing import Dict, List, Tuple, Optional, Any
+from backends import PresentBackend, MatplotlibBackend
 
+# A half-open pixel rectangle (row0, row1, col0, col1).
+Window = Tuple[int, int, int, int]
 
 
 class Painter2D:
     """
-    2D Painter class for drawing on a pixel matrix using matplotlib.
+    2D Painter class for drawing on a pixel matrix and handing finished frames to a presentation backend.
 
     Attributes:
       W (int): Width (and height) resolution of the drawing canvas.
       H (int): Height resolution of the drawing canvas.
       FPS (int): Frames per second for updating the canvas.
       matrix (np.ndarray): 2D array representing pixel intensities.
-      fig (plt.Figure): The matplotlib figure object.
-      ax (plt.Axes): The matplotlib axes object.
-      img (Any): The image object for displaying the matrix.
+      depth (np.ndarray): Float z-buffer matching `matrix`, holding the nearest depth drawn per pixel.
+      backend (PresentBackend): Where finished frames go; a matplotlib window by default.
+      tiles (Optional[TileRasterizer]): The shared-memory tile pool when rasterizing in parallel.
+      pixelsDrawn (int): Running count of fragments rasterized by DrawLines and FillTriangles: pixels
+                         covered by each line or triangle, before the depth test. The count is the
+                         same with or without tile workers.
+      dirty (List[Window]): Rectangles (row0, row1, col0, col1) drawn into since the last clearFrame.
+      pipelined (bool): Whether frames are presented on a separate thread from a second buffer.
+
+    The buffers are allocated once. clearFrame resets only the dirty rectangles, and
+    updateFrame tells the backend which rectangles changed since the previous frame. The
+    rasterizers' per-pixel work arrays are kept in a Scratch and reused from frame to frame.
+
+    When pipelined, there are two sets of buffers and `matrix`, `depth` and `dirty` refer to
+    the back one being drawn into. updateFrame queues the back buffer for a presenter thread
+    and switches to the other one, waiting first until the presenter has finished with it.
+    So frame N is presented while frame N + 1 is rendered, at most one frame is waiting,
+    and each frame's image is the same as without pipelining.
     """
-    def __init__(self, Resolution: int, FPS: int = 60) -> None:
+    MAX_DIRTY: int = 16
+
+    def __init__(self, Resolution: int, FPS: int = 60, backend: Optional[PresentBackend] = None,
+                 workers: int = 1, tile: int = 128, dtype: Any = np.float64, pipelined: bool = False) -> None:
         """
         Initialize the Painter2D object.
 
         Parameters:
           Resolution (int): The resolution (width and height) of the canvas.
           FPS (int, optional): Frames per second for canvas update. Default is 60.
+          backend (PresentBackend, optional): Presentation backend. Default is MatplotlibBackend().
+          workers (int, optional): Processes used to rasterize DrawTriangles/DrawLines/FillTriangles.
+                                   Above 1, the buffers move to shared memory and are split into
+                                   tiles (see rasterPool). Default is 1 (serial).
+          tile (int, optional): Tile edge length in pixels for parallel rasterization. Default is 128.
+          dtype (optional): Pixel type of `matrix`, e.g. np.uint8 to use an eighth of the memory;
+                            shades are truncated to integers. Default is float64.
+          pipelined (bool, optional): Double-buffer the canvas and present frames on a worker
+                                      thread while the next one is drawn. Ignored for backends
+                                      that are not `threaded` (such as the matplotlib window).
+                                      Default is False.
         """
         self.W: int = Resolution
         self.H: int = Resolution
         self.FPS: int = FPS
-        self.matrix: np.ndarray = np.zeros((Resolution, Resolution))
-        plt.ion()
-        self.fig, self.ax = plt.subplots()
-        self.img = self.ax.imshow(self.matrix, cmap='gray', vmin=0, vmax=255)
+        self.tiles: Optional[Any] = None
+        self.pixelsDrawn: int = 0
+        self._scratch: Scratch = Scratch()
+        self.backend: PresentBackend = MatplotlibBackend() if backend is None else backend
+        self.pipelined: bool = pipelined and self.backend.threaded
+        buffers: int = 2 if self.pipelined else 1
+        if workers > 1:
+            from rasterPool import TileRasterizer
+            self.tiles = TileRasterizer((Resolution, Resolution), workers, tile, dtype, buffers)
+            self._matrices: List[np.ndarray] = self.tiles.matrices
+            self._depths: List[np.ndarray] = self.tiles.depths
+        else:
+            self._matrices = [np.zeros((Resolution, Resolution), dtype=dtype) for _ in range(buffers)]
+            self._depths = [np.full((Resolution, Resolution), np.inf) for _ in range(buffers)]
+        self._dirty: List[List[Window]] = [[] for _ in range(buffers)]
+        self._changed: List[Window] = []
+        self._select(0)
+        self.backend.open(Resolution, Resolution, FPS)
+        self._presenter: Optional[threading.Thread] = None
+        if self.pipelined:
+            self._queue: "queue.Queue[Optional[Tuple[int, List[Window]]]]" = queue.Queue(maxsize=1)
+            self._free: List[threading.Event] = [threading.Event() for _ in range(buffers)]
+            for event in self._free:
+                event.set()
+            self._presentError: Optional[BaseException] = None
+            self._presenter = threading.Thread(target=self._present, name="Painter2D-present", daemon=True)
+            self._presenter.start()
 
     def __enter__(self) -> "Painter2D":
         """
@@ -45,17 +100,43 @@ class Painter2D:
 
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
         """
-        Exit the runtime context, turning off interactive mode and closing the figure.
+        Exit the runtime context, closing the presentation backend and any raster workers.
 
         Parameters:
           exc_type: Exception type.
           exc_value: Exception value.
           traceback: Traceback object.
         """
-        plt.ioff()
-        plt.close(self.fig)
+        self.close()
+
+    def close(self) -> None:
+        """
+        Present any frame still queued, stop the presenter thread, and release the backend and
+        any raster workers.
+        """
+        if self._presenter is not None:
+            self._queue.put(None)
+            self._presenter.join()
+            self._presenter = None
+        self.backend.close()
+        if self.tiles is not None:
+            self.tiles.close()
+            self.tiles = None
+
+    def _linePixels(self, lines: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rasterize many lines over the whole canvas; see line_pixels.
+
+        Parameters:
+          lines (np.ndarray): An (M, 4) integer array of (x0, y0, x1, y1) rows.
+
+        Returns:
+          tuple: (rows, cols) index arrays into self.matrix, line by line in drawing order.
+        """
+        return line_pixels(lines, (0, self.matrix.shape[0], 0, self.matrix.shape[1]), self._scratch)
 
-    def DrawLine(self, x0: int, y0: int, x1: int, y1: int, color: int = 255) -> List[Tuple[int, int]]:
+    def DrawLine(self, x0: int, y0: int, x1: int, y1: int, color: int = 255,
+                 collect: bool = False) -> Optional[List[Tuple[int, int]]]:
         """
         Draw a line on the canvas using Bresenham's algorithm.
 
@@ -65,36 +146,35 @@ class Painter2D:
           x1 (int): Ending x coordinate.
           y1 (int): Ending y coordinate.
           color (int, optional): Color intensity value. Default is 255.
+          collect (bool, optional): Build and return the list of colored pixels. Default is False.
 
         Returns:
-          list: A list of coordinate tuples that were colored.
-        """
-        X_Y_colored: List[Tuple[int, int]] = []
-        dx: int = abs(x1 - x0)
-        dy: int = abs(y1 - y0)
-        sx: int = 1 if x0 < x1 else -1
-        sy: int = 1 if y0 < y1 else -1
-        steep: bool = dy > dx
-        if steep:
-            x0, y0 = y0, x0
-            x1, y1 = y1, x1
-            dx, dy = dy, dx
-        p: int = 2 * dy - dx
-        y: int = y0
-        for x in range(x0, x1 + sx, sx):
-            if steep:
-                if 0 <= x < self.matrix.shape[1] and 0 <= y < self.matrix.shape[0]:
-                    self.matrix[y, x] = color
-                    X_Y_colored.append((y, x))
-            else:
-                if 0 <= x < self.matrix.shape[0] and 0 <= y < self.matrix.shape[1]:
-                    self.matrix[x, y] = color
-                    X_Y_colored.append((x, y))
-            if p >= 0:
-                y += sy
-                p -= 2 * dx
-            p += 2 * dy
-        return X_Y_colored
+          list: A list of coordinate tuples that were colored if `collect` is set, otherwise None.
+        """
+        rows, cols = self._linePixels(np.array([x0, y0, x1, y1]))
+        self.matrix[rows, cols] = color
+        self._markPoints(np.array([[x0, y0], [x1, y1]]))
+        if collect:
+            return list(zip(rows.tolist(), cols.tolist()))
+        return None
+
+    def DrawLines(self, lines: np.ndarray, color: int = 255) -> None:
+        """
+        Draw many lines with a single scatter into the canvas.
+
+        Parameters:
+          lines (np.ndarray): An (M, 2, 2) array of line end points; rows containing NaN are skipped.
+          color (int, optional): Color intensity value. Default is 255.
+        """
+        lines = np.asarray(lines, dtype=np.float64).reshape(-1, 4)
+        lines = lines[np.isfinite(lines).all(axis=1)]
+        self._markPoints(lines.astype(np.int64).reshape(-1, 2))
+        if self.tiles is not None:
+            self.pixelsDrawn += self.tiles.drawLines(lines.astype(np.int64), color)
+            return
+        rows, cols = self._linePixels(lines.astype(np.int64))
+        self.matrix[rows, cols] = color
+        self.pixelsDrawn += len(rows)
 
     def DrawTriangle(self, x0: int, y0: int, x1: int, y1: int, x2: int, y2: int, color: int = 255) -> None:
         """
@@ -109,29 +189,494 @@ class Painter2D:
           y2 (int): Y coordinate of the third vertex.
           color (int, optional): Color intensity value. Default is 255.
         """
-        x0, y0, x1, y1, x2, y2 = int(x0), int(y0), int(x1), int(y1), int(x2), int(y2)
         if None in [x0, y0, x1, y1, x2, y2]:
             return
-        self.DrawLine(x0, y0, x1, y1, color)
-        self.DrawLine(x1, y1, x2, y2, color)
-        self.DrawLine(x2, y2, x0, y0, color)
+        self.DrawTriangles(np.array([[[x0, y0], [x1, y1], [x2, y2]]], dtype=np.float64), color)
+
+    def DrawTriangles(self, coords: np.ndarray, color: int = 255) -> None:
+        """
+        Draw the edges of many triangles with a single scatter into the canvas.
+
+        Coordinates are truncated to integers like DrawTriangle does, and the edges are drawn
+        in the same direction (v0->v1, v1->v2, v2->v0), so the output matches calling
+        DrawTriangle once per triangle.
+
+        Parameters:
+          coords (np.ndarray): An (N, 3, 2) array of projected vertices; triangles containing NaN are skipped.
+          color (int, optional): Color intensity value. Default is 255.
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3, 2)
+        coords = coords[np.isfinite(coords).all(axis=(1, 2))]
+        self.DrawLines(np.stack((coords, np.roll(coords, -1, axis=1)), axis=2), color)
+
+    def FillTriangles(self, coords: np.ndarray, depth: np.ndarray, color: Any = 255,
+                      max_pixels: int = 1 << 22) -> None:
+        """
+        Rasterize filled triangles into the canvas with a depth test against self.depth.
+
+        A pixel is covered when its centre lies inside the triangle. Depth is interpolated
+        perspective-correctly (1/depth is linear in screen space), and a pixel is written only
+        if it is nearer than what the z-buffer already holds. Triangles are processed in
+        batches whose bounding boxes add up to at most `max_pixels` candidate pixels.
+
+        Parameters:
+          coords (np.ndarray): An (N, 3, 2) array of projected vertices.
+          depth (np.ndarray): An (N, 3) array of positive vertex depths from the camera.
+          color (int or np.ndarray, optional): One intensity for all triangles or an (N,) array of per-triangle intensities.
+          max_pixels (int, optional): Upper bound on candidate pixels generated per batch.
+        """
+        points: np.ndarray = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self._markPoints(points[np.isfinite(points).all(axis=1)])
+        if self.tiles is not None:
+            self.pixelsDrawn += self.tiles.fillTriangles(coords, depth, color, max_pixels)
+            return
+        self.pixelsDrawn += fill_triangles(self.matrix, self.depth, coords, depth, color,
+                       (0, self.matrix.shape[0], 0, self.matrix.shape[1]), max_pixels, self._scratch)
+
+    def _markPoints(self, points: np.ndarray) -> None:
+        """
+        Mark the rectangle covering some drawn coordinates as dirty; nothing if there are none.
+
+        Parameters:
+          points (np.ndarray): A (K, 2) array of finite (row, column) coordinates.
+        """
+        window: Optional[Window] = bounding_window(points, self.matrix.shape)
+        if window is not None:
+            self.markDirty(window)
+
+    def markDirty(self, window: Optional[Window] = None) -> None:
+        """
+        Record that a rectangle of the canvas was drawn into.
+
+        The drawing methods call this themselves; call it after writing to `matrix` directly.
+        Once there are more than MAX_DIRTY rectangles they are merged into their bounding box.
+
+        Parameters:
+          window (tuple, optional): (row0, row1, col0, col1) half-open rectangle; the whole
+                                    canvas if omitted. Empty rectangles are ignored.
+        """
+        if window is None:
+            window = (0, self.matrix.shape[0], 0, self.matrix.shape[1])
+        if window[0] >= window[1] or window[2] >= window[3]:
+            return
+        for rects in (self.dirty, self._changed):
+            rects.append(window)
+            if len(rects) > Painter2D.MAX_DIRTY:
+                rects[:] = [union_window(rects)]
 
     def updateFrame(self) -> None:
         """
-        Update the canvas display with the current matrix data.
+        Hand the current matrix data to the presentation backend, with the rectangles changed
+        since the previous frame (drawn into, or cleared after the previous frame).
+
+        When pipelined, the frame is only queued: it is presented on the presenter thread and
+        drawing continues in the other buffer (see flush). Exceptions raised by the backend
+        are re-raised here, on the next call.
+        """
+        changed: List[Window] = self._changed
+        self._changed = []
+        if not self.pipelined:
+            self.backend.update(self.matrix, changed)
+            return
+        # Both buffers are clean outside their own dirty rectangles, so consecutive frames
+        # can only differ where either of them was drawn.
+        back: int = self._back
+        changed = self.dirty + self._dirty[back ^ 1]
+        if len(changed) > Painter2D.MAX_DIRTY:
+            changed = [union_window(changed)]
+        self._free[back].clear()
+        self._queue.put((back, changed))
+        self._free[back ^ 1].wait()
+        self._select(back ^ 1)
+        self._raisePresentError()
+
+    def flush(self) -> None:
+        """
+        Wait until every queued frame has been presented. Does nothing unless pipelined.
+        """
+        if self.pipelined:
+            for event in self._free:
+                event.wait()
+            self._raisePresentError()
+
+    def _select(self, index: int) -> None:
+        """
+        Make one of the buffers the back buffer that drawing goes to.
+
+        Parameters:
+          index (int): Buffer index.
+        """
+        self._back: int = index
+        self.matrix: np.ndarray = self._matrices[index]
+        self.depth: np.ndarray = self._depths[index]
+        self.dirty: List[Window] = self._dirty[index]
+        if self.tiles is not None:
+            self.tiles.select(index)
+
+    def _present(self) -> None:
+        """
+        Presenter thread: hand queued buffers to the backend and mark them free again.
+        """
+        while True:
+            item: Optional[Tuple[int, List[Window]]] = self._queue.get()
+            if item is None:
+                return
+            index, changed = item
+            try:
+                if self._presentError is None:
+                    self.backend.update(self._matrices[index], changed)
+            except BaseException as error:
+                self._presentError = error
+            finally:
+                self._free[index].set()
+
+    def _raisePresentError(self) -> None:
+        """
+        Re-raise, once, an exception raised by the backend on the presenter thread.
         """
-        self.img.set_data(self.matrix)
-        plt.draw()
-        plt.pause(0.5)
+        error: Optional[BaseException] = self._presentError
+        if error is not None:
+            self._presentError = None
+            raise error
 
     def clearFrame(self) -> None:
         """
-        Clear the canvas by resetting the pixel matrix to zeros.
+        Clear the canvas: zero the pixels and reset the depth buffer to infinity inside the
+        dirty rectangles. The buffers themselves are reused.
+        """
+        for row0, row1, col0, col1 in self.dirty:
+            self.matrix[row0:row1, col0:col1] = 0
+            self.depth[row0:row1, col0:col1] = np.inf
+        if not self.pipelined:
+            self._changed.extend(self.dirty)
+            if len(self._changed) > Painter2D.MAX_DIRTY:
+                self._changed = [union_window(self._changed)]
+        self.dirty.clear()
+
+
+def bounding_window(points: np.ndarray, shape: Tuple[int, int]) -> Optional[Window]:
+    """
+    Return the pixel rectangle covering some canvas coordinates, clipped to the canvas.
+
+    Parameters:
+      points (np.ndarray): A (K, 2) array of (row, column) coordinates; fractional values are
+                           rounded outwards.
+      shape (tuple): Canvas shape.
+
+    Returns:
+      tuple: (row0, row1, col0, col1), or None if there are no points.
+    """
+    if len(points) == 0:
+        return None
+    lo: np.ndarray = np.clip(np.floor(points.min(axis=0)).astype(np.int64), 0, shape)
+    hi: np.ndarray = np.clip(np.floor(points.max(axis=0)).astype(np.int64) + 1, 0, shape)
+    return int(lo[0]), int(hi[0]), int(lo[1]), int(hi[1])
+
+
+def union_window(windows: List[Window]) -> Window:
+    """
+    Return the bounding rectangle of several rectangles.
+
+    Parameters:
+      windows (list): Non-empty list of (row0, row1, col0, col1) rectangles.
+
+    Returns:
+      tuple: The smallest rectangle containing all of them.
+    """
+    bounds: np.ndarray = np.array(windows)
+    return (int(bounds[:, 0].min()), int(bounds[:, 1].max()), int(bounds[:, 2].min()), int(bounds[:, 3].max()))
+
+
+class Scratch:
+    """
+    Work arrays reused by the rasterizers from call to call.
+
+    line_pixels and fill_triangles need several temporaries with one entry per candidate
+    pixel, megabytes per frame. Allocated fresh on every call, each one is mapped, faulted
+    in and unmapped again every frame. A Scratch keeps one array per name and hands out
+    views of its first entries, growing an array only when a call needs more. It holds on
+    to about as much memory as the largest call so far, and must not be used by two calls
+    at the same time.
+    """
+    def __init__(self) -> None:
+        """
+        Initialize an empty Scratch.
+        """
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str, size: int, dtype: Any = np.int64) -> np.ndarray:
+        """
+        Return a work array of `size` entries with undefined contents.
+
+        Parameters:
+          name (str): Which array; a view handed out earlier under the same name is overwritten.
+          size (int): Number of entries.
+          dtype (optional): Element type. Default is int64.
+
+        Returns:
+          np.ndarray: A view of the first `size` entries of the named array.
         """
-        self.matrix = np.zeros((self.W, self.H))
+        array: Optional[np.ndarray] = self._arrays.get(name)
+        if array is None or len(array) < size or array.dtype != dtype:
+            array = np.empty(size + size // 4, dtype=dtype)
+            self._arrays[name] = array
+        return array[:size]
 
+    def ramp(self, size: int) -> np.ndarray:
+        """
+        Return 0, 1, ..., size - 1, which must not be written to.
 
+        Parameters:
+          size (int): Number of entries.
 
+        Returns:
+          np.ndarray: An int64 view.
+        """
+        array: Optional[np.ndarray] = self._arrays.get("ramp")
+        if array is None or len(array) < size:
+            array = np.arange(size + size // 4, dtype=np.int64)
+            self._arrays["ramp"] = array
+        return array[:size]
 
+    def repeat(self, name: str, counts: np.ndarray, total: int) -> np.ndarray:
+        """
+        Return np.repeat(np.arange(len(counts)), counts) in a work array.
 
+        Parameters:
+          name (str): Which work array to use.
+          counts (np.ndarray): Non-negative repeat count per index.
+          total (int): counts.sum(), at least 1.
+
+        Returns:
+          np.ndarray: `total` int64 entries.
+        """
+        out: np.ndarray = self.get(name, total)
+        out[:] = 0
+        used: np.ndarray = np.flatnonzero(counts)
+        # Step up to each used index where its run starts, then accumulate the steps.
+        out[(np.cumsum(counts) - counts)[used]] = np.diff(used, prepend=0)
+        np.cumsum(out, out=out)
+        return out
+
+
+def line_pixels(lines: np.ndarray, window: Window,
+                scratch: Optional[Scratch] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rasterize many lines at once with a closed-form Bresenham, clipped to a window.
+
+    For a line with major-axis length D and minor-axis length d, the minor coordinate at
+    step k of the classic loop is start + s * floor((2 * d * k + D) / (2 * D)). This lets
+    every pixel of every line come out of a few array operations. Steps whose major
+    coordinate falls outside the window are never generated, and steps whose minor
+    coordinate falls outside it are masked out. The result is the same pixels, in the
+    same order, as the scalar loop.
+
+    Parameters:
+      lines (np.ndarray): An (M, 4) integer array of (x0, y0, x1, y1) rows.
+      window (tuple): (row0, row1, col0, col1) half-open pixel range to keep.
+      scratch (Scratch, optional): Work arrays to reuse. Default is a fresh set.
+
+    Returns:
+      tuple: (rows, cols) pixel index arrays, line by line in drawing order.
+    """
+    row0, row1, col0, col1 = window
+    lines = np.asarray(lines, dtype=np.int64).reshape(-1, 4)
+    x0, y0, x1, y1 = lines.T
+    dx: np.ndarray = np.abs(x1 - x0)
+    dy: np.ndarray = np.abs(y1 - y0)
+    sx: np.ndarray = np.where(x0 < x1, 1, -1)
+    sy: np.ndarray = np.where(y0 < y1, 1, -1)
+    steep: np.ndarray = dy > dx
+    major_start: np.ndarray = np.where(steep, y0, x0)
+    minor_start: np.ndarray = np.where(steep, x0, y0)
+    major_len: np.ndarray = np.where(steep, dy, dx)
+    minor_len: np.ndarray = np.where(steep, dx, dy)
+    # The loop always steps the major axis by sx, so a steep line whose y runs against
+    # x's direction yields an empty range; keep that behaviour.
+    count: np.ndarray = np.maximum(0, np.where(steep, (y1 - y0) * sx + 1, dx + 1))
+    low: np.ndarray = np.where(steep, col0, row0)
+    high: np.ndarray = np.where(steep, col1, row1)
+    k_lo: np.ndarray = np.maximum(0, np.where(sx < 0, major_start - high + 1, low - major_start))
+    k_hi: np.ndarray = np.minimum(count - 1, np.where(sx < 0, major_start - low, high - 1 - major_start))
+    steps: np.ndarray = np.maximum(0, k_hi - k_lo + 1)
+    total: int = int(steps.sum())
+    if total == 0:
+        empty: np.ndarray = np.empty(0, dtype=np.int64)
+        return empty, empty
+    scratch = Scratch() if scratch is None else scratch
+    # Per-pixel values are built in place in work arrays: gather a per-line term with
+    # np.take, then combine it into the running result. The indices are always valid, and
+    # mode="clip" stops np.take from staging its output in a temporary array.
+    line_id: np.ndarray = scratch.repeat("line", steps, total)
+    gather: np.ndarray = scratch.get("gather", total)
+    k: np.ndarray = scratch.get("k", total)
+    np.take(np.cumsum(steps) - steps - k_lo, line_id, out=k, mode="clip")
+    np.subtract(scratch.ramp(total), k, out=k)
+    # rows starts as the major coordinate: major_start + k * sx.
+    rows: np.ndarray = scratch.get("rows", total)
+    np.take(sx, line_id, out=rows, mode="clip")
+    rows *= k
+    rows += np.take(major_start, line_id, out=gather, mode="clip")
+    # cols starts as the minor one: minor_start + sy * ((2 * minor_len * k + major_len) // (2 * major_len)).
+    cols: np.ndarray = scratch.get("cols", total)
+    np.take(2 * minor_len, line_id, out=cols, mode="clip")
+    cols *= k
+    cols += np.take(major_len, line_id, out=gather, mode="clip")
+    cols //= np.take(2 * np.maximum(major_len, 1), line_id, out=gather, mode="clip")
+    cols *= np.take(sy, line_id, out=gather, mode="clip")
+    cols += np.take(minor_start, line_id, out=gather, mode="clip")
+    # Steep lines step along columns, so swap their two coordinates.
+    is_steep: np.ndarray = np.take(steep, line_id, out=scratch.get("steep", total, bool), mode="clip")
+    np.copyto(gather, rows, where=is_steep)
+    np.copyto(rows, cols, where=is_steep)
+    np.copyto(cols, gather, where=is_steep)
+    inside: np.ndarray = np.greater_equal(rows, row0, out=scratch.get("inside", total, bool))
+    test: np.ndarray = is_steep
+    inside &= np.less(rows, row1, out=test)
+    inside &= np.greater_equal(cols, col0, out=test)
+    inside &= np.less(cols, col1, out=test)
+    return rows[inside], cols[inside]
+
+
+def triangle_bounds(coords: np.ndarray, depth: np.ndarray, color: Any,
+                    window: Window) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Drop unusable triangles and compute the pixel bounding box of the rest, clipped to a window.
+
+    A pixel belongs to a triangle's box when its centre lies inside the triangle's extent.
+
+    Parameters:
+      coords (np.ndarray): An (N, 3, 2) array of projected vertices.
+      depth (np.ndarray): An (N, 3) array of vertex depths.
+      color (int or np.ndarray): One intensity for all triangles or an (N,) array.
+      window (tuple): (row0, row1, col0, col1) half-open pixel range.
+
+    Returns:
+      tuple: (coords, depth, color, lo, hi) for the triangles with finite coordinates and
+             positive depth, where lo/hi are (N, 2) first and one-past-last row/column.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3, 2)
+    depth = np.asarray(depth, dtype=np.float64).reshape(-1, 3)
+    color = np.broadcast_to(np.asarray(color, dtype=np.float64), (len(coords),))
+    keep: np.ndarray = np.isfinite(coords).all(axis=(1, 2)) & (depth > 0).all(axis=1)
+    coords, depth, color = coords[keep], depth[keep], color[keep]
+    start: np.ndarray = np.array([window[0], window[2]])
+    stop: np.ndarray = np.array([window[1], window[3]])
+    lo: np.ndarray = np.clip(np.ceil(coords.min(axis=1) - 0.5).astype(np.int64), start, stop)
+    hi: np.ndarray = np.clip(np.floor(coords.max(axis=1) - 0.5).astype(np.int64) + 1, start, stop)
+    return coords, depth, color, lo, np.maximum(hi, lo)
+
+
+def fill_triangles(matrix: np.ndarray, zbuffer: np.ndarray, coords: np.ndarray, depth: np.ndarray,
+                   color: Any, window: Window, max_pixels: int = 1 << 22, scratch: Optional[Scratch] = None) -> int:
+    """
+    Rasterize filled triangles into `matrix` within a window, depth-tested against `zbuffer`.
+
+    The winner of every pixel is the earliest triangle with the smallest depth there, no
+    matter how the triangles are split into batches or windows. That is what lets tiled
+    rendering reproduce a single full-window pass exactly.
+
+    Parameters:
+      matrix (np.ndarray): The colour buffer to write.
+      zbuffer (np.ndarray): The depth buffer, same shape as `matrix`.
+      coords (np.ndarray): An (N, 3, 2) array of projected vertices.
+      depth (np.ndarray): An (N, 3) array of positive vertex depths from the camera.
+      color (int or np.ndarray): One intensity for all triangles or an (N,) array of per-triangle intensities.
+      window (tuple): (row0, row1, col0, col1) half-open pixel range to draw into.
+      max_pixels (int, optional): Upper bound on candidate pixels generated per batch.
+      scratch (Scratch, optional): Work arrays to reuse. Default is a fresh set.
+
+    Returns:
+      int: Number of fragments rasterized: pixels whose centre lies inside a triangle, once per
+           triangle covering them and before the depth test. Unlike the number of depth-test
+           passes, this does not depend on how the triangles are split into batches or windows.
+    """
+    scratch = Scratch() if scratch is None else scratch
+    coords, depth, color, lo, hi = triangle_bounds(coords, depth, color, window)
+    size: np.ndarray = hi - lo
+    area: np.ndarray = size[:, 0] * size[:, 1]
+    running: np.ndarray = np.cumsum(area)
+    start: int = 0
+    fragments: int = 0
+    while start < len(coords):
+        done: int = int(running[start - 1]) if start else 0
+        stop: int = max(start + 1, int(np.searchsorted(running, done + max_pixels, side="right")))
+        fragments += _fill_batch(matrix, zbuffer, coords[start:stop], depth[start:stop], color[start:stop],
+                               lo[start:stop], size[start:stop], area[start:stop], scratch)
+        start = stop
+    return fragments
+
+
+def _fill_batch(matrix: np.ndarray, zbuffer: np.ndarray, coords: np.ndarray, depth: np.ndarray,
+                color: np.ndarray, lo: np.ndarray, size: np.ndarray, area: np.ndarray, scratch: Scratch) -> int:
+    """
+    Rasterize one batch of filled triangles for fill_triangles.
+
+    Parameters:
+      matrix (np.ndarray): The colour buffer to write.
+      zbuffer (np.ndarray): The depth buffer.
+      coords (np.ndarray): (N, 3, 2) projected vertices.
+      depth (np.ndarray): (N, 3) vertex depths.
+      color (np.ndarray): (N,) per-triangle intensities.
+      lo (np.ndarray): (N, 2) first row/column of each clipped bounding box.
+      size (np.ndarray): (N, 2) height/width of each clipped bounding box.
+      area (np.ndarray): (N,) number of pixels in each clipped bounding box.
+      scratch (Scratch): Work arrays for the per-candidate-pixel values.
+
+    Returns:
+      int: Number of fragments rasterized (see fill_triangles).
+    """
+    total: int = int(area.sum())
+    if total == 0:
+        return 0
+    # Candidate pixels are built in place in work arrays, as in line_pixels.
+    tri: np.ndarray = scratch.repeat("tri", area, total)
+    rows: np.ndarray = scratch.get("rows", total)
+    cols: np.ndarray = scratch.get("cols", total)
+    gather: np.ndarray = scratch.get("gather", total)
+    # Position within the triangle's box, split into row and column.
+    np.take(np.cumsum(area) - area, tri, out=gather, mode="clip")
+    np.subtract(scratch.ramp(total), gather, out=gather)
+    np.divmod(gather, np.take(size[:, 1], tri, out=cols, mode="clip"), out=(rows, cols))
+    rows += np.take(lo[:, 0], tri, out=gather, mode="clip")
+    cols += np.take(lo[:, 1], tri, out=gather, mode="clip")
+    v0, v1, v2 = coords[:, 0], coords[:, 1], coords[:, 2]
+    doubled: np.ndarray = (v1[:, 0] - v0[:, 0]) * (v2[:, 1] - v0[:, 1]) - (v1[:, 1] - v0[:, 1]) * (v2[:, 0] - v0[:, 0])
+    px: np.ndarray = np.add(rows, 0.5, out=scratch.get("px", total, np.float64))
+    py: np.ndarray = np.add(cols, 0.5, out=scratch.get("py", total, np.float64))
+    a: np.ndarray = scratch.get("a", total, np.float64)
+    b: np.ndarray = scratch.get("b", total, np.float64)
 
+    def weight(p: np.ndarray, q: np.ndarray, out: np.ndarray) -> np.ndarray:
+        # ((p.x - px) * (q.y - py) - (p.y - py) * (q.x - px)) * inv
+        np.subtract(np.take(p[:, 0], tri, out=a, mode="clip"), px, out=a)
+        np.multiply(a, np.subtract(np.take(q[:, 1], tri, out=b, mode="clip"), py, out=b), out=a)
+        np.subtract(np.take(p[:, 1], tri, out=b, mode="clip"), py, out=b)
+        np.multiply(b, np.subtract(np.take(q[:, 0], tri, out=out, mode="clip"), px, out=out), out=b)
+        np.subtract(a, b, out=out)
+        return np.multiply(out, np.take(inv, tri, out=a, mode="clip"), out=out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv: np.ndarray = 1.0 / doubled
+        w0: np.ndarray = weight(v1, v2, scratch.get("w0", total, np.float64))
+        w1: np.ndarray = weight(v2, v0, scratch.get("w1", total, np.float64))
+        w2: np.ndarray = np.subtract(1.0, w0, out=px)
+        w2 -= w1
+    inside: np.ndarray = np.greater_equal(w0, 0, out=scratch.get("inside", total, bool))
+    test: np.ndarray = scratch.get("test", total, bool)
+    inside &= np.greater_equal(w1, 0, out=test)
+    inside &= np.greater_equal(w2, 0, out=test)
+    tri, rows, cols = tri[inside], rows[inside], cols[inside]
+    fragments: int = len(tri)
+    inv_depth: np.ndarray = 1.0 / depth
+    z: np.ndarray = 1.0 / (w0[inside] * inv_depth[tri, 0] + w1[inside] * inv_depth[tri, 1] + w2[inside] * inv_depth[tri, 2])
+    index: np.ndarray = rows * matrix.shape[1] + cols
+    order: np.ndarray = np.lexsort((z, index))
+    index, z, tri = index[order], z[order], tri[order]
+    first: np.ndarray = np.ones(len(index), dtype=bool)
+    first[1:] = index[1:] != index[:-1]
+    index, z, tri = index[first], z[first], tri[first]
+    nearer: np.ndarray = z < zbuffer.reshape(-1)[index]
+    index = index[nearer]
+    zbuffer.reshape(-1)[index] = z[nearer]
+    matrix.reshape(-1)[index] = color[tri[nearer]]
+    return fragments
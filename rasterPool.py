@@ -0,0 +1,216 @@
+"""
+Tile-parallel rasterization over a shared-memory framebuffer.
+
+The colour and depth buffers live in multiprocessing.shared_memory blocks that every worker
+of a persistent process pool maps once, when it starts. Each frame, primitives are binned
+into the screen tiles their bounding boxes overlap, keeping their original order within
+each tile. Workers then rasterize whole tiles straight into the shared buffers with the
+same kernels as the serial path, clipped to the tile. Pixels are computed in full-frame
+coordinates and per-pixel depth ties still go to the earliest primitive, so the image is
+identical to a serial render.
+"""
+import weakref
+import numpy as np
+from multiprocessing import Pool, shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+from painter2D import Scratch, Window, line_pixels, fill_triangles, triangle_bounds
+
+_attached: Dict[str, Any] = {}
+
+
+def _attach(names: Tuple[str, ...], shape: Tuple[int, int], dtype: str) -> None:
+    """
+    Pool initializer: map the shared colour and depth buffers in a worker process and set up
+    its rasterizer work arrays.
+
+    Parameters:
+      names (tuple): Shared memory block names, a colour then a depth buffer per framebuffer.
+      shape (tuple): Framebuffer shape.
+      dtype (str): Colour buffer dtype.
+    """
+    blocks: List[shared_memory.SharedMemory] = [shared_memory.SharedMemory(name=name) for name in names]
+    _attached["blocks"] = blocks
+    _attached["matrix"] = [np.ndarray(shape, dtype=dtype, buffer=block.buf) for block in blocks[0::2]]
+    _attached["depth"] = [np.ndarray(shape, dtype=np.float64, buffer=block.buf) for block in blocks[1::2]]
+    _attached["scratch"] = Scratch()
+
+
+def _drawLinesTile(task: Tuple[int, Window, np.ndarray, float]) -> int:
+    """
+    Worker: draw the lines binned to one tile.
+
+    Parameters:
+      task (tuple): (buffer, window, lines, color) with an (M, 4) integer line array.
+
+    Returns:
+      int: Number of pixels written.
+    """
+    buffer, window, lines, color = task
+    rows, cols = line_pixels(lines, window, _attached["scratch"])
+    _attached["matrix"][buffer][rows, cols] = color
+    return len(rows)
+
+
+def _fillTile(task: Tuple[int, Window, np.ndarray, np.ndarray, np.ndarray, int]) -> int:
+    """
+    Worker: fill the triangles binned to one tile.
+
+    Parameters:
+      task (tuple): (buffer, window, coords, depth, color, max_pixels).
+
+    Returns:
+      int: Number of fragments rasterized.
+    """
+    buffer, window, coords, depth, color, max_pixels = task
+    return fill_triangles(_attached["matrix"][buffer], _attached["depth"][buffer], coords, depth, color, window,
+                          max_pixels, _attached["scratch"])
+
+
+def _release(pool: Any, blocks: List[shared_memory.SharedMemory]) -> None:
+    """
+    Shut down the pool and free the shared buffers.
+
+    Parameters:
+      pool (Pool): The worker pool.
+      blocks (list): The shared memory blocks to close and unlink.
+    """
+    pool.terminate()
+    pool.join()
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+class TileRasterizer:
+    """
+    A shared-memory framebuffer plus a persistent pool that rasterizes it tile by tile.
+
+    Attributes:
+      matrix (np.ndarray): Colour buffer drawn into, backed by shared memory.
+      depth (np.ndarray): Depth buffer drawn into, backed by shared memory.
+      matrices (List[np.ndarray]): All colour buffers; `matrix` is matrices[current].
+      depths (List[np.ndarray]): All depth buffers; `depth` is depths[current].
+      current (int): Index of the framebuffer drawn into (see select).
+      workers (int): Number of worker processes.
+      tile (int): Tile edge length in pixels.
+    """
+    def __init__(self, shape: Tuple[int, int], workers: int, tile: int = 128, dtype: Any = np.float64,
+                 buffers: int = 1) -> None:
+        """
+        Allocate the shared buffers and start the worker pool.
+
+        Parameters:
+          shape (tuple): Framebuffer shape (rows, cols).
+          workers (int): Number of worker processes.
+          tile (int, optional): Tile edge length in pixels. Default is 128.
+          dtype (optional): Colour buffer dtype. Default is float64.
+          buffers (int, optional): Number of framebuffers, e.g. 2 for double buffering. Default is 1.
+        """
+        self.shape: Tuple[int, int] = shape
+        self.workers: int = workers
+        self.tile: int = tile
+        dtype = np.dtype(dtype)
+        pixels: int = int(np.prod(shape))
+        self._blocks: List[shared_memory.SharedMemory] = [shared_memory.SharedMemory(create=True, size=pixels * size)
+                                                          for _ in range(buffers) for size in (dtype.itemsize, 8)]
+        self.matrices: List[np.ndarray] = [np.ndarray(shape, dtype=dtype, buffer=block.buf)
+                                           for block in self._blocks[0::2]]
+        self.depths: List[np.ndarray] = [np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+                                         for block in self._blocks[1::2]]
+        for matrix, depth in zip(self.matrices, self.depths):
+            matrix.fill(0)
+            depth.fill(np.inf)
+        self.select(0)
+        self._pool: Any = Pool(workers, initializer=_attach,
+                               initargs=(tuple(block.name for block in self._blocks), shape, dtype.str))
+        self._finalizer: weakref.finalize = weakref.finalize(self, _release, self._pool, self._blocks)
+
+    def close(self) -> None:
+        """
+        Stop the workers and free the shared buffers. The arrays must not be used afterwards.
+        """
+        self.matrix = self.depth = None
+        self.matrices = self.depths = []
+        self._finalizer()
+
+    def select(self, index: int) -> None:
+        """
+        Make one of the framebuffers the one drawn into.
+
+        Parameters:
+          index (int): Framebuffer index.
+        """
+        self.current: int = index
+        self.matrix: np.ndarray = self.matrices[index]
+        self.depth: np.ndarray = self.depths[index]
+
+    def _bin(self, lo: np.ndarray, hi: np.ndarray) -> List[Tuple[Window, np.ndarray]]:
+        """
+        Assign primitives to the tiles their pixel boxes overlap.
+
+        Parameters:
+          lo (np.ndarray): (N, 2) first row/column of each primitive's box.
+          hi (np.ndarray): (N, 2) one-past-last row/column of each primitive's box.
+
+        Returns:
+          list: (window, primitive indices) for every non-empty tile, with indices in their
+                original order.
+        """
+        tiles: np.ndarray = -(-np.array(self.shape) // self.tile)
+        hi = np.minimum(hi, self.shape)
+        lo = np.maximum(lo, 0)
+        usable: np.ndarray = np.flatnonzero((hi > lo).all(axis=1))
+        first: np.ndarray = lo[usable] // self.tile
+        last: np.ndarray = (hi[usable] - 1) // self.tile
+        span: np.ndarray = last - first + 1
+        count: np.ndarray = span[:, 0] * span[:, 1]
+        owner: np.ndarray = np.repeat(np.arange(len(usable)), count)
+        local: np.ndarray = np.arange(int(count.sum())) - np.repeat(np.cumsum(count) - count, count)
+        tile_row: np.ndarray = first[owner, 0] + local // span[owner, 1]
+        tile_col: np.ndarray = first[owner, 1] + local % span[owner, 1]
+        tile_id: np.ndarray = tile_row * tiles[1] + tile_col
+        order: np.ndarray = np.argsort(tile_id, kind="stable")
+        tile_id, primitive = tile_id[order], usable[owner[order]]
+        bounds: np.ndarray = np.flatnonzero(np.diff(tile_id, prepend=-1))
+        result: List[Tuple[Window, np.ndarray]] = []
+        for start, stop in zip(bounds, list(bounds[1:]) + [len(tile_id)]):
+            row, col = divmod(int(tile_id[start]), int(tiles[1]))
+            window: Window = (row * self.tile, min((row + 1) * self.tile, self.shape[0]),
+                              col * self.tile, min((col + 1) * self.tile, self.shape[1]))
+            result.append((window, primitive[start:stop]))
+        return result
+
+    def drawLines(self, lines: np.ndarray, color: float) -> int:
+        """
+        Draw integer lines into the shared colour buffer in parallel.
+
+        Parameters:
+          lines (np.ndarray): An (M, 4) integer array of (x0, y0, x1, y1) rows.
+          color (float): Color intensity value.
+
+        Returns:
+          int: Number of pixels written.
+        """
+        lines = np.asarray(lines, dtype=np.int64).reshape(-1, 4)
+        lo: np.ndarray = np.stack((np.minimum(lines[:, 0], lines[:, 2]), np.minimum(lines[:, 1], lines[:, 3])), axis=1)
+        hi: np.ndarray = np.stack((np.maximum(lines[:, 0], lines[:, 2]), np.maximum(lines[:, 1], lines[:, 3])), axis=1) + 1
+        return sum(self._pool.map(_drawLinesTile, [(self.current, window, lines[picked], color)
+                                                   for window, picked in self._bin(lo, hi)], chunksize=1))
+
+    def fillTriangles(self, coords: np.ndarray, depth: np.ndarray, color: Any, max_pixels: int) -> int:
+        """
+        Fill depth-tested triangles into the shared buffers in parallel.
+
+        Parameters:
+          coords (np.ndarray): An (N, 3, 2) array of projected vertices.
+          depth (np.ndarray): An (N, 3) array of positive vertex depths.
+          color (int or np.ndarray): One intensity for all triangles or an (N,) array.
+          max_pixels (int): Upper bound on candidate pixels per batch inside a worker.
+
+        Returns:
+          int: Number of fragments rasterized, the same as a serial fill_triangles call.
+        """
+        coords, depth, color, lo, hi = triangle_bounds(coords, depth, color, (0, self.shape[0], 0, self.shape[1]))
+        return sum(self._pool.map(_fillTile, [(self.current, window, coords[picked], depth[picked], color[picked],
+                                               max_pixels)
+                                              for window, picked in self._bin(lo, hi)], chunksize=1))
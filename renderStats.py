@@ -0,0 +1,275 @@
+import cProfile
+import csv
+import json
+import os
+import time
+import numpy as np
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, TextIO, Union
+
+STAGES = ("transform", "gather", "project", "rasterize", "present", "clear")
+COUNTERS = ("objects", "triangles", "drawn", "edges", "pixels", "lod_saved")
+
+
+class FrameStats:
+    """
+    Frame timing collected by Engine3D.run.
+
+    Attributes:
+      target_fps (float): The rate the loop was paced to.
+      frame_times (List[float]): Seconds spent on each presented frame (update, render, present, clear).
+      updates (int): Number of fixed-timestep updates run.
+      presented (int): Number of frames rendered and presented.
+      dropped (int): Number of frames whose rendering was skipped to catch up.
+      elapsed (float): Wall time of the whole run in seconds.
+    """
+    def __init__(self, target_fps: float) -> None:
+        """
+        Initialize empty statistics.
+
+        Parameters:
+          target_fps (float): The rate the loop is paced to.
+        """
+        self.target_fps: float = target_fps
+        self.frame_times: List[float] = []
+        self.updates: int = 0
+        self.presented: int = 0
+        self.dropped: int = 0
+        self.elapsed: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """
+        Mean frame time in seconds over presented frames (0 if none).
+        """
+        return float(np.mean(self.frame_times)) if self.frame_times else 0.0
+
+    @property
+    def p95(self) -> float:
+        """
+        95th percentile frame time in seconds over presented frames (0 if none).
+        """
+        return float(np.percentile(self.frame_times, 95)) if self.frame_times else 0.0
+
+    @property
+    def fps(self) -> float:
+        """
+        Presented frames per second of wall time.
+        """
+        return self.presented / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Return the statistics as a flat dictionary.
+
+        Returns:
+          dict: target_fps, fps, mean, p95, updates, presented, dropped and elapsed.
+        """
+        return {"target_fps": self.target_fps, "fps": self.fps, "mean": self.mean, "p95": self.p95,
+                "updates": self.updates, "presented": self.presented, "dropped": self.dropped,
+                "elapsed": self.elapsed}
+
+    def __repr__(self) -> str:
+        return (f"FrameStats(fps={self.fps:.1f}/{self.target_fps:g}, mean={self.mean * 1000:.2f}ms, "
+                f"p95={self.p95 * 1000:.2f}ms, dropped={self.dropped}/{self.updates})")
+
+
+class RenderStats:
+    """
+    Per-stage timers and counters for the most recent frames, kept by Engine3D as `stats`.
+
+    A frame is opened by beginFrame and closed by endFrame. In between, lap(stage) charges
+    the time since the previous lap to that stage and count(name, n) adds to a counter.
+    While disabled, beginFrame does nothing and lap/count return after a single check, so
+    the hooks can stay in the render path permanently.
+
+    Stages are transform (object-to-world vertices), gather (culling and concatenating
+    the scene), project (camera projection, back-face culling and shading), rasterize,
+    present and clear. Counters are visible objects, gathered triangles, triangles handed
+    to the rasterizer, wireframe edges handed to it, fragments rasterized (pixels covered per
+    line or triangle, see Painter2D.pixelsDrawn), and triangles left out by levels of detail.
+
+    Attributes:
+      enabled (bool): Whether frames are being recorded.
+      frames (Deque[Dict[str, float]]): One record per finished frame, at most `window` of them;
+                                        stage times are in seconds.
+      frame_index (int): Number of frames recorded so far; the index of the next frame.
+      profiles (List[str]): Paths of the cProfile dumps written so far.
+    """
+    def __init__(self, window: int = 300, enabled: bool = False) -> None:
+        """
+        Initialize empty statistics.
+
+        Parameters:
+          window (int, optional): Number of frames kept. Default is 300.
+          enabled (bool, optional): Start recording immediately. Default is False.
+        """
+        self.enabled: bool = enabled
+        self.frames: Deque[Dict[str, float]] = deque(maxlen=window)
+        self.frame_index: int = 0
+        self.profiles: List[str] = []
+        self._current: Optional[Dict[str, float]] = None
+        self._last: float = 0.0
+        self._profileFrames: Set[int] = set()
+        self._profileDir: str = "."
+        self._profiler: Optional[cProfile.Profile] = None
+
+    @property
+    def recording(self) -> bool:
+        """
+        True while a frame is open.
+        """
+        return self._current is not None
+
+    def beginFrame(self) -> None:
+        """
+        Open a new frame record, closing any frame still open. Does nothing while disabled.
+        """
+        if self._current is not None:
+            self.endFrame()
+        if not self.enabled:
+            return
+        self._current = dict.fromkeys(STAGES + COUNTERS, 0)
+        self._current["frame"] = self.frame_index
+        if self.frame_index in self._profileFrames:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._last = time.perf_counter()
+
+    def lap(self, stage: Optional[str] = None) -> None:
+        """
+        Charge the time since the previous lap to a stage.
+
+        Parameters:
+          stage (str, optional): One of STAGES; if None the clock is only restarted, so the
+                                 time in between is not charged to any stage.
+        """
+        if self._current is None:
+            return
+        now: float = time.perf_counter()
+        if stage is not None:
+            self._current[stage] += now - self._last
+        self._last = now
+
+    def count(self, name: str, n: int) -> None:
+        """
+        Add to one of the current frame's counters.
+
+        Parameters:
+          name (str): One of COUNTERS.
+          n (int): Amount to add.
+        """
+        if self._current is not None:
+            self._current[name] += n
+
+    def endFrame(self) -> None:
+        """
+        Close the current frame, store its record and write its profile if one was requested.
+        """
+        record: Optional[Dict[str, float]] = self._current
+        if record is None:
+            return
+        self._current = None
+        if self._profiler is not None:
+            self._profiler.disable()
+            path: str = os.path.join(self._profileDir, f"frame_{self.frame_index:06d}.prof")
+            self._profiler.dump_stats(path)
+            self.profiles.append(path)
+            self._profiler = None
+            self._profileFrames.discard(self.frame_index)
+        record["total"] = sum(record[stage] for stage in STAGES)
+        self.frames.append(record)
+        self.frame_index += 1
+
+    def profile(self, frames: Union[int, Iterable[int]], directory: str = ".") -> None:
+        """
+        Run cProfile over selected frames and dump each to `directory/frame_NNNNNN.prof`.
+
+        The dumps can be read with pstats or snakeviz. Requesting a profile also enables
+        recording.
+
+        Parameters:
+          frames (int or iterable of int): The next `frames` frames if an int, otherwise the
+                                           frame indices (see frame_index) to profile.
+          directory (str, optional): Where the .prof files go. Default is the working directory.
+        """
+        if isinstance(frames, int):
+            frames = range(self.frame_index, self.frame_index + frames)
+        self._profileFrames.update(frames)
+        self._profileDir = directory
+        self.enabled = True
+
+    def reset(self) -> None:
+        """
+        Forget all recorded frames.
+        """
+        self.frames.clear()
+        self._current = None
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+
+    def _column(self, name: str) -> np.ndarray:
+        """
+        Return one field of every recorded frame as a float array.
+        """
+        return np.array([record[name] for record in self.frames], dtype=np.float64)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarise the frames in the window.
+
+        Returns:
+          dict: For every stage and for `total`, the mean and 95th percentile in milliseconds;
+                for every counter, the mean per frame. Empty if no frames were recorded.
+        """
+        if not self.frames:
+            return {}
+        result: Dict[str, Dict[str, float]] = {}
+        for stage in STAGES + ("total",):
+            times: np.ndarray = self._column(stage) * 1000
+            result[stage] = {"mean_ms": float(times.mean()), "p95_ms": float(np.percentile(times, 95))}
+        for name in COUNTERS:
+            result[name] = {"mean": float(self._column(name).mean())}
+        return result
+
+    def _open(self, target: Union[str, TextIO], write: Any) -> None:
+        """
+        Call `write` with `target` if it is a file, or with `target` opened for writing if it is a path.
+        """
+        if isinstance(target, str):
+            with open(target, "w", newline="") as handle:
+                write(handle)
+        else:
+            write(target)
+
+    def write_jsonl(self, target: Union[str, TextIO]) -> None:
+        """
+        Write the frames in the window as JSON lines, one object per frame.
+
+        Parameters:
+          target (str or file): A path or an open text file.
+        """
+        def write(handle: TextIO) -> None:
+            for record in self.frames:
+                handle.write(json.dumps(record) + "\n")
+        self._open(target, write)
+
+    def write_csv(self, target: Union[str, TextIO]) -> None:
+        """
+        Write the frames in the window as CSV with a header row.
+
+        Parameters:
+          target (str or file): A path or an open text file.
+        """
+        def write(handle: TextIO) -> None:
+            writer = csv.DictWriter(handle, fieldnames=("frame",) + STAGES + ("total",) + COUNTERS)
+            writer.writeheader()
+            writer.writerows(self.frames)
+        self._open(target, write)
+
+    def __repr__(self) -> str:
+        if not self.frames:
+            return f"RenderStats(enabled={self.enabled}, frames=0)"
+        stages: str = ", ".join(f"{stage}={self._column(stage).mean() * 1000:.2f}ms" for stage in STAGES)
+        return f"RenderStats(frames={len(self.frames)}, {stages}, triangles={self._column('triangles').mean():.0f})"
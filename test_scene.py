@@ -0,0 +1,53 @@
+"""
+Tests of the scene's spatial queries over a large scene.
+"""
+import numpy as np
+import pytest
+from assets import Object3D
+from bvh import BVH
+from Scene import Scene
+
+SIDE: int = 100
+
+
+@pytest.fixture
+def scene() -> Scene:
+    """
+    A scene of SIDE * SIDE unit cubes on a grid in the z = 0 plane, three units apart.
+    """
+    grid: Scene = Scene()
+    for i in range(SIDE * SIDE):
+        grid.add_cube(f"cube{i}", 3 * (i % SIDE), 3 * (i // SIDE), 0)
+    return grid
+
+
+def test_static_queries_reuse_the_object_tree(scene: Scene, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert scene.rayCast((3, 3, -5), (0, 0, 1))[0] == "cube101"
+    tree: BVH = scene._tree
+
+    def fail(*args, **kwargs) -> None:
+        raise AssertionError("the object tree was rebuilt, refit or rescanned")
+
+    monkeypatch.setattr(BVH, "__init__", fail)
+    monkeypatch.setattr(BVH, "refit", fail)
+    monkeypatch.setattr(Object3D, "_worldBounds", fail)
+    monkeypatch.setattr(Object3D, "_stateKey", fail)
+    for _ in range(3):
+        assert scene.rayCast((3, 3, -5), (0, 0, 1))[0] == "cube101"
+        assert set(scene.queryRadius((6, 6, 0), 0.6)) == {"cube202"}
+    assert scene._tree is tree
+
+
+def test_moving_an_object_refits_only_its_leaf(scene: Scene, monkeypatch: pytest.MonkeyPatch) -> None:
+    scene.rayCast((3, 3, -5), (0, 0, 1))
+    tree: BVH = scene._tree
+    refits: list = []
+    original = BVH.refit
+    monkeypatch.setattr(BVH, "refit", lambda self, lo, hi, primitives=None:
+                        (refits.append(primitives), original(self, lo, hi, primitives)))
+    scene.assetSet["cube101"].shift(0, 0, 50)
+    scene.assetSet["cube9999"].Object_position = (3, 3, 10)
+    hit = scene.rayCast((3, 3, -5), (0, 0, 1))
+    assert hit[0] == "cube9999" and np.isclose(hit[2], 14.5)
+    assert scene._tree is tree
+    assert len(refits) == 1 and sorted(refits[0]) == [101, 9999]